@@ -0,0 +1,26 @@
+"""
+AUTOMAX: simulador de conducción con control difuso (Mamdani)
+Paquete común; simulador.py, simulator.py y test.py son configuraciones de él.
+"""
+
+from .controller import FuzzyController
+from .physics import ArcadePhysics, ClassicPhysics
+from .render import ArcadeRenderer, ClassicRenderer
+from .sim import RetroNeonSim, SimSnapshot
+from .ui import Button, ScrubBar, Slider
+from .weather import RainToggleWeather, WeatherCycle
+
+__all__ = [
+    "ArcadePhysics",
+    "ArcadeRenderer",
+    "Button",
+    "ClassicPhysics",
+    "ClassicRenderer",
+    "FuzzyController",
+    "RainToggleWeather",
+    "RetroNeonSim",
+    "ScrubBar",
+    "SimSnapshot",
+    "Slider",
+    "WeatherCycle",
+]
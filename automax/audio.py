@@ -0,0 +1,210 @@
+"""
+Gestor de audio no bloqueante para AUTOMAX (lluvia + claxon)
+- Decodifica cada asset una sola vez y lo guarda como PCM crudo en caché; con el paquete
+  de assets (automax.bundle) el PCM ya viene listo y no se decodifica nada.
+- Las órdenes play/stop van por una cola y las ejecuta un hilo aparte.
+- Antirrebote con histéresis para el claxon.
+- Sin dispositivo de audio (headless) cae a un backend nulo.
+"""
+
+import os
+import queue
+import threading
+
+import pygame
+
+from .worker import get_async_logger
+
+log = get_async_logger()
+
+PCM_CACHE_DIR = ".pcm_cache"
+
+
+# -------------------- Backends --------------------
+class NullAudioBackend:
+    name = "null"
+
+    def load(self, path, volume=None):
+        return None
+
+    def play(self, sound, loops=0):
+        pass
+
+    def stop(self, sound):
+        pass
+
+    def quit(self):
+        pass
+
+
+def mixer_format():
+    # Etiqueta del formato del mixer inicializado (frecuencia_formato_canales)
+    freq, fmt, channels = pygame.mixer.get_init()
+    return f"{freq}_{fmt}_{channels}"
+
+
+class MixerAudioBackend:
+    name = "mixer"
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.fmt_tag = mixer_format()
+
+    def _cache_path(self, path):
+        st = os.stat(path)
+        base = os.path.basename(path)
+        return os.path.join(self.cache_dir, f"{base}.{st.st_size}_{int(st.st_mtime)}.{self.fmt_tag}.pcm")
+
+    def load(self, path, volume=None):
+        cache_path = self._cache_path(path)
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                sound = pygame.mixer.Sound(buffer=f.read())
+        else:
+            # Primera vez: decodificar el MP3 y guardar el PCM ya en formato del mixer
+            sound = pygame.mixer.Sound(path)
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = cache_path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(sound.get_raw())
+                os.replace(tmp, cache_path)
+            except OSError as e:
+                log.warning("No se pudo guardar caché PCM de %s: %s", path, e)
+        if volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+    def from_pcm(self, data, volume=None):
+        sound = pygame.mixer.Sound(buffer=data)
+        if volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+    def play(self, sound, loops=0):
+        sound.play(loops=loops)
+
+    def stop(self, sound):
+        sound.stop()
+
+    def quit(self):
+        pygame.mixer.quit()
+
+
+def open_backend(assets_dir):
+    if os.environ.get("SDL_AUDIODRIVER") == "dummy":
+        return NullAudioBackend()
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        log.warning("Audio no disponible (%s); usando backend nulo.", e)
+        return NullAudioBackend()
+    return MixerAudioBackend(os.path.join(assets_dir, PCM_CACHE_DIR))
+
+
+# -------------------- Antirrebote (histéresis + tiempo mínimo) --------------------
+class Debounce:
+    def __init__(self, on, off, hold=0.3):
+        # on > off: se activa al subir (p. ej. claxon > 60)
+        # on < off: se activa al bajar (p. ej. distancia < 30 m)
+        self.on = on
+        self.off = off
+        self.hold = hold
+        self.active = False
+        self._changed_at = None
+
+    def update(self, value, t):
+        if self._changed_at is not None and t - self._changed_at < self.hold:
+            return self.active
+        rising = self.on > self.off
+        if not self.active:
+            trigger = value > self.on if rising else value < self.on
+        else:
+            trigger = value < self.off if rising else value > self.off
+        if trigger:
+            self.active = not self.active
+            self._changed_at = t
+        return self.active
+
+    def reset(self):
+        self.active = False
+        self._changed_at = None
+
+
+# -------------------- Gestor --------------------
+class AudioManager:
+    def __init__(self, assets_dir, sounds, bundle=None):
+        # sounds: {nombre: ([archivos candidatos], volumen o None)}
+        self.backend = open_backend(assets_dir)
+        self.bundle = bundle
+        self.sounds = {}
+        for name, (files, volume) in sounds.items():
+            self.sounds[name] = self._load_first(assets_dir, name, files, volume)
+        self.looping = {name: False for name in sounds}
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name="automax-audio", daemon=True)
+        self._thread.start()
+
+    def _load_first(self, assets_dir, name, files, volume):
+        fmt_tag = getattr(self.backend, "fmt_tag", None)
+        data = self.bundle.pcm(name, fmt_tag) if self.bundle is not None and fmt_tag else None
+        if data is not None:
+            log.info("Sonido '%s' cargado del paquete (%s).", name, self.backend.name)
+            return self.backend.from_pcm(data, volume)
+        for fname in files:
+            path = os.path.join(assets_dir, fname)
+            if not os.path.exists(path):
+                continue
+            try:
+                sound = self.backend.load(path, volume)
+                log.info("Sonido '%s' cargado (%s).", name, self.backend.name)
+                return sound
+            except Exception as e:
+                log.error("Error al cargar %s: %s", path, e)
+                return None
+        log.error("No se encontró ninguno de %s en '%s'. El sonido '%s' no funcionará.", files, assets_dir, name)
+        return None
+
+    def available(self, name):
+        return self.sounds.get(name) is not None
+
+    def _worker(self):
+        while True:
+            cmd = self._queue.get()
+            if cmd is None:
+                break
+            op, name, loops = cmd
+            sound = self.sounds.get(name)
+            if sound is None:
+                continue
+            try:
+                if op == "play":
+                    self.backend.play(sound, loops)
+                else:
+                    self.backend.stop(sound)
+            except Exception as e:
+                log.error("Audio '%s' %s falló: %s", name, op, e)
+
+    # Órdenes no bloqueantes (solo encolan)
+    def play(self, name, loops=0):
+        self._queue.put(("play", name, loops))
+
+    def stop(self, name):
+        self._queue.put(("stop", name, 0))
+
+    def set_loop(self, name, active):
+        # Idempotente: solo encola cuando cambia el estado deseado
+        if self.looping.get(name) == active:
+            return active
+        self.looping[name] = active
+        if active:
+            self.play(name, loops=-1)
+        else:
+            self.stop(name)
+        return active
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join(timeout=1.0)
+        self.backend.quit()
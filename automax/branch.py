@@ -0,0 +1,208 @@
+"""
+Instantáneas del estado de RetroNeonSim y ramas "¿y si...?" sin ventana
+- capture(sim): estado completo y compacto (escalares, sliders, partículas, tráfico,
+  histéresis del claxon, banderas del clima y estado del RNG global). Sin el log.
+- restore(sim, state): deja un simulador recién construido en ese instante; la rama
+  sin cambios reproduce exactamente la continuación original.
+- fork(state, variants): N ramas en procesos hijos con clima/controlador/reglas distintos;
+  devuelve los KPIs. Hijos desde un forkserver (spawn si no hay): el padre tiene hilos
+  (logger, física, telemetría) y un fork() directo heredaría sus locks a medias. El estado
+  es compacto y viaja por pickle una vez por hijo; el forkserver ya trae importado automax.
+- Los arrays del tráfico quedan de solo lectura y compartidos con la instantánea; Traffic
+  los copia la primera vez que una rama los modifica.
+"""
+
+import gzip
+import multiprocessing as mp
+import os
+import pickle
+import random
+from datetime import datetime
+
+from . import config
+from .config import RESULTS_DIR
+from .datalog import make_log
+from .metrics import SafetyMetrics
+
+# Atributos simples de RetroNeonSim (init_state y alrededores)
+SCALARS = (
+    "speed", "display_speed", "obst_distance_m", "obst_lane", "obst_speed", "time", "dt",
+    "demo_mode", "demo_timer", "visibility", "grip", "daytime", "headlights_on", "weather_mode",
+    "rain_enabled", "fog_enabled", "fog_color", "road_offset", "cloud_offset_x",
+    "action_val", "action_text", "brake_val", "throttle_val", "horn_val", "brake_on", "horn_playing",
+    "rebase_anim", "rebase_dir", "rebase_count", "controller_name",
+)
+OPTIONAL = ("visibility_before_rain",)   # solo con RainToggleWeather
+PARTICLES = ("particles", "rebase_particles", "rain_particles")
+SLIDERS = ("slider_speed", "slider_dist", "slider_vis")
+# Estado privado de los componentes (histéresis y eventos de hora)
+COMPONENT_ATTRS = {"weather": ("_night_applied", "_day_applied")}
+
+
+class SimState:
+    def __init__(self, physics, weather, scalars, sliders, particles, traffic, components, rng):
+        self.physics = physics           # clase de la física / clima (para validar el restore)
+        self.weather = weather
+        self.scalars = scalars
+        self.sliders = sliders
+        self.particles = particles       # tuplas de tuplas (inmutables, compartibles)
+        self.traffic = traffic           # {"pos": {carril: array}, "speed": {...}, "length": m}
+        self.components = components
+        self.rng = rng
+
+    def save(self, path=None):
+        if path is None:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            path = os.path.join(RESULTS_DIR, f"state_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pkl.gz")
+        with gzip.open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @staticmethod
+    def load(path):
+        with gzip.open(path, "rb") as f:
+            state = pickle.load(f)
+        if not isinstance(state, SimState):
+            raise ValueError(f"{path} no es una instantánea de AUTOMAX")
+        for arrays in (state.traffic["pos"], state.traffic["speed"]):
+            for a in arrays.values():
+                a.flags.writeable = False
+        return state
+
+
+def _frozen(a):
+    a = a.copy()
+    a.flags.writeable = False
+    return a
+
+
+def capture(sim):
+    # Con la física en hilo, llamar con sim.state_lock tomado
+    scalars = {k: getattr(sim, k) for k in SCALARS}
+    scalars.update({k: getattr(sim, k) for k in OPTIONAL if hasattr(sim, k)})
+    components = {
+        "horn_debounce": (sim.physics.horn_debounce.active, sim.physics.horn_debounce._changed_at),
+        "hard_braking": sim.metrics._braking,
+    }
+    for name, attrs in COMPONENT_ATTRS.items():
+        comp = getattr(sim, name)
+        components[name] = {a: getattr(comp, a) for a in attrs if hasattr(comp, a)}
+    tr = sim.traffic
+    return SimState(
+        physics=type(sim.physics).__name__,
+        weather=type(sim.weather).__name__,
+        scalars=scalars,
+        sliders={k: getattr(sim, k).value for k in SLIDERS},
+        particles={k: tuple(tuple(p) for p in getattr(sim, k)) for k in PARTICLES},
+        traffic={
+            "pos": {lane: _frozen(a) for lane, a in tr.pos.items()},
+            "speed": {lane: _frozen(a) for lane, a in tr.speed.items()},
+            "length": tr.length,
+        },
+        components=components,
+        rng=random.getstate(),
+    )
+
+
+def restore(sim, state):
+    if (type(sim.physics).__name__, type(sim.weather).__name__) != (state.physics, state.weather):
+        raise ValueError(f"La instantánea es de {state.physics}/{state.weather}, no de "
+                         f"{type(sim.physics).__name__}/{type(sim.weather).__name__}")
+    controller = state.scalars["controller_name"]
+    for k, v in state.scalars.items():
+        if k != "controller_name":
+            setattr(sim, k, v)
+    if controller != sim.controller_name:
+        sim.select_controller(controller)
+    for k, v in state.sliders.items():
+        getattr(sim, k).value = v
+    for k, v in state.particles.items():
+        setattr(sim, k, [list(p) for p in v])
+
+    # Tráfico: mismos arrays (solo lectura) en todas las ramas
+    tr = sim.traffic
+    tr.pos = dict(state.traffic["pos"])
+    tr.speed = dict(state.traffic["speed"])
+    tr.length = state.traffic["length"]
+
+    comps = state.components
+    sim.physics.horn_debounce.active, sim.physics.horn_debounce._changed_at = comps["horn_debounce"]
+    for name, attrs in COMPONENT_ATTRS.items():
+        comp = getattr(sim, name)
+        for a, v in comps.get(name, {}).items():
+            setattr(comp, a, v)
+
+    # KPIs y log empiezan en el instante de la instantánea
+    sim.log = make_log(config.LOG_MODE, max_gap=config.LOG_MAX_GAP)
+    sim.metrics = SafetyMetrics()
+    sim.metrics._braking = comps["hard_braking"]
+    sim.metrics._last_rebase_count = sim.rebase_count
+    sim.audio.set_loop("rain", sim.rain_enabled)
+    random.setstate(state.rng)
+    return sim
+
+
+# -------------------- Variantes --------------------
+def apply_variant(sim, variant):
+    # variant: {"controller": "sugeno", "rules": ruta, "fallback": x, "slider_*": valor, atributo: valor}
+    from .rulebase import load_rulebase
+
+    for k, v in variant.items():
+        if k == "name":
+            continue
+        if k == "controller":
+            sim.select_controller(v)
+        elif k == "rules":
+            sim.fuzzy.swap(load_rulebase(v))
+        elif k == "fallback":
+            sim.fuzzy.fallback = v
+        elif k in SLIDERS:
+            getattr(sim, k).value = v
+        elif k in SCALARS or k in OPTIONAL:
+            setattr(sim, k, v)
+        else:
+            raise ValueError(f"Variante desconocida: {k}")
+
+
+def run_branch(sim, state, variant, duration, dt):
+    restore(sim, state)
+    apply_variant(sim, variant)
+    for _ in range(int(round(duration / dt))):
+        sim.step(dt)
+    return {
+        "name": variant.get("name", ""),
+        "variant": {k: v for k, v in variant.items() if k != "name"},
+        "kpi": sim.metrics.to_dict(),
+        "final": {k: getattr(sim, k) for k in ("time", "display_speed", "obst_distance_m", "visibility",
+                                                 "grip", "weather_mode", "rain_enabled")},
+        "log": sim.log,
+    }
+
+
+# -------------------- Ramas en procesos hijos --------------------
+_BRANCH = {}
+
+
+def _init_branch(make_sim, state):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    _BRANCH["sim"] = make_sim()
+    _BRANCH["state"] = state
+
+
+def _branch_task(args):
+    variant, duration, dt = args
+    return run_branch(_BRANCH["sim"], _BRANCH["state"], variant, duration, dt)
+
+
+def fork(make_sim, state, variants, duration=30.0, dt=1.0 / 60, processes=None):
+    # make_sim: función importable (p. ej. simulator.make_sim); una rama por variante
+    processes = min(len(variants), processes or os.cpu_count() or 1)
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        # El forkserver arranca limpio (sin los hilos del padre) y cada hijo sale de él
+        ctx.set_forkserver_preload(["automax.sim", make_sim.__module__])
+    else:
+        ctx = mp.get_context("spawn")
+    with ctx.Pool(processes, initializer=_init_branch, initargs=(make_sim, state), maxtasksperchild=1) as pool:
+        return pool.map(_branch_task, [(v, duration, dt) for v in variants], chunksize=1)
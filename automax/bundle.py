@@ -0,0 +1,165 @@
+"""
+Paquete de assets pre-procesados de AUTOMAX (build_assets.py -> assets/automax.bundle)
+- Un solo archivo: cabecera JSON con el índice y, detrás, los datos ya listos para usar:
+  sprites escalados a su tamaño final (BGRA, el formato de convert_alpha), PCM en el
+  formato del mixer y las texturas de niebla/polvo ya generadas.
+- Se abre con mmap; cada superficie es una vista sobre el archivo (pygame.image.frombuffer),
+  sin decodificar PNG/MP3 ni generar texturas: el arranque depende de leer el disco.
+- Cada entrada lleva su hash (SHA-256, acelerado por hardware) y se comprueba al abrir;
+  el índice guarda tamaño y fecha de los archivos fuente para descartar un paquete
+  desactualizado.
+- open_bundle devuelve None si falta, está truncado, dañado o desactualizado: se decodifica
+  como siempre.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+from .config import ASSETS_DIR
+from .worker import get_async_logger
+
+log = get_async_logger()
+
+FORMAT = "automax-bundle-1"
+MAGIC = b"AMXBNDL1"
+ALIGN = 64
+BUNDLE_FILE = os.path.join(ASSETS_DIR, "automax.bundle")
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def source_info(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return digest(f.read())
+
+
+# -------------------- Escritura --------------------
+def surface_entry(surf):
+    # (meta, bytes) de una superficie con alpha por píxel
+    return {"kind": "surface", "size": list(surf.get_size()), "pixels": "BGRA"}, \
+        pygame.image.tobytes(surf, "BGRA")
+
+
+def pcm_entry(raw, fmt_tag):
+    return {"kind": "pcm", "fmt": fmt_tag}, raw
+
+
+def write_bundle(path, entries, sources, params=None):
+    # entries: {nombre: (meta, bytes)}; sources: {archivo en assets/: ruta}
+    index = {"format": FORMAT, "params": params or {}, "entries": {},
+             "sources": {name: dict(source_info(p), hash=file_digest(p))
+                         for name, p in sources.items()}}
+    offset = 0
+    for name, (meta, data) in entries.items():
+        index["entries"][name] = dict(meta, offset=offset, length=len(data), hash=digest(data))
+        offset += -(-len(data) // ALIGN) * ALIGN
+    head = json.dumps(index).encode("utf-8")
+    start = -(-(len(MAGIC) + 8 + len(head)) // ALIGN) * ALIGN
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(head)) + head)
+        for name, (_, data) in entries.items():
+            f.seek(start + index["entries"][name]["offset"])
+            f.write(data)
+        f.truncate(start + offset)
+    os.replace(tmp, path)
+    return start + offset
+
+
+# -------------------- Lectura --------------------
+class AssetBundle:
+    def __init__(self, path=BUNDLE_FILE, verify=True):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < len(MAGIC) + 8 or f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: no es un paquete de assets de AUTOMAX")
+            (n,) = struct.unpack("<Q", f.read(8))
+            self._start = -(-(len(MAGIC) + 8 + n) // ALIGN) * ALIGN
+            if self._start > size:
+                raise ValueError(f"{path}: truncado (índice de {n} bytes, archivo de {size})")
+            self.index = json.loads(f.read(n).decode("utf-8"))
+            if self.index.get("format") != FORMAT:
+                raise ValueError(f"{path}: formato {self.index.get('format')} no soportado")
+            self.entries = self.index["entries"]
+            # Cada entrada dentro del archivo antes de mapearlo (un paquete cortado a medias)
+            for name, e in self.entries.items():
+                if e["offset"] < 0 or e["length"] < 0 or self._start + e["offset"] + e["length"] > size:
+                    raise ValueError(f"{path}: truncado ('{name}' fuera del archivo)")
+            # Copia en escritura: las superficies son escribibles sin tocar el archivo
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._view = memoryview(self._mm)
+        if verify:
+            for name in self.entries:
+                if digest(self._data(name)) != self.entries[name]["hash"]:
+                    raise ValueError(f"{path}: '{name}' dañado (hash distinto)")
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def stale(self, assets_dir=ASSETS_DIR):
+        # Archivos fuente cambiados desde que se construyó (los que faltan no cuentan)
+        out = []
+        for name, info in self.index["sources"].items():
+            p = os.path.join(assets_dir, name)
+            if os.path.exists(p) and source_info(p) != {k: info[k] for k in ("size", "mtime_ns")}:
+                out.append(name)
+        return out
+
+    def _data(self, name):
+        e = self.entries[name]
+        a = self._start + e["offset"]
+        return self._view[a:a + e["length"]]
+
+    def names(self, prefix):
+        return [n for n in self.entries if n.startswith(prefix)]
+
+    def surface(self, name, size=None):
+        # Superficie sobre el mapa (sin copia); None si no está o tiene otro tamaño
+        e = self.entries.get(name)
+        if e is None or e["kind"] != "surface" or (size is not None and tuple(e["size"]) != tuple(size)):
+            return None
+        return pygame.image.frombuffer(self._data(name), tuple(e["size"]), e["pixels"])
+
+    def pcm(self, name, fmt_tag):
+        # PCM en el formato del mixer; None si no está o el mixer usa otro formato
+        e = self.entries.get(f"sound/{name}")
+        if e is None or e["fmt"] != fmt_tag:
+            return None
+        return self._data(f"sound/{name}")
+
+    def close(self):
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError:
+            pass    # quedan superficies vivas; se libera con ellas
+
+
+def open_bundle(path=BUNDLE_FILE):
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = AssetBundle(path)
+    except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+        log.warning("Paquete de assets no válido (%s); se decodifican los originales.", e)
+        return None
+    stale = bundle.stale(os.path.dirname(path))
+    if stale:
+        log.warning("Paquete de assets desactualizado (%s); ejecuta build_assets.py.", ", ".join(stale))
+        bundle.close()
+        return None
+    log.info("Assets desde %s (%d entradas).", path, len(bundle.entries))
+    return bundle
@@ -0,0 +1,36 @@
+"""
+Configuración común de AUTOMAX
+"""
+
+import os
+
+SCREEN_W = 1200
+SCREEN_H = 600
+FPS = 60
+RENDER_SCALE = 1.0      # resolución interna de la escena (0.5 = un cuarto de píxeles); HUD nativo
+RENDER_SMOOTH = False   # escalado bilineal de la escena (más suave, algo más caro)
+RAIN_SHEET = True       # lluvia con capas pre-dibujadas que se desplazan; False = gota a gota
+HUD_ATLAS = True        # trazos del carril y barras Vis/Dist pre-dibujados (clásico); False = por cuadro
+ASSETS_DIR = "assets"
+ASSET_BUNDLE = True     # usa assets/automax.bundle (build_assets.py) si existe y está al día
+RULES_DIR = "rules"
+RESULTS_DIR = "results"
+PHYSICS_THREAD = True   # física en hilo aparte; False = update/draw en serie
+CONTROLLER = "mamdani"  # "mamdani" | "sugeno" (TSK ajustado a la superficie Mamdani); tecla T
+JIT = True              # kernels Numba si está instalado; si no, NumPy
+RULE_INDEX = True       # índice de intervalos: solo se evalúan las reglas que pueden disparar
+TRAFFIC_VEHICLES = 1    # obstáculos simultáneos (cientos para estresar el controlador)
+TRAFFIC_SPEED_SPREAD = 0.0   # ± km/h alrededor de obst_speed para cada vehículo
+TELEMETRY_PORT = None   # puerto TCP del servidor de telemetría (None = apagado)
+TELEMETRY_UDP_PORT = None
+TELEMETRY_RATE = 20.0   # registros por segundo simulado (diezmado)
+TELEMETRY_BATCH = 5     # registros por trama
+INFERENCE_ADDR = None   # "host:puerto" de inference_server.py (None = reglas locales)
+LOG_MODE = "full"       # "full": una fila por fotograma (CSV) | "delta": solo cambios (.dlog)
+LOG_MAX_GAP = 1.0       # s entre registros como máximo en modo delta
+RECORD = False          # graba la sesión en results/rec_*/ para replay.py
+RECORD_KEYFRAME = 2.0   # s entre instantáneas de la grabación (coste de un salto)
+
+
+def rules_file(name):
+    return os.path.join(RULES_DIR, f"{name}.json")
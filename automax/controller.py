@@ -0,0 +1,57 @@
+"""
+Controlador difuso (Mamdani) de AUTOMAX
+- Reglas declarativas (rules/*.json) compiladas al evaluador vectorizado.
+- Sirve tanto para el controlador de una salida (accion) como para el de varias
+  (freno / acelerador / claxon): las entradas y salidas salen del archivo de reglas.
+"""
+
+import numpy as np
+
+from .rulebase import RuleBaseWatcher, check_compatible, load_rulebase
+
+
+class FuzzyController:
+    def __init__(self, rules_path, fallback=0.0):
+        # fallback: valor de todas las salidas cuando ninguna regla dispara
+        self.rules_path = rules_path
+        self.fallback = fallback
+        self.fast = load_rulebase(rules_path)
+
+    @property
+    def input_names(self):
+        return self.fast.input_names
+
+    @property
+    def output_names(self):
+        return self.fast.output_names
+
+    def swap(self, compiled):
+        # Hot-swap atómico: una sola asignación de referencia
+        check_compatible(self.fast, compiled)
+        self.fast = compiled
+
+    def watcher(self, interval=0.5, on_reload=None):
+        # on_reload: callback propio (p. ej. el de la simulación, que también reajusta el TSK)
+        return RuleBaseWatcher(self.rules_path, on_reload or self.swap, interval)
+
+    def evaluate(self, values):
+        # values: {entrada: escalar} -> {salida: float}
+        out, valid = self.fast.evaluate(values)
+        if not valid[0]:
+            return {name: float(self.fallback) for name in out}
+        return {name: float(arr[0]) for name, arr in out.items()}
+
+    def evaluate_batch(self, values):
+        out, valid = self.fast.evaluate(values)
+        return {name: np.where(valid, arr, self.fallback) for name, arr in out.items()}
+
+    # API posicional (orden de entradas del archivo de reglas)
+    def compute(self, *args):
+        out = self.evaluate(dict(zip(self.input_names, args)))
+        vals = tuple(out[name] for name in self.output_names)
+        return vals[0] if len(vals) == 1 else vals
+
+    def compute_batch(self, *args):
+        out = self.evaluate_batch(dict(zip(self.input_names, args)))
+        vals = tuple(out[name] for name in self.output_names)
+        return vals[0] if len(vals) == 1 else vals
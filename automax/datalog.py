@@ -0,0 +1,208 @@
+"""
+Log de sesión guiado por cambios (config.LOG_MODE = "delta")
+- Solo se registra una fila cuando algún canal se aleja más que su tolerancia de la recta
+  desde el último registro (compresión "swinging door": un canal constante o en rampa
+  no genera filas), cuando cambia un canal de texto (action_text) o entero (weather), o
+  cada LOG_MAX_GAP s como latido.
+- Cada registro guarda los fotogramas transcurridos, el tiempo y solo los canales que
+  cambiaron: deltas numéricos frente al registro anterior, valores nuevos para el resto.
+- El lector reconstruye la serie a frecuencia completa: en los fotogramas sin registrar
+  los canales reales se interpolan (error <= tolerancia), texto y enteros se mantienen.
+- Formato .dlog: JSON Lines; cabecera {"format", "columns", "tolerances", "frames"} y una
+  línea [fotogramas, tiempo, {canal: delta}] por registro.
+"""
+
+import json
+import math
+
+import pandas as pd
+
+FORMAT = "automax-delta-1"
+
+# Tolerancias por canal (unidades del log); los que no aparecen usan 0
+TOLERANCES = {
+    "slider_speed": 0.5,
+    "display_speed": 0.5,
+    "distance_m": 0.25,
+    "visibility": 0.5,
+    "hour": 0.05,
+    "action_val": 0.5,
+    "brake": 0.5,
+    "throttle": 0.5,
+    "horn": 0.5,
+    "grip": 0.5,
+}
+
+
+def make_log(mode="full", tolerances=None, max_gap=1.0):
+    # "full": lista de filas (una por fotograma); "delta": DeltaLog
+    if mode == "full":
+        return []
+    if mode == "delta":
+        return DeltaLog(tolerances, max_gap)
+    raise ValueError(f"Modo de log desconocido: {mode}")
+
+
+def _numeric(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _continuous(v, prev):
+    # Canales que se interpolan; enteros y texto solo cambian en un registro
+    return isinstance(v, float) and isinstance(prev, float)
+
+
+class DeltaLog:
+    def __init__(self, tolerances=None, max_gap=1.0):
+        self.tolerances = dict(TOLERANCES, **(tolerances or {}))
+        self.max_gap = max_gap
+        self.columns = None
+        self.records = []       # (fotogramas desde el anterior, tiempo, {canal: delta | valor})
+        self.frames = 0
+        self._anchor = {}       # valores reconstruidos del último registro (igual que el lector)
+        self._anchor_time = None
+        self._window = {}       # canal -> (pendiente mínima, máxima) que respeta la tolerancia
+        self._pending = None    # última fila sin registrar
+        self._since = 0         # fotogramas desde el último registro (incluida la pendiente)
+
+    def __len__(self):
+        return self.frames
+
+    def __eq__(self, other):
+        return isinstance(other, DeltaLog) and (self.columns, self.records, self._pending) == \
+            (other.columns, other.records, other._pending)
+
+    def append(self, row):
+        # Devuelve True si la fila (o la anterior) genera un registro
+        if self.columns is None:
+            self.columns = list(row)
+        self.frames += 1
+        self._since += 1
+        if self._anchor_time is None:
+            return self._record(row)
+        if self._fits(row):
+            self._pending = row
+            return False
+        if self._pending is not None:
+            # La puerta se cierra: se registra la fila anterior y se reintenta desde ella
+            self._since -= 1
+            self._record(self._on_line(self._pending))
+            self._since = 1
+            if self._fits(row):
+                self._pending = row
+                return True
+        return self._record(row)
+
+    def _fits(self, row):
+        # ¿Hay una recta desde el último registro que pase a <= tolerancia de todas las filas?
+        # La pendiente es por fotograma (el lector interpola por fotograma, no por tiempo)
+        if row["time"] - self._anchor_time >= self.max_gap:
+            return False
+        n = self._since
+        window = {}
+        for col, v in row.items():
+            if col == "time":
+                continue
+            prev = self._anchor.get(col)
+            if _continuous(v, prev):
+                tol = self.tolerances.get(col, 0.0)
+                lo, hi = self._window.get(col, (-math.inf, math.inf))
+                lo = max(lo, (v - tol - prev) / n)
+                hi = min(hi, (v + tol - prev) / n)
+                if lo > hi:
+                    return False
+                window[col] = (lo, hi)
+            elif v != prev:
+                return False
+        self._window.update(window)
+        return True
+
+    def _on_line(self, row):
+        # Lleva los canales reales a la recta admisible más cercana (a <= tol del valor real)
+        n = self._since
+        row = dict(row)
+        for col, (lo, hi) in self._window.items():
+            prev = self._anchor[col]
+            row[col] = prev + min(max((row[col] - prev) / n, lo), hi) * n
+        return row
+
+    def _record(self, row):
+        delta, self._anchor = self._encode(row)
+        self.records.append((self._since, row["time"], delta))
+        self._anchor_time = row["time"]
+        self._window = {}
+        self._pending = None
+        self._since = 0
+        return True
+
+    def _encode(self, row):
+        # Devuelve (delta, valores reconstruidos) sin tocar el estado
+        delta = {}
+        last = dict(self._anchor)
+        for col, v in row.items():
+            if col == "time":
+                continue
+            prev = last.get(col)
+            if _numeric(v) and _numeric(prev):
+                d = round(v - prev, 6)
+                if d:
+                    delta[col] = d
+                    last[col] = prev + d
+            elif v != prev or col not in last:
+                delta[col] = v
+                last[col] = v
+        return delta, last
+
+    def tail(self):
+        # Registros más la última fila pendiente (para que la serie llegue al final)
+        if self._pending is None:
+            return list(self.records)
+        delta, _ = self._encode(self._pending)
+        return self.records + [(self._since, self._pending["time"], delta)]
+
+    def header(self):
+        return {"format": FORMAT, "columns": self.columns, "tolerances": self.tolerances,
+                "frames": self.frames}
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.header()) + "\n")
+            for rec in self.tail():
+                f.write(json.dumps(rec, separators=(",", ":"), ensure_ascii=False) + "\n")
+        return path
+
+    def to_frame(self, full_rate=True):
+        return pd.DataFrame(decode(self.columns, self.tail(), full_rate), columns=self.columns)
+
+
+# -------------------- Lectura --------------------
+def decode(columns, records, full_rate=True):
+    # Genera filas (dict) a partir de los registros; full_rate rellena los fotogramas omitidos
+    last = {}
+    t_prev = None
+    for frames, t, delta in records:
+        new = dict(last)
+        for col, d in delta.items():
+            prev = last.get(col)
+            new[col] = prev + d if _numeric(d) and _numeric(prev) else d
+        if full_rate and t_prev is not None:
+            for k in range(1, frames):
+                f = k / frames
+                row = {c: (round(v + (new[c] - v) * f, 6) if _continuous(v, new.get(c)) else v)
+                       for c, v in last.items()}
+                row["time"] = round(t_prev + (t - t_prev) * f, 3)
+                yield row
+        last = new
+        t_prev = t
+        yield {c: (t if c == "time" else last.get(c)) for c in columns}
+
+
+def read_delta_log(path, full_rate=True):
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path}: no es un log delta de AUTOMAX")
+        records = [json.loads(line) for line in f if line.strip()]
+    df = pd.DataFrame(decode(header["columns"], records, full_rate), columns=header["columns"])
+    df.attrs.update(header)
+    return df
@@ -0,0 +1,210 @@
+"""
+Entorno vectorizado estilo Gym para entrenar políticas de conducción en AUTOMAX
+- N entornos en arrays de NumPy: reset() y step(acciones) sin ventana.
+- Observación (N x 5, float32): velocidad, distancia, visibilidad, adherencia, hora.
+- Acción (N x 2): freno, acelerador en 0..100, como las salidas de rules/simulator.json.
+- Del simulador comparte solo el clima (WeatherCycle: topes de visibilidad y adherencia,
+  ciclo día/noche) y el modelo del obstáculo (a su propia velocidad, escala 0.8).
+- La velocidad tiene dinámica propia: el acelerador suma hasta THROTTLE_ACCEL km/h/s, el
+  freno resta hasta BRAKE_DECEL escalado por la adherencia y DRAG la frena siempre
+  (ArcadePhysics, en cambio, sigue al slider de velocidad).
+- FuzzyPolicy usa el FuzzyController como política de referencia (batched).
+- Render opcional del entorno 0 con ArcadeRenderer (ventana pygame bajo demanda).
+
+API tipo gymnasium (sin depender de él):
+    obs, info = env.reset(seed=0)
+    obs, reward, terminated, truncated, info = env.step(actions)
+Los entornos terminados se reinician solos; la observación final queda en info["final_obs"].
+"""
+
+import numpy as np
+
+from .config import FPS
+from .weather import WeatherCycle, day_night_visibility_batch
+
+OBS_NAMES = ("velocidad", "distancia", "visibilidad", "adherencia", "hora")
+ACTION_NAMES = ("freno", "acelerador")
+
+# Dinámica longitudinal (km/h por segundo a 100 de mando)
+THROTTLE_ACCEL = 20.0
+BRAKE_DECEL = 60.0
+DRAG = 2.0
+OBST_SCALE = 0.8      # igual que ArcadePhysics
+
+# Recompensa: avance, frenadas fuertes (freno > 60) y choque (distancia 0)
+REWARD_SPEED = 1.0 / 120.0
+PENALTY_HARD_BRAKE = 0.05
+PENALTY_COLLISION = 10.0
+
+
+class VecDrivingEnv:
+    def __init__(self, n_envs=1024, dt=1.0 / FPS, max_steps=3600, hours_per_sec=0.24,
+                 seed=None, render_mode=None):
+        self.n = n_envs
+        self.dt = dt
+        self.max_steps = max_steps
+        self.hours_per_sec = hours_per_sec
+        self.render_mode = render_mode
+        self.rng = np.random.default_rng(seed)
+        modes = np.array([m[:2] for m in WeatherCycle.MODES], dtype=float)
+        self._mode_vis, self._mode_grip = modes[:, 0], modes[:, 1]
+        self.observation_shape = (n_envs, len(OBS_NAMES))
+        self.action_shape = (n_envs, len(ACTION_NAMES))
+        self._viewer = None
+
+        n = n_envs
+        self.speed = np.zeros(n)
+        self.distance = np.zeros(n)
+        self.obst_speed = np.zeros(n)
+        self.daytime = np.zeros(n)
+        self.weather_mode = np.zeros(n, dtype=int)
+        self.visibility = np.zeros(n)
+        self.grip = np.zeros(n)
+        self.steps = np.zeros(n, dtype=int)
+
+    # -------- API --------
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_envs(np.ones(self.n, dtype=bool))
+        return self._obs(), {}
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=float).reshape(self.action_shape)
+        brake = np.clip(actions[:, 0], 0.0, 100.0)
+        throttle = np.clip(actions[:, 1], 0.0, 100.0)
+        dt = self.dt
+
+        # Velocidad: el freno rinde según la adherencia del clima
+        accel = throttle / 100.0 * THROTTLE_ACCEL - brake / 100.0 * BRAKE_DECEL * self.grip / 100.0 - DRAG
+        self.speed = np.clip(self.speed + accel * dt, 0.0, 120.0)
+
+        # Obstáculo a su velocidad; si se aleja se queda en el horizonte (100 m)
+        self.distance = np.minimum(100.0, self.distance - (self.speed - self.obst_speed) / 3.6 * dt * OBST_SCALE)
+
+        # Día/noche y visibilidad (tope del clima)
+        self.daytime = (self.daytime + dt * self.hours_per_sec) % 24.0
+        self._update_visibility()
+
+        self.steps += 1
+        collision = self.distance <= 0.0
+        reward = (self.speed * REWARD_SPEED - PENALTY_HARD_BRAKE * (brake > 60.0)
+                  - PENALTY_COLLISION * collision)
+        terminated = collision
+        truncated = ~terminated & (self.steps >= self.max_steps)
+
+        info = {}
+        done = terminated | truncated
+        if done.any():
+            info["final_obs"] = self._obs()
+            info["done_mask"] = done
+            self._reset_envs(done)
+        return self._obs(), reward.astype(np.float32), terminated, truncated, info
+
+    def render(self):
+        if self.render_mode != "human":
+            return None
+        if self._viewer is None:
+            self._viewer = _Viewer()
+        return self._viewer.draw(self, 0)
+
+    def close(self):
+        if self._viewer is not None:
+            self._viewer.close()
+            self._viewer = None
+
+    # -------- Internos --------
+    def _reset_envs(self, mask):
+        k = int(mask.sum())
+        rng = self.rng
+        self.speed[mask] = rng.uniform(20.0, 100.0, k)
+        self.distance[mask] = rng.uniform(30.0, 100.0, k)
+        self.obst_speed[mask] = rng.uniform(40.0, 80.0, k)
+        self.daytime[mask] = rng.uniform(0.0, 24.0, k)
+        self.weather_mode[mask] = rng.integers(0, len(self._mode_vis), k)
+        self.steps[mask] = 0
+        self._update_visibility()
+
+    def _update_visibility(self):
+        self.visibility = np.minimum(day_night_visibility_batch(self.daytime), self._mode_vis[self.weather_mode])
+        self.grip = self._mode_grip[self.weather_mode]
+
+    def _obs(self):
+        return np.stack([self.speed, self.distance, self.visibility, self.grip, self.daytime], axis=1).astype(np.float32)
+
+
+# -------------------- Política de referencia --------------------
+class FuzzyPolicy:
+    # controller: FuzzyController con salidas freno/acelerador (rules/simulator.json)
+    def __init__(self, controller):
+        self.controller = controller
+
+    def __call__(self, obs):
+        out = self.controller.evaluate_batch({
+            "velocidad": obs[:, 0], "distancia": obs[:, 1],
+            "visibilidad": obs[:, 2], "adherencia": obs[:, 3],
+        })
+        return np.stack([out["freno"], out["acelerador"]], axis=1)
+
+
+# -------------------- Render opcional --------------------
+class _Viewer:
+    # RetroNeonSim arcade como lienzo: se copia el estado del entorno y se dibuja su snapshot
+    def __init__(self):
+        from .config import rules_file
+        from .controller import FuzzyController
+        from .physics import ArcadePhysics
+        from .render import ArcadeRenderer
+        from .sim import RetroNeonSim
+
+        self.sim = RetroNeonSim(FuzzyController(rules_file("simulator")), ArcadePhysics(),
+                                WeatherCycle(), ArcadeRenderer(), caption="Automax - VecDrivingEnv")
+
+    def draw(self, env, i):
+        import pygame
+
+        pygame.event.pump()
+        sim = self.sim
+        mode = int(env.weather_mode[i])
+        _, sim.grip, sim.fog_enabled, sim.fog_color = WeatherCycle.MODES[mode]
+        sim.weather_mode = mode
+        sim.rain_enabled = mode == 1
+        sim.display_speed = sim.speed = float(env.speed[i])
+        sim.obst_distance_m = float(env.distance[i])
+        sim.traffic.move_nearest(sim.obst_distance_m)
+        sim.visibility = float(env.visibility[i])
+        sim.daytime = float(env.daytime[i])
+        sim.headlights_on = sim.visibility < 60 or mode != 0
+        sim.time += env.dt
+        sim.road_offset = (sim.road_offset + sim.display_speed / 3.6 * 5 * env.dt) % 60
+        sim.renderer.draw(sim, sim.snapshot())
+        pygame.display.flip()
+        return sim.screen
+
+    def close(self):
+        import pygame
+
+        self.sim.audio.shutdown()
+        pygame.quit()
+
+
+# -------------------- Evaluación --------------------
+def evaluate_policy(env, policy, steps=1000, seed=0):
+    # Recompensa media por paso, choques y frenadas fuertes por cada 1000 pasos-entorno
+    obs, _ = env.reset(seed=seed)
+    total = 0.0
+    collisions = 0
+    hard = 0
+    for _ in range(steps):
+        actions = policy(obs)
+        hard += int((np.asarray(actions)[:, 0] > 60.0).sum())
+        obs, reward, terminated, _, _ = env.step(actions)
+        total += float(reward.sum())
+        collisions += int(terminated.sum())
+    n = steps * env.n
+    return {
+        "env_steps": n,
+        "reward_per_step": total / n,
+        "collisions_per_1k": collisions / n * 1000,
+        "hard_brakes_per_1k": hard / n * 1000,
+    }
@@ -0,0 +1,150 @@
+"""
+Evaluador Mamdani vectorizado para los FuzzyController de AUTOMAX
+- Compila un ctrl.ControlSystem de scikit-fuzzy a arrays de NumPy.
+- Evalúa N muestras a la vez: membresías (interp), reglas (min/max), agregación y centroide.
+- Misma semántica que skfuzzy: entradas recortadas al universo, AND=fmin, OR=fmax,
+  NOT=1-x, implicación por recorte (min) y acumulación por máximo.
+- El centroide se integra exacto por tramos lineales sobre una malla fina del universo
+  de salida; la diferencia con skfuzzy queda muy por debajo de 0.1 unidades.
+"""
+
+import numpy as np
+
+# Tamaño máximo (muestras x términos x puntos) por bloque al agregar salidas
+_CHUNK_ELEMS = 1 << 22
+
+
+class CompiledRuleBase:
+    def __init__(self, inputs, outputs, rules, resolution=0.25):
+        # inputs/outputs: [(nombre, universo, {término: mf})]
+        # rules: [(antecedente, [(salida, término, peso)])]
+        #   antecedente: ("term", var, término) | ("and", a, b) | ("or", a, b) | ("not", a)
+        self.inputs = [(name, np.asarray(univ, dtype=float), dict(terms)) for name, univ, terms in inputs]
+        self.outputs = [(name, np.asarray(univ, dtype=float), dict(terms)) for name, univ, terms in outputs]
+        self.rules = list(rules)
+        self.resolution = resolution
+        self.input_names = [name for name, _, _ in self.inputs]
+        self.output_names = [name for name, _, _ in self.outputs]
+        self.jit = None     # jit.JitEvaluator cuando hay Numba (ver jit.attach)
+        self.index = None   # rule_index.RuleIndex: solo se evalúan las reglas que pueden disparar
+        self._rule_terms = [set(_terms(antecedent)) for antecedent, _ in self.rules]
+
+        # Salidas: malla fina + membresías remuestreadas (T x M)
+        self._out = {}
+        for name, univ, terms in self.outputs:
+            n = int(round((univ[-1] - univ[0]) / resolution)) + 1
+            xs = np.union1d(np.linspace(univ[0], univ[-1], n), univ)
+            labels = list(terms)
+            mfs = np.stack([np.interp(xs, univ, terms[lbl]) for lbl in labels])
+            self._out[name] = (xs, labels, mfs)
+
+    # -------- Pasos de inferencia --------
+    def memberships(self, values, needed=None):
+        # needed: términos (entrada, etiqueta) a calcular; None = todos
+        mu = {}
+        n = 1
+        for name, univ, terms in self.inputs:
+            x = np.clip(np.asarray(values[name], dtype=float).ravel(), univ[0], univ[-1])
+            n = max(n, x.size)
+            for lbl, mf in terms.items():
+                if needed is None or (name, lbl) in needed:
+                    mu[(name, lbl)] = np.interp(x, univ, mf)
+        # Broadcast de escalares al tamaño del lote
+        for key, arr in mu.items():
+            if arr.size != n:
+                mu[key] = np.broadcast_to(arr, (n,))
+        return mu, n
+
+    def _eval_antecedent(self, node, mu):
+        kind = node[0]
+        if kind == "term":
+            return mu[(node[1], node[2])]
+        if kind == "and":
+            return np.fmin(self._eval_antecedent(node[1], mu), self._eval_antecedent(node[2], mu))
+        if kind == "or":
+            return np.fmax(self._eval_antecedent(node[1], mu), self._eval_antecedent(node[2], mu))
+        if kind == "not":
+            return 1.0 - self._eval_antecedent(node[1], mu)
+        raise ValueError(f"Antecedente desconocido: {kind}")
+
+    def firing(self, mu, rule_ids=None):
+        ids = range(len(self.rules)) if rule_ids is None else rule_ids
+        return {r: self._eval_antecedent(self.rules[r][0], mu) for r in ids}
+
+    def cuts(self, fire, n):
+        cuts = {name: np.zeros((n, len(labels))) for name, (_, labels, _) in self._out.items()}
+        for r, act in fire.items():
+            for out, lbl, weight in self.rules[r][1]:
+                t = self._out[out][1].index(lbl)
+                np.fmax(cuts[out][:, t], act * weight, out=cuts[out][:, t])
+        return cuts
+
+    def defuzz(self, name, cut):
+        # Centroide exacto de la función lineal por tramos max_t(min(cut_t, mf_t))
+        xs, _, mfs = self._out[name]
+        x1, x2 = xs[:-1], xs[1:]
+        dx = x2 - x1
+        n = cut.shape[0]
+        value = np.empty(n)
+        area = np.empty(n)
+        step = max(1, _CHUNK_ELEMS // (mfs.shape[0] * mfs.shape[1]))
+        for a in range(0, n, step):
+            b = min(n, a + step)
+            agg = np.minimum(cut[a:b, :, None], mfs[None, :, :]).max(axis=1)
+            y1, y2 = agg[:, :-1], agg[:, 1:]
+            ar = (dx * (y1 + y2)).sum(axis=1) * 0.5
+            mom = (dx * (x1 * (2 * y1 + y2) + x2 * (y1 + 2 * y2))).sum(axis=1) / 6.0
+            area[a:b] = ar
+            with np.errstate(invalid="ignore", divide="ignore"):
+                value[a:b] = mom / ar
+        return value, area > 0
+
+    def evaluate(self, values, rule_ids=None):
+        if rule_ids is None:
+            if self.jit is not None:
+                return self.jit.evaluate(values)
+            if self.index is not None:
+                rule_ids = self.index.rule_ids(values)
+        needed = None
+        if rule_ids is not None:
+            needed = set().union(*(self._rule_terms[r] for r in rule_ids))
+        mu, n = self.memberships(values, needed)
+        cuts = self.cuts(self.firing(mu, rule_ids), n)
+        out = {}
+        valid = np.ones(n, dtype=bool)
+        for name in self.output_names:
+            out[name], ok = self.defuzz(name, cuts[name])
+            valid &= ok
+        return out, valid
+
+
+def _terms(node):
+    if node[0] == "term":
+        yield (node[1], node[2])
+    else:
+        for child in node[1:]:
+            yield from _terms(child)
+
+
+# -------------------- Compilación desde scikit-fuzzy --------------------
+def _compile_term(term):
+    from skfuzzy.control.term import Term, TermAggregate
+
+    if isinstance(term, Term):
+        return ("term", term.parent.label, term.label)
+    if isinstance(term, TermAggregate):
+        if term.kind == "not":
+            return ("not", _compile_term(term.term1))
+        return (term.kind, _compile_term(term.term1), _compile_term(term.term2))
+    raise TypeError(f"Antecedente no soportado: {term!r}")
+
+
+def compile_control_system(system, resolution=0.25):
+    def variables(vs):
+        return [(v.label, v.universe, {lbl: t.mf for lbl, t in v.terms.items()}) for v in vs]
+
+    rules = []
+    for rule in system.rules:
+        cons = [(c.term.parent.label, c.term.label, float(c.weight)) for c in rule.consequent]
+        rules.append((_compile_term(rule.antecedent), cons))
+    return CompiledRuleBase(variables(system.antecedents), variables(system.consequents), rules, resolution)
@@ -0,0 +1,307 @@
+"""
+Servicio local de inferencia difusa de AUTOMAX (micro-batching)
+- Un solo FuzzyController por host: los simuladores se conectan por TCP en lugar de
+  compilar cada uno su rule base (y el servidor es el único que vigila el JSON).
+- Las peticiones que llegan dentro de una ventana corta (max_wait) se juntan en una
+  sola evaluación vectorizada; si se llega a max_batch muestras se evalúa sin esperar.
+  Latencia acotada por max_wait + una evaluación.
+- Métricas: peticiones, muestras, tamaño de lote y latencia en el servidor (p50/p95).
+- RemoteController imita la API de FuzzyController (evaluate, evaluate_batch, compute...).
+  Si el servidor no responde devuelve el fallback en todas las salidas (como el
+  controlador local sin reglas activas) y reconecta cada reconnect_s con una conexión nueva
+  (una respuesta a medias desincronizaría el flujo).
+- Latencia acotada en el cliente: la física llama dentro de su paso (con state_lock), así
+  que cada petición y cada reconexión esperan como mucho request_timeout_s (~1 cuadro);
+  el timeout largo solo vale para la primera conexión.
+
+Protocolo (little-endian, cada mensaje con prefijo de longitud <I):
+    hola (servidor, al conectar): JSON {"rules", "inputs", "outputs", "fallback"}
+    petición:  <IH id, n  + n * len(inputs)  float64 (fila a fila)
+    respuesta: <IH id, n  + n * len(outputs) float64 (con el fallback ya aplicado)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+from .metrics import RunningStats, StreamSummary
+from .worker import get_async_logger
+
+log = get_async_logger()
+
+LENGTH = struct.Struct("<I")
+HEAD = struct.Struct("<IH")
+MAX_SAMPLES = 0xFFFF   # muestras por petición
+
+
+class InferenceServer:
+    def __init__(self, controller, host="127.0.0.1", port=8770, max_wait=0.002, max_batch=4096):
+        self.controller = controller
+        self.host = host
+        self.port = port
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.n_in = len(controller.input_names)
+        self.n_out = len(controller.output_names)
+        self._pending = []       # (writer, id, X, t_llegada)
+        self._pending_n = 0
+        self._timer = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self.reset_metrics()
+        # Calentamiento: la primera evaluación (carga del kernel JIT) no cuenta como latencia
+        controller.evaluate_batch({name: np.zeros(1) for name in controller.input_names})
+
+    # -------- Métricas --------
+    def reset_metrics(self):
+        self.t0 = time.perf_counter()
+        self.requests = 0
+        self.samples = 0
+        self.batch_size = RunningStats()
+        self.latency_ms = StreamSummary()
+        self.eval_ms = StreamSummary()
+
+    def metrics(self):
+        elapsed = max(time.perf_counter() - self.t0, 1e-9)
+        return {
+            "elapsed_s": elapsed,
+            "requests": self.requests,
+            "samples": self.samples,
+            "requests_per_s": self.requests / elapsed,
+            "samples_per_s": self.samples / elapsed,
+            "batch_size": self.batch_size.to_dict(),
+            "eval_ms": self.eval_ms.to_dict(),
+            "latency_ms": self.latency_ms.to_dict(),
+        }
+
+    # -------- Arranque --------
+    def serve_forever(self):
+        # Bloqueante (inference_server.py); Ctrl+C para salir
+        asyncio.run(self._serve())
+
+    def start(self):
+        # En un hilo propio (pruebas y benchmark en el mismo proceso)
+        self._thread = threading.Thread(target=self.serve_forever, name="automax-inference", daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+
+    def stop(self):
+        if self._loop is not None and self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._stop_evt.set)
+            self._thread.join(timeout=2.0)
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_evt = asyncio.Event()
+        server = await asyncio.start_server(self._on_client, self.host, self.port)
+        log.info("Inferencia en tcp://%s:%s (%s, ventana %.1f ms, lote máx %d)", self.host, self.port,
+                 os.path.basename(getattr(self.controller, "rules_path", "?")), self.max_wait * 1000,
+                 self.max_batch)
+        self._ready.set()
+        try:
+            await self._stop_evt.wait()
+        finally:
+            server.close()
+
+    def _hello(self):
+        return json.dumps({
+            "rules": os.path.basename(getattr(self.controller, "rules_path", "")),
+            "inputs": list(self.controller.input_names),
+            "outputs": list(self.controller.output_names),
+            "fallback": getattr(self.controller, "fallback", 0.0),
+        }).encode()
+
+    # -------- Conexiones --------
+    async def _on_client(self, reader, writer):
+        hello = self._hello()
+        writer.write(LENGTH.pack(len(hello)) + hello)
+        try:
+            while True:
+                (size,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                msg = await reader.readexactly(size)
+                req_id, n = HEAD.unpack_from(msg)
+                X = np.frombuffer(msg, dtype="<f8", offset=HEAD.size).reshape(n, self.n_in)
+                self._submit(writer, req_id, X)
+                await writer.drain()   # las respuestas se acumulan solo hasta el límite del transporte
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass    # cliente desconectado o servidor parándose
+        except (struct.error, ValueError) as e:
+            log.warning("Inferencia: petición inválida de %s: %s", writer.get_extra_info("peername"), e)
+        finally:
+            writer.close()
+
+    def _submit(self, writer, req_id, X):
+        self._pending.append((writer, req_id, X, time.perf_counter()))
+        self._pending_n += X.shape[0]
+        if self._pending_n >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(self.max_wait, self._flush)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._pending_n = self._pending, [], 0
+        if not pending:
+            return
+
+        # Una sola evaluación vectorizada para todo el lote
+        t_eval = time.perf_counter()
+        X = np.concatenate([p[2] for p in pending]) if len(pending) > 1 else pending[0][2]
+        out = self.controller.evaluate_batch(dict(zip(self.controller.input_names, X.T)))
+        Y = np.empty((X.shape[0], self.n_out), dtype="<f8")
+        for o, name in enumerate(self.controller.output_names):
+            Y[:, o] = out[name]
+        done = time.perf_counter()
+        self.eval_ms.add((done - t_eval) * 1000)
+
+        k = 0
+        for writer, req_id, Xi, t_in in pending:
+            n = Xi.shape[0]
+            body = HEAD.pack(req_id, n) + Y[k:k + n].tobytes()
+            k += n
+            if not writer.is_closing():
+                writer.write(LENGTH.pack(len(body)) + body)
+            self.latency_ms.add((done - t_in) * 1000)
+        self.requests += len(pending)
+        self.samples += X.shape[0]
+        self.batch_size.add(len(pending))
+
+
+# -------------------- Cliente --------------------
+class _NoWatcher:
+    # El servidor vigila el archivo de reglas; en el cliente no hay nada que recargar
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class RemoteController:
+    def __init__(self, address, rules_path=None, timeout=5.0, request_timeout_s=0.02, reconnect_s=1.0):
+        # address: "host:puerto"; rules_path (opcional) se comprueba contra el del servidor
+        self.address = address
+        self.timeout = timeout                      # primera conexión (fuera del bucle)
+        self.request_timeout_s = request_timeout_s  # cada petición y reconexión
+        self.reconnect_s = reconnect_s
+        self.sock = self._buf = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+        hello = self._connect(timeout)
+        self.rules_path = hello["rules"]
+        self.fallback = hello["fallback"]
+        self.input_names = tuple(hello["inputs"])
+        self.output_names = tuple(hello["outputs"])
+        if rules_path is not None and os.path.basename(rules_path) != self.rules_path:
+            self.close()
+            raise ValueError(f"El servidor {address} sirve {self.rules_path}, no {os.path.basename(rules_path)}")
+
+    def _connect(self, timeout):
+        host, port = self.address.rsplit(":", 1)
+        self.sock = socket.create_connection((host, int(port)), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buf = self.sock.makefile("rb")
+        hello = json.loads(self._read_msg())
+        self.sock.settimeout(self.request_timeout_s)
+        return hello
+
+    def _reconnect(self):
+        # Desde el bucle de control: con el timeout corto de las peticiones.
+        # El servidor pudo reiniciarse: solo se acepta si sirve las mismas entradas/salidas
+        try:
+            hello = self._connect(self.request_timeout_s)
+        except (OSError, ValueError):
+            self.close()
+            raise
+        if (tuple(hello["inputs"]), tuple(hello["outputs"])) != (self.input_names, self.output_names):
+            self.close()
+            raise ConnectionError(f"El servidor {self.address} sirve otras entradas/salidas")
+        log.info("Reconectado al servidor de inferencia %s", self.address)
+
+    def close(self):
+        if self._buf is not None:
+            self._buf.close()
+        if self.sock is not None:
+            self.sock.close()
+        self.sock = self._buf = None
+
+    def watcher(self, interval=0.5, on_reload=None):
+        return _NoWatcher()
+
+    def _read_msg(self):
+        head = self._buf.read(LENGTH.size)
+        if len(head) < LENGTH.size:
+            raise ConnectionError(f"Servidor de inferencia {self.address} cerrado")
+        (size,) = LENGTH.unpack(head)
+        msg = self._buf.read(size)
+        if len(msg) < size:
+            raise ConnectionError(f"Servidor de inferencia {self.address} cerrado a mitad de mensaje")
+        return msg
+
+    def _call(self, X):
+        # X: (n, entradas) -> (n, salidas); una petición en vuelo por conexión
+        n = X.shape[0]
+        if n > MAX_SAMPLES:
+            return np.concatenate([self._call(X[i:i + MAX_SAMPLES]) for i in range(0, n, MAX_SAMPLES)])
+        with self._lock:
+            if self.sock is None:
+                if time.monotonic() < self._retry_at:
+                    return self._fallback(n)
+                try:
+                    self._reconnect()
+                except (OSError, ValueError) as e:
+                    self._retry_at = time.monotonic() + self.reconnect_s
+                    log.debug("Servidor de inferencia %s sigue sin responder: %s", self.address, e)
+                    return self._fallback(n)
+            try:
+                req_id = self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+                body = HEAD.pack(req_id, n) + np.ascontiguousarray(X, dtype="<f8").tobytes()
+                self.sock.settimeout(self.request_timeout_s)
+                self.sock.sendall(LENGTH.pack(len(body)) + body)
+                msg = self._read_msg()
+                got_id, got_n = HEAD.unpack_from(msg)
+                if got_id != req_id or got_n != n:
+                    raise ConnectionError(f"Respuesta desordenada del servidor de inferencia ({got_id} != {req_id})")
+                return np.frombuffer(msg, dtype="<f8", offset=HEAD.size).reshape(n, len(self.output_names))
+            except (OSError, struct.error, ValueError) as e:
+                # Conexión perdida o desincronizada (timeout tras sendall): se descarta entera
+                log.warning("Servidor de inferencia %s sin respuesta (%s); fallback %s y reconexión",
+                            self.address, e, self.fallback)
+                self.close()
+                self._retry_at = time.monotonic() + self.reconnect_s
+                return self._fallback(n)
+
+    def _fallback(self, n):
+        return np.full((n, len(self.output_names)), float(self.fallback))
+
+    def evaluate(self, values):
+        X = np.array([[float(values[name]) for name in self.input_names]])
+        Y = self._call(X)[0]
+        return {name: float(y) for name, y in zip(self.output_names, Y)}
+
+    def evaluate_batch(self, values):
+        cols = np.broadcast_arrays(*[np.asarray(values[name], dtype=float).ravel() for name in self.input_names])
+        Y = self._call(np.stack(cols, axis=1))
+        return {name: Y[:, o] for o, name in enumerate(self.output_names)}
+
+    # API posicional (orden de entradas del archivo de reglas)
+    def compute(self, *args):
+        out = self.evaluate(dict(zip(self.input_names, args)))
+        vals = tuple(out[name] for name in self.output_names)
+        return vals[0] if len(vals) == 1 else vals
+
+    def compute_batch(self, *args):
+        out = self.evaluate_batch(dict(zip(self.input_names, args)))
+        vals = tuple(out[name] for name in self.output_names)
+        return vals[0] if len(vals) == 1 else vals
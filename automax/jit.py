@@ -0,0 +1,433 @@
+"""
+Kernels compilados (Numba, opcional) para AUTOMAX
+- Inferencia Mamdani muestra a muestra en un bucle nativo: membresías (interp), reglas como
+  programa postfijo (min/max/1-x), recorte + máximo y centroide exacto por tramos.
+- TSK (SugenoController): las mismas activaciones y el promedio ponderado de los
+  consecuentes lineales en el mismo bucle.
+  Con índice de reglas (rule_index) solo se evalúan las reglas que pueden disparar.
+  Misma aritmética que CompiledRuleBase (fuzzy_fast), sin el costo por llamada de NumPy.
+- Cinemática: avance de un carril del tráfico (con reordenado por inserción) y paso del
+  coche clásico (relajación al slider, distancia relativa y disparo del rebase).
+  Solo los rollouts por lotes (scenarios) la usan: el bucle en vivo avanza un coche por
+  cuadro con tráfico de varios vehículos, partículas y claxon, y sigue en ClassicPhysics.
+- Sin Numba los mismos kernels corren como Python puro (solo para la prueba de paridad);
+  el simulador sigue usando el camino NumPy.
+"""
+
+import numpy as np
+
+from .worker import get_async_logger
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # @njit y @njit(cache=True) sin Numba: devuelve la función tal cual
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+log = get_async_logger()
+
+_TERM, _AND, _OR, _NOT = 0, 1, 2, 3
+_MAX_STACK = 64
+
+
+# -------------------- Inferencia --------------------
+@njit(cache=True)
+def _interp(x, xp, fp, n):
+    # np.interp escalar (misma fórmula) sin el costo por llamada de la versión de arrays
+    if x <= xp[0]:
+        return fp[0]
+    if x >= xp[n - 1]:
+        return fp[n - 1]
+    lo = 0
+    hi = n - 1
+    while hi - lo > 1:      # xp[lo] <= x < xp[hi]
+        mid = (lo + hi) >> 1
+        if xp[mid] <= x:
+            lo = mid
+        else:
+            hi = mid
+    if xp[lo] == x:
+        return fp[lo]
+    slope = (fp[hi] - fp[lo]) / (xp[hi] - xp[lo])
+    return slope * (x - xp[lo]) + fp[lo]
+
+
+@njit(cache=True)
+def _firing(X, n, in_lo, in_hi, term_input, term_x, term_y, term_len, rule_start, prog_op, prog_arg,
+            iv_edges, iv_count, iv_rule_ok, iv_term_ok, mu, stack, iv, act):
+    # Activación de cada regla para la muestra n (0 exacto en las que el índice descarta)
+    n_in = X.shape[1]
+    n_terms = term_input.shape[0]
+    n_rules = rule_start.shape[0] - 1
+    # Intervalo de cada entrada en el índice de reglas
+    for i in range(n_in):
+        x = min(max(X[n, i], in_lo[i]), in_hi[i])
+        k = 0
+        while k + 1 < iv_count[i] and iv_edges[i, k + 1] <= x:
+            k += 1
+        iv[i] = k
+
+    # Membresías: los términos inactivos en el intervalo valen 0 exacto
+    for t in range(n_terms):
+        i = term_input[t]
+        if not iv_term_ok[i, iv[i], t]:
+            mu[t] = 0.0
+            continue
+        mu[t] = _interp(min(max(X[n, i], in_lo[i]), in_hi[i]), term_x[t], term_y[t], term_len[t])
+
+    for r in range(n_rules):
+        act[r] = 0.0
+        skip = False
+        for i in range(n_in):
+            if not iv_rule_ok[i, iv[i], r]:
+                skip = True
+                break
+        if skip:
+            continue
+        sp = 0
+        for p in range(rule_start[r], rule_start[r + 1]):
+            op = prog_op[p]
+            if op == 0:
+                stack[sp] = mu[prog_arg[p]]
+                sp += 1
+            elif op == 1:
+                sp -= 1
+                stack[sp - 1] = min(stack[sp - 1], stack[sp])
+            elif op == 2:
+                sp -= 1
+                stack[sp - 1] = max(stack[sp - 1], stack[sp])
+            else:
+                stack[sp - 1] = 1.0 - stack[sp - 1]
+        act[r] = stack[0]
+
+
+@njit(cache=True)
+def _infer(X, in_lo, in_hi, term_input, term_x, term_y, term_len,
+           rule_start, prog_op, prog_arg, cons_start, cons_out, cons_term, cons_w,
+           out_x, out_mf, out_len, out_nterms, iv_edges, iv_count, iv_rule_ok, iv_term_ok, out, valid):
+    n_samples = X.shape[0]
+    n_in = X.shape[1]
+    n_terms = term_input.shape[0]
+    n_rules = rule_start.shape[0] - 1
+    n_out = out_x.shape[0]
+    mu = np.empty(n_terms)
+    stack = np.empty(_MAX_STACK)
+    act = np.empty(n_rules)
+    cut = np.zeros((n_out, out_mf.shape[1]))
+    iv = np.empty(n_in, dtype=np.int64)
+    for n in range(n_samples):
+        _firing(X, n, in_lo, in_hi, term_input, term_x, term_y, term_len, rule_start, prog_op, prog_arg,
+                iv_edges, iv_count, iv_rule_ok, iv_term_ok, mu, stack, iv, act)
+        cut[:, :] = 0.0
+        for r in range(n_rules):
+            for c in range(cons_start[r], cons_start[r + 1]):
+                v = act[r] * cons_w[c]
+                if v > cut[cons_out[c], cons_term[c]]:
+                    cut[cons_out[c], cons_term[c]] = v
+
+        ok = True
+        for o in range(n_out):
+            area = 0.0
+            mom = 0.0
+            y_prev = 0.0
+            for m in range(out_len[o]):
+                y = 0.0
+                for t in range(out_nterms[o]):
+                    v = min(cut[o, t], out_mf[o, t, m])
+                    if v > y:
+                        y = v
+                if m > 0:
+                    x1 = out_x[o, m - 1]
+                    x2 = out_x[o, m]
+                    dx = x2 - x1
+                    area += dx * (y_prev + y) * 0.5
+                    mom += dx * (x1 * (2 * y_prev + y) + x2 * (y_prev + 2 * y)) / 6.0
+                y_prev = y
+            if area > 0:
+                out[n, o] = mom / area
+            else:
+                out[n, o] = np.nan
+                ok = False
+        valid[n] = ok
+
+
+@njit(cache=True)
+def _tsk(X, in_lo, in_hi, term_input, term_x, term_y, term_len, rule_start, prog_op, prog_arg,
+         iv_edges, iv_count, iv_rule_ok, iv_term_ok, uses, coef, out_lo, out_hi, fallback, out):
+    # TSK de primer orden: y_o = sum_r w_r (p_r . [x_escalada, 1]) / sum_r w_r (reglas de la salida o)
+    n_samples = X.shape[0]
+    n_in = X.shape[1]
+    n_rules = rule_start.shape[0] - 1
+    n_out = uses.shape[0]
+    mu = np.empty(term_input.shape[0])
+    stack = np.empty(_MAX_STACK)
+    act = np.empty(n_rules)
+    iv = np.empty(n_in, dtype=np.int64)
+    xs = np.ones(n_in + 1)
+    for n in range(n_samples):
+        _firing(X, n, in_lo, in_hi, term_input, term_x, term_y, term_len, rule_start, prog_op, prog_arg,
+                iv_edges, iv_count, iv_rule_ok, iv_term_ok, mu, stack, iv, act)
+        for i in range(n_in):
+            xs[i] = (min(max(X[n, i], in_lo[i]), in_hi[i]) - in_lo[i]) / (in_hi[i] - in_lo[i])
+        for o in range(n_out):
+            num = 0.0
+            total = 0.0
+            for r in range(n_rules):
+                w = act[r]
+                if not uses[o, r] or w == 0.0:
+                    continue
+                lin = 0.0
+                for j in range(n_in + 1):
+                    lin += coef[o, r, j] * xs[j]
+                num += w * lin
+                total += w
+            if total > 0:
+                out[n, o] = min(max(num / total, out_lo[o]), out_hi[o])
+            else:
+                out[n, o] = fallback
+
+
+def _postfix(node, term_index, ops, args):
+    # Añade el programa de node; devuelve la profundidad de pila que necesita
+    kind = node[0]
+    if kind == "term":
+        ops.append(_TERM)
+        args.append(term_index[(node[1], node[2])])
+        return 1
+    if kind == "not":
+        depth = _postfix(node[1], term_index, ops, args)
+        ops.append(_NOT)
+        args.append(0)
+        return depth
+    left = _postfix(node[1], term_index, ops, args)
+    right = _postfix(node[2], term_index, ops, args)
+    ops.append(_AND if kind == "and" else _OR)
+    args.append(0)
+    return max(left, right + 1)
+
+
+class JitEvaluator:
+    # Aplana un CompiledRuleBase a arrays planos para _infer
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.input_names = compiled.input_names
+        self.output_names = compiled.output_names
+
+        in_index = {name: i for i, name in enumerate(compiled.input_names)}
+        term_index = {}
+        tx, ty, tin = [], [], []
+        for name, univ, terms in compiled.inputs:
+            for lbl, mf in terms.items():
+                term_index[(name, lbl)] = len(tx)
+                tx.append(univ)
+                ty.append(np.asarray(mf, dtype=float))
+                tin.append(in_index[name])
+        width = max(len(x) for x in tx)
+        self.term_x = np.zeros((len(tx), width))
+        self.term_y = np.zeros((len(tx), width))
+        self.term_len = np.array([len(x) for x in tx], dtype=np.int64)
+        for t, (x, y) in enumerate(zip(tx, ty)):
+            self.term_x[t, :len(x)] = x
+            self.term_y[t, :len(y)] = y
+        self.term_input = np.array(tin, dtype=np.int64)
+        self.in_lo = np.array([univ[0] for _, univ, _ in compiled.inputs])
+        self.in_hi = np.array([univ[-1] for _, univ, _ in compiled.inputs])
+
+        # Reglas: programa postfijo + consecuentes
+        out_index = {name: o for o, name in enumerate(compiled.output_names)}
+        ops, args, starts = [], [], [0]
+        c_out, c_term, c_w, c_starts = [], [], [], [0]
+        for r, (antecedent, cons) in enumerate(compiled.rules):
+            depth = _postfix(antecedent, term_index, ops, args)
+            if depth > _MAX_STACK:
+                # Los kernels reservan una pila fija; una regla más anidada la desbordaría
+                raise ValueError(f"Regla {r}: antecedente con profundidad {depth} > {_MAX_STACK}")
+            starts.append(len(ops))
+            for out, lbl, weight in cons:
+                c_out.append(out_index[out])
+                c_term.append(compiled._out[out][1].index(lbl))
+                c_w.append(weight)
+            c_starts.append(len(c_out))
+        self.rule_start = np.array(starts, dtype=np.int64)
+        self.prog_op = np.array(ops, dtype=np.int64)
+        self.prog_arg = np.array(args, dtype=np.int64)
+        self.cons_start = np.array(c_starts, dtype=np.int64)
+        self.cons_out = np.array(c_out, dtype=np.int64)
+        self.cons_term = np.array(c_term, dtype=np.int64)
+        self.cons_w = np.array(c_w, dtype=float)
+
+        # Salidas: la misma malla fina que usa defuzz
+        grids = [compiled._out[name] for name in compiled.output_names]
+        m_max = max(len(xs) for xs, _, _ in grids)
+        t_max = max(mfs.shape[0] for _, _, mfs in grids)
+        self.out_x = np.zeros((len(grids), m_max))
+        self.out_mf = np.zeros((len(grids), t_max, m_max))
+        self.out_len = np.array([len(xs) for xs, _, _ in grids], dtype=np.int64)
+        self.out_nterms = np.array([mfs.shape[0] for _, _, mfs in grids], dtype=np.int64)
+        for o, (xs, _, mfs) in enumerate(grids):
+            self.out_x[o, :len(xs)] = xs
+            self.out_mf[o, :mfs.shape[0], :mfs.shape[1]] = mfs
+
+        # Índice de reglas (rule_index); sin índice, un solo intervalo con todo activo
+        n_in, n_terms, n_rules = len(compiled.inputs), len(tx), len(compiled.rules)
+        if compiled.index is None:
+            self.iv_edges = self.in_lo[:, None].copy()
+            self.iv_count = np.ones(n_in, dtype=np.int64)
+            self.iv_rule_ok = np.ones((n_in, 1, n_rules), dtype=np.bool_)
+            self.iv_term_ok = np.ones((n_in, 1, n_terms), dtype=np.bool_)
+        else:
+            entries = compiled.index.inputs
+            k_max = max(len(e[3]) for e in entries)
+            self.iv_edges = np.full((n_in, k_max), np.inf)
+            self.iv_count = np.array([len(e[3]) for e in entries], dtype=np.int64)
+            self.iv_rule_ok = np.zeros((n_in, k_max, n_rules), dtype=np.bool_)
+            self.iv_term_ok = np.zeros((n_in, k_max, n_terms), dtype=np.bool_)
+            first = 0
+            for i, (_, _, _, edges, ok, act) in enumerate(entries):
+                k = len(edges)
+                self.iv_edges[i, :k] = edges
+                self.iv_rule_ok[i, :k] = ok
+                self.iv_term_ok[i, :k, first:first + act.shape[1]] = act
+                first += act.shape[1]
+
+    def matrix(self, values):
+        # (n, entradas) con los escalares repetidos al tamaño del lote
+        cols = [np.asarray(values[name], dtype=float).ravel() for name in self.input_names]
+        n = max(c.size for c in cols)
+        X = np.empty((n, len(cols)))
+        for i, c in enumerate(cols):
+            X[:, i] = c
+        return X
+
+    def evaluate(self, values):
+        X = self.matrix(values)
+        n = X.shape[0]
+        out = np.empty((n, len(self.output_names)))
+        valid = np.empty(n, dtype=np.bool_)
+        _infer(X, self.in_lo, self.in_hi, self.term_input, self.term_x, self.term_y, self.term_len,
+               self.rule_start, self.prog_op, self.prog_arg, self.cons_start, self.cons_out,
+               self.cons_term, self.cons_w, self.out_x, self.out_mf, self.out_len, self.out_nterms,
+               self.iv_edges, self.iv_count, self.iv_rule_ok, self.iv_term_ok, out, valid)
+        return {name: out[:, o] for o, name in enumerate(self.output_names)}, valid
+
+
+class TskEvaluator:
+    # Consecuentes lineales del SugenoController sobre los arrays de un JitEvaluator
+    def __init__(self, jit, rule_ids, coef, out_range, fallback):
+        self.jit = jit
+        self.output_names = jit.output_names
+        n_rules = jit.rule_start.shape[0] - 1
+        k = len(jit.input_names) + 1
+        self.uses = np.zeros((len(self.output_names), n_rules), dtype=np.bool_)
+        self.coef = np.zeros((len(self.output_names), n_rules, k))
+        for o, name in enumerate(self.output_names):
+            self.uses[o, rule_ids[name]] = True
+            self.coef[o, rule_ids[name]] = coef[name]
+        self.out_lo = np.array([out_range[name][0] for name in self.output_names])
+        self.out_hi = np.array([out_range[name][1] for name in self.output_names])
+        self.fallback = float(fallback)
+
+    def evaluate(self, values):
+        j = self.jit
+        X = j.matrix(values)
+        out = np.empty((X.shape[0], len(self.output_names)))
+        _tsk(X, j.in_lo, j.in_hi, j.term_input, j.term_x, j.term_y, j.term_len, j.rule_start, j.prog_op,
+             j.prog_arg, j.iv_edges, j.iv_count, j.iv_rule_ok, j.iv_term_ok, self.uses, self.coef,
+             self.out_lo, self.out_hi, self.fallback, out)
+        return {name: out[:, o] for o, name in enumerate(self.output_names)}
+
+
+def attach(compiled):
+    # Activa el kernel en un CompiledRuleBase si hay Numba; sin Numba queda el camino NumPy
+    if HAVE_NUMBA:
+        try:
+            compiled.jit = JitEvaluator(compiled)
+        except ValueError as e:
+            log.warning("Kernel JIT desactivado (%s); se usa el camino NumPy.", e)
+            compiled.jit = None
+    return compiled
+
+
+# -------------------- Cinemática --------------------
+@njit(cache=True)
+def advance_lane(pos, speed, ego_speed, dt, scale, behind, length):
+    # En sitio: mismo resultado que Traffic.advance para un carril
+    n = pos.shape[0]
+    for i in range(n):
+        p = pos[i] - (ego_speed - speed[i]) / 3.6 * dt * scale
+        if p < -behind:
+            p += length + behind
+        if p > length:
+            p = length
+        pos[i] = p
+    # Inserción estable: casi lineal porque el orden apenas cambia entre pasos
+    for i in range(1, n):
+        p = pos[i]
+        s = speed[i]
+        j = i - 1
+        while j >= 0 and pos[j] > p:
+            pos[j + 1] = pos[j]
+            speed[j + 1] = speed[j]
+            j -= 1
+        pos[j + 1] = p
+        speed[j + 1] = s
+
+
+@njit(cache=True)
+def classic_kinematics(action, speed, disp, dist, obst_speed, dt, relax, rebase_m, respawn_m, hit):
+    # En sitio: accion -> aceleración, relajación al slider, distancia relativa y rebase
+    for n in range(action.shape[0]):
+        a = action[n]
+        if a < 35:
+            accel = -60.0
+        elif a > 65:
+            accel = 18.0
+        else:
+            accel = -6.0
+        v = disp[n] + accel * dt
+        v = v + (speed[n] - v) * relax
+        v = min(max(v, 0.0), 120.0)
+        disp[n] = v
+        d = dist[n] - (v - obst_speed[n]) / 3.6 * dt
+        d = min(max(d, 0.0), 100.0)
+        hit[n] = d <= rebase_m
+        dist[n] = respawn_m if hit[n] else d
+
+
+def classic_kinematics_np(action, speed, disp, dist, obst_speed, dt, relax, rebase_m, respawn_m, hit):
+    # Referencia NumPy de classic_kinematics (misma firma, en sitio)
+    accel = np.where(action < 35, -60.0, np.where(action > 65, 18.0, -6.0))
+    v = disp + accel * dt
+    v = v + (speed - v) * relax
+    disp[:] = np.clip(v, 0.0, 120.0)
+    d = np.clip(dist - (disp - obst_speed) / 3.6 * dt, 0.0, 100.0)
+    hit[:] = d <= rebase_m
+    dist[:] = np.where(hit, respawn_m, d)
+
+
+# -------------------- Paridad --------------------
+def check_parity(compiled, n=2000, seed=0):
+    # Máxima diferencia entre el kernel (nativo o Python puro) y el camino NumPy
+    rng = np.random.default_rng(seed)
+    values = {name: rng.uniform(univ[0] - 5, univ[-1] + 5, n) for name, univ, _ in compiled.inputs}
+    ref, ref_ok = _numpy_eval(compiled, values)
+    got, got_ok = JitEvaluator(compiled).evaluate(values)
+    diff = {name: float(np.max(np.abs(ref[name] - got[name])[ref_ok], initial=0.0))
+            for name in compiled.output_names}
+    return diff, bool(np.array_equal(ref_ok, got_ok))
+
+
+def _numpy_eval(compiled, values):
+    # Referencia densa: todas las reglas, sin kernel ni índice
+    jit, index = compiled.jit, compiled.index
+    compiled.jit = compiled.index = None
+    try:
+        return compiled.evaluate(values)
+    finally:
+        compiled.jit, compiled.index = jit, index
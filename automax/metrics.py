@@ -0,0 +1,187 @@
+"""
+KPIs de seguridad de AUTOMAX calculados en línea (dentro de update, memoria constante)
+- TTC (tiempo a colisión) con el vehículo más cercano, headway mínimo (m y s).
+- Frenadas fuertes: brake_val > 60 o action_val < 35 (se cuentan flancos de subida).
+- Ciclo de trabajo del claxon y frecuencia de rebases.
+- Estadísticos con Welford y cuantiles con P² (Jain & Chlamtac): no hace falta
+  cargar self.log en pandas para obtenerlos; se exportan a JSON por sesión.
+"""
+
+import json
+import math
+import os
+from datetime import datetime
+
+from .config import RESULTS_DIR
+
+HARD_BRAKE = 60.0     # brake_val (simulator.py)
+HARD_ACTION = 35.0    # action_val (simulador.py): por debajo es FRENAR
+TTC_MAX = 60.0        # s; por encima no hay riesgo y no se registra
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+# -------------------- Estadísticos en streaming --------------------
+class RunningStats:
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def to_dict(self):
+        if not self.n:
+            return {"n": 0}
+        return {"n": self.n, "mean": self.mean, "std": self.std, "min": self.min, "max": self.max}
+
+
+class P2Quantile:
+    # Estimador P²: 5 marcadores, ajuste parabólico; O(1) memoria y tiempo por muestra
+    def __init__(self, p):
+        self.p = p
+        self.q = []
+        self.pos = [0.0, 1.0, 2.0, 3.0, 4.0]
+        self.want = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.inc = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x):
+        q = self.q
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        pos, want = self.pos, self.want
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            want[i] += self.inc[i]
+        for i in (1, 2, 3):
+            d = want[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                s = 1 if d > 0 else -1
+                qs = q[i] + s / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + s) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - s) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1]))
+                if not q[i - 1] < qs < q[i + 1]:
+                    qs = q[i] + s * (q[i + s] - q[i]) / (pos[i + s] - pos[i])
+                q[i] = qs
+                pos[i] += s
+
+    def value(self):
+        if not self.q:
+            return None
+        if len(self.q) < 5:
+            return self.q[min(len(self.q) - 1, int(round(self.p * (len(self.q) - 1))))]
+        return self.q[2]
+
+
+class StreamSummary:
+    # RunningStats + cuantiles de la misma serie
+    def __init__(self, quantiles=QUANTILES):
+        self.stats = RunningStats()
+        self.sketches = [P2Quantile(p) for p in quantiles]
+
+    def add(self, x):
+        self.stats.add(x)
+        for sk in self.sketches:
+            sk.add(x)
+
+    def to_dict(self):
+        d = self.stats.to_dict()
+        for sk in self.sketches:
+            d[f"p{sk.p * 100:g}"] = sk.value()
+        return d
+
+
+# -------------------- KPIs de seguridad --------------------
+class SafetyMetrics:
+    def __init__(self):
+        self.elapsed = 0.0
+        self.ttc = StreamSummary()
+        self.headway_m = StreamSummary()
+        self.headway_s = StreamSummary()
+        self.hard_brakes = 0
+        self.hard_brake_time = 0.0
+        self.horn_time = 0.0
+        self.rebases = 0
+        self._braking = False
+        self._last_rebase_count = 0
+
+    def update(self, sim, dt):
+        self.elapsed += dt
+        dist = sim.obst_distance_m
+        ego_ms = sim.display_speed / 3.6
+
+        # TTC con la velocidad propia del vehículo más cercano
+        near = sim.traffic.nearest()
+        if near is not None:
+            _, lane, i = near
+            closing = ego_ms - float(sim.traffic.speed[lane][i]) / 3.6
+            if closing > 0.0:
+                ttc = dist / closing
+                if ttc < TTC_MAX:
+                    self.ttc.add(ttc)
+
+        # Headway: distancia y tiempo hasta el de delante
+        self.headway_m.add(dist)
+        if ego_ms > 0.1:
+            self.headway_s.add(dist / ego_ms)
+
+        braking = sim.brake_val > HARD_BRAKE or sim.action_val < HARD_ACTION
+        if braking:
+            self.hard_brake_time += dt
+            if not self._braking:
+                self.hard_brakes += 1
+        self._braking = braking
+
+        if sim.horn_playing:
+            self.horn_time += dt
+
+        self.rebases += sim.rebase_count - self._last_rebase_count
+        self._last_rebase_count = sim.rebase_count
+
+    def to_dict(self):
+        minutes = self.elapsed / 60.0
+        return {
+            "elapsed_s": round(self.elapsed, 3),
+            "ttc_s": self.ttc.to_dict(),
+            "headway_m": self.headway_m.to_dict(),
+            "headway_s": self.headway_s.to_dict(),
+            "min_headway_m": self.headway_m.stats.min if self.headway_m.stats.n else None,
+            "hard_brakes": self.hard_brakes,
+            "hard_brakes_per_min": self.hard_brakes / minutes if minutes else 0.0,
+            "hard_brake_time_s": round(self.hard_brake_time, 3),
+            "horn_duty_cycle": self.horn_time / self.elapsed if self.elapsed else 0.0,
+            "rebases": self.rebases,
+            "rebases_per_min": self.rebases / minutes if minutes else 0.0,
+        }
+
+    def save(self, path=None):
+        if path is None:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            path = os.path.join(RESULTS_DIR, f"kpi_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
@@ -0,0 +1,76 @@
+"""
+Render sin ventana de sesiones grabadas (automax.recording) a secuencias PNG
+- Cada proceso construye su propio simulador con SDL "dummy" y dibuja con el draw()
+  de siempre (clima, rebase, HUD) en una superficie fuera de pantalla.
+- La línea de tiempo se parte en tramos contiguos; cada tramo salta una vez a su inicio
+  (instantánea + re-simulación) y luego avanza paso a paso.
+- Los PNG se numeran por posición en la secuencia (frame_000000.png, ...) y el
+  resultado no depende del número de procesos.
+"""
+
+import importlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+_worker = {}
+
+
+# -------------------- Procesos --------------------
+def _init_worker(path, script, seed):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import pygame
+
+    from .config import SCREEN_H, SCREEN_W
+    from .recording import Player, Recording
+
+    # Texturas aleatorias del render (nubes, polvo) iguales en todos los procesos
+    random.seed(seed)
+    sim = importlib.import_module(script).make_sim()
+    sim.recorder = None
+    sim.screen = pygame.Surface((SCREEN_W, SCREEN_H))
+    _worker["sim"] = sim
+    _worker["player"] = Player(sim, Recording(path))
+
+
+def _render_span(args):
+    # Pasos start, start + stride, ... < end; numerados desde index
+    import pygame
+
+    start, end, stride, index, out_dir = args
+    sim, player = _worker["sim"], _worker["player"]
+    names = []
+    for k, frame in enumerate(range(start, end, stride)):
+        player.seek(frame)
+        sim.renderer.draw(sim, sim.snapshot())
+        name = os.path.join(out_dir, f"frame_{index + k:06d}.png")
+        pygame.image.save(sim.screen, name)
+        names.append(name)
+    return names
+
+
+def spans(start, end, stride, per_task):
+    # Tramos contiguos de per_task imágenes: (inicio, fin, stride, primer índice)
+    out = []
+    index = 0
+    for a in range(start, end, stride * per_task):
+        b = min(end, a + stride * per_task)
+        out.append((a, b, stride, index))
+        index += len(range(a, b, stride))
+    return out
+
+
+def render_recording(path, out_dir, script, start=0, end=None, stride=1, workers=None,
+                     per_task=120, seed=0):
+    # Generador: devuelve la lista de PNG de cada tramo en orden
+    from .recording import Recording
+
+    rec = Recording(path)
+    end = len(rec) if end is None else min(end, len(rec))
+    rec.close()
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [span + (out_dir,) for span in spans(start, end, stride, per_task)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(path, script, seed)) as pool:
+        yield from pool.map(_render_span, jobs)
@@ -0,0 +1,264 @@
+"""
+Física de AUTOMAX: decisión difusa -> velocidad, obstáculo, rebase y partículas
+- ClassicPhysics: salida única 'accion' (frenar/mantener/acelerar) con inercia (simulador.py).
+  obstacle_dynamics=False deja la distancia en manos del slider (test.py).
+- ArcadePhysics: salidas freno/acelerador/claxon, velocidad 100% responsiva al slider (simulator.py).
+"""
+
+import random
+
+from . import config
+from .audio import Debounce
+from .traffic import LANES, Traffic
+
+
+def spawn_rebase_particles(sim, n):
+    cx_center = sim.car_x + sim.car_w // 2
+    cy_center = sim.car_y + sim.car_h // 2
+    for _ in range(n):
+        sim.rebase_particles.append([
+            cx_center,
+            cy_center,
+            random.uniform(0.5, 1.2),   # vida
+            random.uniform(-200, 200),  # vx
+            random.uniform(-300, -100)  # vy
+        ])
+
+
+def setup_traffic(sim, vehicles, speed_spread):
+    # El primer vehículo es el obstáculo inicial (obst_distance_m / obst_lane / obst_speed)
+    if vehicles is None:
+        vehicles = config.TRAFFIC_VEHICLES
+    if speed_spread is None:
+        speed_spread = config.TRAFFIC_SPEED_SPREAD
+    sim.traffic = Traffic()
+    sim.traffic.populate(vehicles, sim.obst_distance_m, sim.obst_lane, sim.obst_speed, speed_spread)
+
+
+def sense_nearest(sim):
+    # El más cercano alimenta la entrada 'distancia' del controlador
+    near = sim.traffic.nearest()
+    if near is None:
+        sim.obst_distance_m = sim.traffic.horizon
+        return None
+    sim.obst_distance_m = max(0.0, min(100.0, near[0]))
+    sim.obst_lane = near[1]
+    return near
+
+
+def update_rebase_particles(sim, dt):
+    newp = []
+    for p in sim.rebase_particles:
+        p[2] -= dt
+        p[0] += p[3] * dt
+        p[1] += p[4] * dt
+        if p[2] > 0:
+            newp.append(p)
+    sim.rebase_particles = newp
+
+
+# -------------------- Clásica (accion única) --------------------
+class ClassicPhysics:
+    def __init__(self, obstacle_dynamics=True, vehicles=None, speed_spread=None):
+        self.obstacle_dynamics = obstacle_dynamics
+        self.vehicles = vehicles
+        self.speed_spread = speed_spread
+
+    def setup(self, sim):
+        # claxon con histéresis: suena < 30 m, se apaga > 33 m
+        self.horn_debounce = Debounce(on=30.0, off=33.0, hold=0.25)
+        setup_traffic(sim, self.vehicles, self.speed_spread)
+
+    def reset(self, sim):
+        self.horn_debounce.reset()
+        setup_traffic(sim, self.vehicles, self.speed_spread)
+
+    def demo(self, sim):
+        if not self.obstacle_dynamics:
+            sim.slider_dist.value = random.uniform(5, 90)
+            sim.obst_distance_m = sim.slider_dist.value
+
+    def log_fields(self, sim):
+        return {"action_val": round(sim.action_val, 3)}
+
+    def update(self, sim, dt):
+        if not self.obstacle_dynamics:
+            sim.obst_distance_m = sim.slider_dist.value
+            sim.traffic.move_nearest(sim.obst_distance_m)
+
+        # --- Fuzzy decision ---
+        action_val = sim.fuzzy.evaluate({
+            'velocidad': sim.speed, 'distancia': sim.obst_distance_m, 'visibilidad': sim.visibility,
+        })['accion']
+
+        # Map a aceleración
+        if action_val < 35:
+            accel = -60.0
+            sim.brake_on = True
+            self.add_particles(sim, intensity=1.2, direction=-1)
+            action_text = "FRENAR"
+        elif action_val > 65:
+            accel = 18.0
+            sim.brake_on = False
+            self.add_particles(sim, intensity=1.6, direction=1)
+            action_text = "ACELERAR"
+        else:
+            accel = -6.0
+            sim.brake_on = False
+            action_text = "MANTENER"
+        sim.action_val = action_val
+        sim.action_text = action_text
+
+        # Claxon automático
+        is_close = self.horn_debounce.update(sim.obst_distance_m, sim.time)
+        sim.horn_playing = sim.audio.set_loop("horn", is_close)
+
+        # Integración velocidad visual
+        sim.display_speed += accel * dt
+        relax = 1.8
+        sim.display_speed += (sim.speed - sim.display_speed) * min(1.0, relax * dt)
+        sim.display_speed = max(0.0, min(120.0, sim.display_speed))
+
+        # Movimiento de líneas
+        vel_m_s = (sim.display_speed * 1000.0) / 3600.0
+        px_move = vel_m_s * sim.px_per_m * dt
+        sim.road_offset = (sim.road_offset + px_move) % 60
+        # Desplazamiento de las líneas centrales
+        dash_period = 40 + 90
+        move_px = vel_m_s * sim.px_per_m * dt * 2.2
+        sim.road_offset = (sim.road_offset + move_px) % dash_period
+
+        if self.obstacle_dynamics:
+            # --- Dinámica del tráfico (cada vehículo a su velocidad) ---
+            sim.traffic.advance(sim.display_speed, dt)
+            near = sense_nearest(sim)
+
+            # --- Rebase/esquive automático y animación ---
+            if near is not None and sim.obst_distance_m <= 5.0 and sim.rebase_anim <= 0.0:
+                # Simula que lo rebasaste: reaparece adelante en carril aleatorio
+                _, lane, i = near
+                distance = random.uniform(80.0, 100.0)
+                sim.traffic.respawn(lane, i, random.choice(LANES), distance)
+                sense_nearest(sim)
+                sim.rebase_anim = 1.0
+                sim.rebase_dir = random.choice([-1, 1])
+                sim.rebase_count += 1
+                sim.rebase_particles = []
+                spawn_rebase_particles(sim, 30)
+            sim.slider_dist.value = sim.obst_distance_m
+
+        self.update_particles(sim, dt)
+        update_rebase_particles(sim, dt)
+
+    def add_particles(self, sim, intensity=1.0, direction=1):
+        llanta_izq_x = sim.car_x + 30 + random.uniform(-2, 2)
+        llanta_der_x = sim.car_x + sim.car_w - 50 + random.uniform(-2, 2)
+        y = sim.car_y + sim.car_h - 25 + random.uniform(0, 8)
+        for x in (llanta_izq_x, llanta_der_x):
+            for _ in range(int(1 + intensity)):
+                life = random.uniform(0.4, 1.0)
+                vx = random.uniform(10,60) * (0.02 * (-direction))
+                vy = random.uniform(-10,5) * 0.02
+                sim.particles.append([x, y, life, vx, vy, (255,180,60)])
+
+    def update_particles(self, sim, dt):
+        newp = []
+        for p in sim.particles:
+            p[2] -= dt
+            p[0] += p[3] * dt * 100
+            p[1] += p[4] * dt * 100
+            if p[2] > 0:
+                newp.append(p)
+        sim.particles = newp
+
+
+# -------------------- Arcade (freno / acelerador / claxon) --------------------
+class ArcadePhysics:
+    def __init__(self, vehicles=None, speed_spread=None):
+        self.vehicles = vehicles
+        self.speed_spread = speed_spread
+
+    def setup(self, sim):
+        # Claxon con histéresis: suena > 60, se apaga < 50
+        self.horn_debounce = Debounce(on=60.0, off=50.0, hold=0.25)
+        setup_traffic(sim, self.vehicles, self.speed_spread)
+
+    def reset(self, sim):
+        self.horn_debounce.reset()
+        setup_traffic(sim, self.vehicles, self.speed_spread)
+
+    def demo(self, sim):
+        pass
+
+    def log_fields(self, sim):
+        return {
+            "brake": round(sim.brake_val, 3),
+            "throttle": round(sim.throttle_val, 3),
+            "horn": round(sim.horn_val, 3),
+            "grip": round(sim.grip, 3),
+            "weather": sim.weather_mode,
+        }
+
+    def update(self, sim, dt):
+        # FUZZY
+        out = sim.fuzzy.evaluate({
+            'velocidad': sim.display_speed, 'distancia': sim.obst_distance_m,
+            'visibilidad': sim.visibility, 'adherencia': sim.grip,
+        })
+        brake, throttle, horn = out['freno'], out['acelerador'], out['claxon']
+        sim.brake_val = brake
+        sim.throttle_val = throttle
+        sim.horn_val = horn
+
+        # Física 100% responsiva al slider de velocidad
+        diff = sim.speed - sim.display_speed
+        sim.display_speed += diff * dt * 5.0
+        sim.display_speed = max(0, min(120, sim.display_speed))
+
+        # Tráfico dinámico y rebase
+        if not sim.dragging_obstacle:
+            sim.traffic.advance(sim.display_speed, dt, scale=0.8)
+            near = sense_nearest(sim)
+
+            if near is not None and near[0] <= 0.0:
+                if sim.rebase_anim <= 0:
+                    sim.rebase_anim = 1.0
+                    sim.rebase_dir = random.choice([-1, 1])
+                    _, lane, i = near
+                    sim.traffic.respawn(lane, i, random.choice(LANES), 100.0)
+                    sense_nearest(sim)
+                    sim.rebase_count += 1
+                    spawn_rebase_particles(sim, 20)
+
+            sim.slider_dist.value = sim.obst_distance_m
+
+        # Claxon (con antirrebote; la orden se encola, no bloquea el paso)
+        sim.horn_playing = sim.audio.set_loop("horn", self.horn_debounce.update(horn, sim.time))
+
+        # Texto Acción
+        if brake > throttle + 10: sim.action_text = "FRENAR"
+        elif throttle > brake + 10: sim.action_text = "ACELERANDO"
+        else: sim.action_text = "MANTENIENDO"
+
+        # Movimiento visual carretera y nubes
+        vel_ms = sim.display_speed / 3.6
+        sim.road_offset = (sim.road_offset + vel_ms * 5 * dt) % 60
+        sim.cloud_offset_x = (sim.cloud_offset_x + vel_ms * 0.8 * dt) % 200
+
+        self.update_particles(sim, dt)
+        update_rebase_particles(sim, dt)
+
+    def update_particles(self, sim, dt):
+        # Chispas/Humo al frenar
+        if sim.brake_val > 10:
+            lx = sim.car_x + 40; rx = sim.car_x + sim.car_w - 60; y = sim.car_y + sim.car_h - 10
+            color = (200, 200, 200) # Humo
+            if sim.brake_val > 60: color = (255, 150, 50) # Chispas naranjas
+            sim.particles.append([lx+random.uniform(-5,5), y, 0.5, random.uniform(-5,5), 10, color])
+            sim.particles.append([rx+random.uniform(-5,5), y, 0.5, random.uniform(-5,5), 10, color])
+
+        new_p = []
+        for p in sim.particles:
+            p[2] -= dt; p[0]+=p[3]*dt; p[1]+=p[4]*dt
+            if p[2]>0: new_p.append(p)
+        sim.particles = new_p
@@ -0,0 +1,259 @@
+"""
+Grabación de sesiones de AUTOMAX y lectura con acceso aleatorio (config.RECORD)
+- Recorder: por paso de física un registro fijo (tiempo de sesión, hora, hora acumulada,
+  dt; los dos acumulados no decrecen aunque se reinicie con R para poder bisecar); los
+  eventos de teclado/ratón con el paso en que se procesaron, y cada RECORD_KEYFRAME s una
+  instantánea completa (branch.capture) comprimida.
+- Sesión = directorio results/rec_*/ con meta.json, frames.bin, events.bin,
+  keyframes.bin y keyframes.idx (registros de tamaño fijo salvo las instantáneas).
+- Recording: abre los archivos con mmap (no se leen enteros) y guarda un índice disperso
+  (un tiempo cada SPARSE pasos); buscar un tiempo u hora es O(log n) y solo toca una
+  página del archivo.
+- Player: restaura la instantánea anterior y re-simula con los eventos grabados hasta
+  el paso pedido; el estado resultante es el de la sesión original en ese paso.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import zlib
+from datetime import datetime
+
+import numpy as np
+import pygame
+
+from .branch import capture, restore
+from .config import RESULTS_DIR
+
+FORMAT = "automax-rec-1"
+SPARSE = 1024       # pasos por entrada del índice disperso
+
+FRAME = np.dtype([("time", "<f8"), ("hour", "<f8"), ("clock", "<f8"), ("dt", "<f8")])
+EVENT = np.dtype([("frame", "<u8"), ("type", "<u4"), ("key", "<i4"), ("button", "<i4"),
+                  ("x", "<i4"), ("y", "<i4")])
+KEYFRAME = np.dtype([("frame", "<u8"), ("time", "<f8"), ("offset", "<u8"), ("length", "<u8")])
+
+EVENT_TYPES = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+# Teclas con efectos fuera de la simulación: no se reproducen
+SKIP_KEYS = (pygame.K_ESCAPE, pygame.K_s, pygame.K_b)
+
+
+# -------------------- Grabación --------------------
+class Recorder:
+    def __init__(self, path=None, keyframe_every=2.0):
+        if path is None:
+            path = os.path.join(RESULTS_DIR, f"rec_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.path = path
+        self.keyframe_every = keyframe_every
+        self.frames = 0             # pasos grabados; los eventos se aplican antes del paso frames
+        self._files = None
+        self._elapsed = 0.0
+        self._clock = 0.0
+        self._hour = None
+        self._last_key = None
+
+    def start(self, sim):
+        os.makedirs(self.path, exist_ok=True)
+        meta = {"format": FORMAT, "physics": type(sim.physics).__name__,
+                "weather": type(sim.weather).__name__, "renderer": type(sim.renderer).__name__,
+                "caption": pygame.display.get_caption()[0] if pygame.display.get_init() else "",
+                "started": datetime.now().isoformat(timespec="seconds")}
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        self._files = {name: open(os.path.join(self.path, name), "wb")
+                       for name in ("frames.bin", "events.bin", "keyframes.bin", "keyframes.idx")}
+        self._clock = sim.daytime
+        self._hour = sim.daytime
+        self.keyframe(sim)
+
+    def step(self, sim):
+        # Llamar tras cada paso de física (con el lock tomado)
+        if self._files is None:
+            return
+        self._elapsed += sim.dt
+        self._clock += (sim.daytime - self._hour) % 24.0
+        self._hour = sim.daytime
+        rec = np.array([(self._elapsed, sim.daytime, self._clock, sim.dt)], dtype=FRAME)
+        self._files["frames.bin"].write(rec.tobytes())
+        self.frames += 1
+        if self._elapsed - self._last_key >= self.keyframe_every:
+            self.keyframe(sim)
+
+    def event(self, e):
+        if self._files is None or e.type not in EVENT_TYPES:
+            return
+        x, y = getattr(e, "pos", (0, 0))
+        rec = np.array([(self.frames, e.type, getattr(e, "key", 0), getattr(e, "button", 0), x, y)],
+                       dtype=EVENT)
+        self._files["events.bin"].write(rec.tobytes())
+
+    def keyframe(self, sim):
+        extras = {"dragging": {k: getattr(sim, k).dragging for k in ("slider_speed", "slider_dist", "slider_vis")},
+                  "dragging_obstacle": sim.dragging_obstacle}
+        blob = zlib.compress(pickle.dumps((capture(sim), extras), protocol=pickle.HIGHEST_PROTOCOL), 1)
+        f = self._files["keyframes.bin"]
+        offset = f.tell()
+        f.write(blob)
+        idx = np.array([(self.frames, self._elapsed, offset, len(blob))], dtype=KEYFRAME)
+        self._files["keyframes.idx"].write(idx.tobytes())
+        for f in self._files.values():
+            f.flush()
+        self._last_key = self._elapsed
+
+    def close(self):
+        if self._files is not None:
+            for f in self._files.values():
+                f.close()
+            self._files = None
+
+
+# -------------------- Lectura --------------------
+def _map(path, dtype):
+    # Vista NumPy sobre el archivo mapeado (None si está vacío)
+    size = os.path.getsize(path)
+    n = size // dtype.itemsize
+    if n == 0:
+        return None, np.zeros(0, dtype=dtype)
+    f = open(path, "rb")
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    f.close()
+    return mm, np.frombuffer(mm, dtype=dtype, count=n)
+
+
+class Recording:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT:
+            raise ValueError(f"{path}: no es una grabación de AUTOMAX")
+        self._maps = []
+        self.frames = self._open("frames.bin", FRAME)
+        self.events = self._open("events.bin", EVENT)
+        self.keyframes = self._open("keyframes.idx", KEYFRAME)
+        self._blobs = self._open("keyframes.bin", None)
+        # Los pasos grabados después de la última instantánea también son válidos
+        self.n = len(self.frames)
+        # Índice disperso en memoria: tiempo y hora acumulada cada SPARSE pasos
+        self._sparse_time = np.array(self.frames["time"][::SPARSE])
+        self._sparse_clock = np.array(self.frames["clock"][::SPARSE])
+
+    def _open(self, name, dtype):
+        path = os.path.join(self.path, name)
+        if dtype is None:
+            if os.path.getsize(path) == 0:
+                return b""
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mm)
+            return mm
+        mm, arr = _map(path, dtype)
+        if mm is not None:
+            self._maps.append(mm)
+        return arr
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def duration(self):
+        return float(self.frames["time"][-1]) if self.n else 0.0
+
+    def _search(self, sparse, column, value):
+        # Primer paso con column >= value: bisección en el índice y luego en una página
+        page = max(0, int(np.searchsorted(sparse, value, side="right")) - 1)
+        a = page * SPARSE
+        b = min(self.n, a + SPARSE + 1)
+        return min(self.n - 1, a + int(np.searchsorted(self.frames[column][a:b], value)))
+
+    def frame_at(self, t):
+        # Paso cuyo tiempo (tras el paso) es el primero >= t
+        return self._search(self._sparse_time, "time", t)
+
+    def frame_at_hour(self, hour, after=0):
+        # Primer paso desde after en que el reloj simulado alcanza la hora (0..24)
+        c0 = float(self.frames["clock"][after])
+        target = c0 + (hour - c0 % 24.0) % 24.0
+        return self._search(self._sparse_clock, "clock", target)
+
+    def keyframe_before(self, steps):
+        # Índice de la última instantánea tomada con <= steps pasos aplicados
+        k = int(np.searchsorted(self.keyframes["frame"], steps, side="right")) - 1
+        if k < 0:
+            raise ValueError("La grabación no tiene instantáneas")
+        return k
+
+    def keyframe(self, k):
+        # (pasos aplicados, SimState, extras) de la instantánea k
+        rec = self.keyframes[k]
+        blob = self._blobs[int(rec["offset"]):int(rec["offset"] + rec["length"])]
+        state, extras = pickle.loads(zlib.decompress(blob))
+        return int(rec["frame"]), state, extras
+
+    def events_at(self, frame):
+        ev = self.events
+        a = int(np.searchsorted(ev["frame"], frame, side="left"))
+        b = int(np.searchsorted(ev["frame"], frame, side="right"))
+        out = []
+        for rec in ev[a:b]:
+            if rec["type"] == pygame.KEYDOWN and rec["key"] in SKIP_KEYS:
+                continue
+            out.append(pygame.event.Event(int(rec["type"]), key=int(rec["key"]), button=int(rec["button"]),
+                                          pos=(int(rec["x"]), int(rec["y"]))))
+        return out
+
+    def close(self):
+        self.frames = self.events = self.keyframes = None
+        self._blobs = b""
+        for mm in self._maps:
+            try:
+                mm.close()
+            except BufferError:
+                pass    # quedan vistas vivas; se libera con ellas
+        self._maps = []
+
+
+# -------------------- Reproducción --------------------
+class Player:
+    def __init__(self, sim, recording):
+        self.sim = sim
+        self.rec = recording
+        self.frame = None       # pasos ya aplicados en sim (None = sin estado)
+
+    def seek(self, frame):
+        # Deja sim justo después del paso frame (frame = -1: antes del primero)
+        frame = max(-1, min(frame, len(self.rec) - 1))
+        target = frame + 1
+        k = self.rec.keyframe_before(target)
+        # Hacia delante y sin instantánea de por medio basta con seguir simulando
+        if self.frame is None or not int(self.rec.keyframes["frame"][k]) <= self.frame <= target:
+            self.frame, state, extras = self.rec.keyframe(k)
+            self._restore(state, extras)
+        while self.frame < target:
+            self.advance()
+        return frame
+
+    def seek_time(self, t):
+        return self.seek(self.rec.frame_at(t))
+
+    def seek_hour(self, hour):
+        return self.seek(self.rec.frame_at_hour(hour, max(0, (self.frame or 1) - 1)))
+
+    def advance(self):
+        if self.frame >= len(self.rec):
+            return False
+        sim = self.sim
+        for e in self.rec.events_at(self.frame):
+            sim.handle_event(e)
+        sim.step(float(self.rec.frames["dt"][self.frame]))
+        self.frame += 1
+        return True
+
+    def _restore(self, state, extras):
+        sim = self.sim
+        restore(sim, state)
+        for k, v in extras["dragging"].items():
+            getattr(sim, k).dragging = v
+        sim.dragging_obstacle = extras["dragging_obstacle"]
+        sim.running = True
@@ -0,0 +1,105 @@
+"""
+Reducción del rule base de un FuzzyController
+- Redundancia exacta: una regla sobra si, para cada uno de sus consecuentes, otra regla
+  con el mismo término de salida corta al menos igual en todos los puntos de la malla
+  (max(act * peso) no cambia -> la agregación y el centroide tampoco).
+- Subsunción: pares (a, b) con activación de a <= activación de b en toda la malla,
+  con el mismo consecuente (a sobra) o con uno distinto (solapamiento a revisar).
+- Poda por salida (opcional): se quita una regla si la salida defuzzificada cambia menos
+  de tol y no aparecen zonas nuevas sin reglas (fallback).
+- La comprobación final se hace en otra malla, más densa y desplazada, evaluada en lote.
+"""
+
+import numpy as np
+
+_EPS = 1e-12
+
+
+def dense_grid(compiled, budget=1_000_000, offset=0.0):
+    # Malla regular con ~budget puntos; offset en fracciones de paso (0.5 = malla desplazada)
+    d = len(compiled.inputs)
+    k = max(2, int(round(budget ** (1.0 / d))))
+    axes = []
+    for _, univ, _ in compiled.inputs:
+        lo, hi = univ[0], univ[-1]
+        step = (hi - lo) / (k - 1)
+        axes.append(np.clip(np.linspace(lo, hi, k) + offset * step, lo, hi))
+    mesh = np.meshgrid(*axes, indexing="ij")
+    return np.stack([m.ravel() for m in mesh], axis=1)
+
+
+def activations(compiled, X):
+    # (R, n): grado de activación de cada regla en cada punto
+    mu, n = compiled.memberships(dict(zip(compiled.input_names, X.T)))
+    fire = compiled.firing(mu)
+    return np.stack([np.broadcast_to(fire[r], (n,)) for r in range(len(compiled.rules))])
+
+
+def _contributions(compiled):
+    # {(salida, término): [(regla, peso)]}
+    out = {}
+    for r, (_, cons) in enumerate(compiled.rules):
+        for o, lbl, w in cons:
+            out.setdefault((o, lbl), []).append((r, w))
+    return out
+
+
+def redundant_rules(compiled, acts, order=None):
+    # Quita de forma voraz las reglas cuyo aporte queda cubierto por las que siguen
+    contrib = _contributions(compiled)
+    keep = set(range(len(compiled.rules)))
+    if order is None:
+        # Primero las más específicas (más términos en el antecedente)
+        order = sorted(keep, key=lambda r: -_size(compiled.rules[r][0]))
+    removed = []
+    for r in order:
+        covered = True
+        for o, lbl, w in compiled.rules[r][1]:
+            others = [acts[s] * ws for s, ws in contrib[(o, lbl)] if s != r and s in keep]
+            if not others or np.any(acts[r] * w > np.max(others, axis=0) + _EPS):
+                covered = False
+                break
+        if covered:
+            keep.discard(r)
+            removed.append(r)
+    return removed
+
+
+def subsumptions(compiled, acts):
+    # [(a, b, mismo_consecuente)] con act_a <= act_b en toda la malla (a != b)
+    pairs = []
+    active = acts.max(axis=1) > 0
+    for a in range(len(acts)):
+        if not active[a]:
+            continue
+        for b in range(len(acts)):
+            if a != b and np.all(acts[a] <= acts[b] + _EPS):
+                same = sorted(compiled.rules[a][1]) == sorted(compiled.rules[b][1])
+                pairs.append((a, b, same))
+    return pairs
+
+
+def prune_by_output(compiled, X, keep, tol, fallback):
+    # Voraz: quita reglas mientras max |salida - original| <= tol y la validez no cambie
+    values = dict(zip(compiled.input_names, X.T))
+
+    def outputs(rule_ids):
+        out, valid = compiled.evaluate(values, rule_ids=np.asarray(sorted(rule_ids), dtype=int))
+        return np.stack([np.where(valid, out[n], fallback) for n in compiled.output_names]), valid
+
+    ref, ref_valid = outputs(range(len(compiled.rules)))
+    keep = set(keep)
+    removed = []
+    for r in sorted(keep, key=lambda r: -_size(compiled.rules[r][0])):
+        trial = keep - {r}
+        if not trial:
+            break
+        got, valid = outputs(trial)
+        if np.array_equal(valid, ref_valid) and np.max(np.abs(got - ref)) <= tol:
+            keep = trial
+            removed.append(r)
+    return removed
+
+
+def _size(node):
+    return 1 if node[0] == "term" else sum(_size(c) for c in node[1:])
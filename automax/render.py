@@ -0,0 +1,767 @@
+"""
+Renderizado de AUTOMAX (solo lee el snapshot publicado por la física)
+- ClassicRenderer: estilo neón con HUD de barras degradadas (simulador.py / test.py).
+- ArcadeRenderer: estilo arcade con niebla/polvo, botones y adherencia (simulator.py).
+- La escena se dibuja en un SceneCanvas a config.RENDER_SCALE y se escala una vez por
+  cuadro a la pantalla; el HUD (texto, sliders, barras) va encima a resolución nativa.
+"""
+
+import math
+import os
+import random
+
+import pygame
+from pygame import gfxdraw
+
+from . import config
+from .config import ASSETS_DIR, SCREEN_H, SCREEN_W
+from .weather import day_factor
+from .worker import get_async_logger
+
+log = get_async_logger()
+
+LANE_OFFSET_PX = 80   # carril -1 izquierda, 0 centro, +1 derecha
+
+
+def bundled(sim, name, size=None):
+    # Superficie del paquete de assets (ya escalada); None si no hay paquete o no está
+    return sim.assets.surface(name, size) if sim.assets is not None else None
+
+
+def prescaled_obstacles(sim):
+    # Caché de scaled_sprite con los tamaños del obstáculo ya escalados en el paquete
+    if sim.assets is None or sim.obst_sprite is None:
+        return {}
+    out = {}
+    for name in sim.assets.names("obstacle/"):
+        surf = sim.assets.surface(name)
+        out[surf.get_size()] = surf
+    return out
+
+
+def load_sprites(sim, with_background=False):
+    sim.car_sprite = bundled(sim, "sprite/car", (sim.car_w, sim.car_h))
+    sim.obst_sprite = bundled(sim, "sprite/obstacle")
+    sim.bg_sprite = bundled(sim, "sprite/background", (SCREEN_W, SCREEN_H)) if with_background else None
+    # Lo que no está en el paquete se decodifica de los originales
+    if sim.car_sprite is None:
+        try:
+            car_path = os.path.join(ASSETS_DIR, "car.png")
+            if os.path.exists(car_path):
+                sim.car_sprite = pygame.image.load(car_path).convert_alpha()
+                sim.car_sprite = pygame.transform.smoothscale(sim.car_sprite, (sim.car_w, sim.car_h))
+        except Exception as e:
+            log.error("Error al cargar %s: %s", car_path, e)
+            sim.car_sprite = None
+    if sim.obst_sprite is None:
+        try:
+            obst_path = os.path.join(ASSETS_DIR, "obstacle.png")
+            if os.path.exists(obst_path):
+                sim.obst_sprite = pygame.image.load(obst_path).convert_alpha()
+        except Exception as e:
+            log.error("Error al cargar %s: %s", obst_path, e)
+            sim.obst_sprite = None
+    if with_background and sim.bg_sprite is None:
+        try:
+            bg_path = os.path.join(ASSETS_DIR, "background.png")
+            if os.path.exists(bg_path):
+                sim.bg_sprite = pygame.image.load(bg_path).convert()
+                sim.bg_sprite = pygame.transform.smoothscale(sim.bg_sprite, (SCREEN_W, SCREEN_H))
+        except Exception as e:
+            log.error("Error al cargar %s: %s", bg_path, e)
+            sim.bg_sprite = None
+
+
+def scaled_sprite(cache, sprite, size):
+    # Un smoothscale por tamaño, no por vehículo y cuadro
+    surf = cache.get(size)
+    if surf is None:
+        surf = cache[size] = pygame.transform.smoothscale(sprite, size)
+    return surf
+
+
+def draw_sky(s, daytime):
+    # Fondo dinámico SOLO por hora (día/noche)
+    SCREEN_Wi, SCREEN_Hi = s.get_size()
+    df = day_factor(daytime)
+    top_color = int(40 + 120 * df)   # 40 noche → 160 día
+    bot_color = int(60 + 160 * df)   # 60 noche → 220 día
+    for i in range(SCREEN_Hi):
+        t = i / SCREEN_Hi
+        r = int((top_color * (1 - t) + (bot_color - 30) * t))
+        g = int((top_color * 0.9 * (1 - t) + (bot_color - 40) * t))
+        b = int((top_color * 1.4 * (1 - t) + (bot_color + 50) * t))
+        r = max(0, min(255, r))
+        g = max(0, min(255, g))
+        b = max(0, min(255, b))
+        pygame.draw.line(s, (r, g, b), (0, i), (SCREEN_Wi, i))
+
+
+def draw_rain_particles(c, st):
+    if not st.rain_enabled:
+        return
+    for x, y, length, _ in st.rain_particles:
+        c.line((150, 180, 255), (x, y), (x, y + length), 1)
+
+
+def draw_rain(c, st, sheet):
+    # Lluvia por capas (config.RAIN_SHEET) o gota a gota (partículas de la simulación)
+    if sheet is None:
+        draw_rain_particles(c, st)
+    elif st.rain_enabled:
+        sheet.draw(c, st.time, 1.0)
+
+
+class RainSheet:
+    # Capas de gotas pre-dibujadas y repetibles en vertical, de lejos a cerca; cada una cae
+    # a su velocidad (paralaje) y se dibuja con dos blits. Colorkey + alpha de superficie
+    # con RLE: el blit solo recorre los píxeles de las gotas.
+    LAYERS = (
+        # (gotas, largo mín., largo máx., grosor, alpha, velocidad px/s)
+        (220, 8, 12, 1, 110, 700.0),
+        (140, 14, 20, 1, 160, 950.0),
+        (70, 22, 30, 2, 210, 1250.0),
+    )
+    COLOR = (150, 180, 255)
+
+    def __init__(self, size=(SCREEN_W, SCREEN_H), seed=7):
+        self.size = size
+        self.seed = seed
+        self._sheets = {}       # escala -> [(superficie, velocidad)]
+
+    def sheets(self, c):
+        out = self._sheets.get(c.k)
+        if out is None:
+            # RNG propio: las capas no dependen del estado de random (ni lo alteran)
+            rng = random.Random(self.seed)
+            w, h = c.n(self.size[0]), c.n(self.size[1])
+            out = self._sheets[c.k] = []
+            for count, lmin, lmax, width, alpha, speed in self.LAYERS:
+                surf = pygame.Surface((w, h), 0, c.surface)
+                surf.fill((0, 0, 0))
+                for _ in range(count):
+                    x, y = c.p((rng.randint(0, self.size[0]), rng.randint(0, self.size[1])))
+                    length = c.n(rng.randint(lmin, lmax))
+                    # Las gotas que salen por abajo entran por arriba (la capa se repite)
+                    for dy in (0, -h):
+                        pygame.draw.line(surf, self.COLOR, (x, y + dy), (x, y + dy + length), c.n(width))
+                surf.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+                surf.set_alpha(alpha, pygame.RLEACCEL)
+                out.append((surf, speed))
+        return out
+
+    def draw(self, c, t, intensity=1.0):
+        # intensity 0..1: número de capas visibles (primero las lejanas)
+        layers = self.sheets(c)
+        n = min(len(layers), int(math.ceil(intensity * len(layers) - 1e-9)))
+        for surf, speed in layers[:n]:
+            h = surf.get_height()
+            y = int(t * speed * c.k) % h
+            c.surface.blit(surf, (0, y - h))
+            c.surface.blit(surf, (0, y))
+
+
+# -------------------- Escena a resolución interna --------------------
+class SceneCanvas:
+    # Primitivas en coordenadas nativas (SCREEN_W x SCREEN_H) sobre una superficie a scale.
+    # Con scale = 1 se dibuja directamente en la pantalla (mismos píxeles que sin lienzo).
+    def __init__(self, scale=1.0, smooth=False):
+        self.k = float(scale)
+        self.smooth = smooth
+        self.surface = None
+        self._layers = {}
+        self._scaled = {}
+
+    def begin(self, screen):
+        if self.k == 1.0:
+            self.surface = screen
+        else:
+            w, h = screen.get_size()
+            size = (max(1, round(w * self.k)), max(1, round(h * self.k)))
+            if self.surface is None or self.surface.get_size() != size:
+                self.surface = pygame.Surface(size, 0, screen)
+                self._layers = {}
+        return self.surface
+
+    def present(self, screen):
+        # Un único escalado por cuadro, directamente sobre la pantalla
+        if self.surface is not screen:
+            scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+            scale(self.surface, screen.get_size(), screen)
+
+    # -------- Coordenadas --------
+    def p(self, pt):
+        return pt if self.k == 1.0 else (pt[0] * self.k, pt[1] * self.k)
+
+    def n(self, v):
+        return v if self.k == 1.0 else max(1, round(v * self.k))
+
+    def r(self, rect):
+        if self.k == 1.0:
+            return rect
+        x, y, w, h = rect
+        return pygame.Rect(round(x * self.k), round(y * self.k), self.n(w), self.n(h))
+
+    # -------- Primitivas --------
+    def polygon(self, color, points, width=0):
+        pygame.draw.polygon(self.surface, color, [self.p(q) for q in points], width and self.n(width))
+
+    def line(self, color, a, b, width=1):
+        pygame.draw.line(self.surface, color, self.p(a), self.p(b), self.n(width))
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(self.surface, color, self.r(rect), width and self.n(width),
+                         border_radius=border_radius and self.n(border_radius))
+
+    def alpha_rect(self, rgba, rect, border_radius=0):
+        # Rectángulo translúcido (superficie propia, como los trazos de carril)
+        x, y, w, h = rect
+        surf = pygame.Surface((self.n(w), self.n(h)), pygame.SRCALPHA)
+        pygame.draw.rect(surf, rgba, (0, 0, self.n(w), self.n(h)), border_radius=border_radius and self.n(border_radius))
+        self.surface.blit(surf, self.p((x, y)))
+
+    def alpha_circle(self, rgba, pos, size, radius):
+        # Partícula: círculo translúcido en una superficie size x size con esquina en pos
+        d = self.n(size)
+        surf = pygame.Surface((d, d), pygame.SRCALPHA)
+        pygame.draw.circle(surf, rgba, (d // 2, d // 2), self.n(radius))
+        self.surface.blit(surf, self.p(pos))
+
+    def layer(self, name):
+        # Capa SRCALPHA del tamaño del lienzo, reutilizada entre cuadros (sale transparente)
+        surf = self._layers.get(name)
+        if surf is None:
+            surf = self._layers[name] = pygame.Surface(self.surface.get_size(), pygame.SRCALPHA)
+        else:
+            surf.fill((0, 0, 0, 0))
+        return surf
+
+    def overlay(self, rgba):
+        ov = self.layer("overlay")
+        ov.fill(rgba)
+        self.surface.blit(ov, (0, 0))
+
+    def overlay_polygon(self, rgba, points):
+        ov = self.layer("overlay")
+        pygame.draw.polygon(ov, rgba, [self.p(q) for q in points])
+        self.surface.blit(ov, (0, 0))
+
+    def scaled(self, surf):
+        # Textura fija (nubes, polvo) a la escala del lienzo; se calcula una vez
+        if self.k == 1.0:
+            return surf
+        out = self._scaled.get(id(surf))
+        if out is None or out[0] is not surf:
+            w, h = surf.get_size()
+            out = self._scaled[id(surf)] = (surf, pygame.transform.smoothscale(surf, (self.n(w), self.n(h))))
+        return out[1]
+
+    def sprite(self, cache, sprite, rect):
+        # Sprite escalado al rect (en la caché por tamaño, como scaled_sprite)
+        target = self.r(pygame.Rect(rect))
+        if target.size == sprite.get_size():
+            self.surface.blit(sprite, target.topleft)
+        else:
+            self.surface.blit(scaled_sprite(cache, sprite, target.size), target.topleft)
+
+
+# -------------------- Carril y barras pre-dibujados (clásico) --------------------
+VIS_GRADIENT = ((220, 60, 60), (60, 200, 80))      # abajo -> arriba
+DIST_GRADIENT = ((80, 180, 60), (220, 60, 70))
+DASH_H = 40
+DASH_GAP = 90
+DASH_TINTS = 4      # colores recientes con sus franjas teñidas (a escala 1: ~4 x 130 x 34 KB)
+
+
+def lane_dashes(offset_pix, center_x, horizon_y, screen_h):
+    # (alpha, rect) de cada trazo central visible, en perspectiva y con fundido en los extremos
+    out = []
+    lane_x = center_x - 2
+    total_height = screen_h - horizon_y
+    for y in range(int(horizon_y - (DASH_H + DASH_GAP)),
+                   int(screen_h + (DASH_H + DASH_GAP)),
+                   DASH_H + DASH_GAP):
+        yy = y + offset_pix
+        if yy < horizon_y - DASH_H or yy > screen_h + DASH_H:
+            continue
+        t = (yy - horizon_y) / total_height
+        scale = 1.0 - min(1.0, t * 0.9)
+        dash_w = int(3 * (1.0 + scale * 1.3))
+        dash_h_scaled = int(DASH_H * (0.5 + scale * 0.7))
+        if yy < horizon_y + 100:
+            alpha = int(255 * ((yy - horizon_y) / 100.0))
+        elif yy > screen_h - 120:
+            alpha = int(255 * ((screen_h - yy) / 120.0))
+        else:
+            alpha = 255
+        alpha = max(0, min(255, alpha))
+        out.append((alpha, (lane_x - dash_w // 2, yy - dash_h_scaled // 2, dash_w, dash_h_scaled)))
+    return out
+
+
+class DashStrip:
+    # Franja vertical con todos los trazos de una fase (road_offset entero, 0..DASH_H+DASH_GAP)
+    # en blanco, teñida con el color de la velocidad (brillo entero 180..240) y guardada:
+    # a velocidad estable cada cuadro es un blit de una franja ya teñida.
+    # Los trazos no se solapan: mismos píxeles que un alpha_rect por trazo.
+    def __init__(self, center_x, horizon_y, screen_h):
+        self.center_x = center_x
+        self.horizon_y = horizon_y
+        self.screen_h = screen_h
+        self.x0 = center_x - 2 - 4      # el trazo más ancho mide 6 px
+        self._strips = {}               # (escala, fase) -> superficie
+        self._tinted = {}               # (escala, color) -> {fase: superficie}, orden de uso
+
+    def strip(self, c, phase):
+        key = (c.k, phase)
+        surf = self._strips.get(key)
+        if surf is None:
+            sx = int(c.p((self.x0, 0))[0])
+            surf = self._strips[key] = pygame.Surface((c.n(12), c.n(self.screen_h)), pygame.SRCALPHA)
+            for alpha, (x, y, w, h) in lane_dashes(phase, self.center_x, self.horizon_y, self.screen_h):
+                px, py = c.p((x, y))
+                surf.fill((255, 255, 255, alpha), (int(px) - sx, int(py), c.n(w), c.n(h)))
+        return surf
+
+    def tinted(self, c, phase, color):
+        key = (c.k, color)
+        tints = self._tinted.pop(key, None)
+        if tints is None:
+            tints = {}
+            if len(self._tinted) >= DASH_TINTS:
+                del self._tinted[next(iter(self._tinted))]   # el color usado hace más tiempo
+        self._tinted[key] = tints
+        surf = tints.get(phase)
+        if surf is None:
+            surf = tints[phase] = self.strip(c, phase).copy()
+            surf.fill((*color, 255), special_flags=pygame.BLEND_RGBA_MULT)
+        return surf
+
+    def draw(self, c, road_offset, color):
+        c.surface.blit(self.tinted(c, int(road_offset) % (DASH_H + DASH_GAP), tuple(color)),
+                       c.p((self.x0, 0)))
+
+
+def gradient_fill(w, fill_h, colors):
+    # Relleno de una barra de fill_h filas: colors[0] abajo -> colors[1] arriba
+    (r0, g0, b0), (r1, g1, b1) = colors
+    surf = pygame.Surface((w, fill_h))
+    for yy in range(fill_h):
+        tt = yy / max(1, fill_h - 1)
+        color = (int(r0 * (1 - tt) + r1 * tt), int(g0 * (1 - tt) + g1 * tt), int(b0 * (1 - tt) + b1 * tt))
+        pygame.draw.line(surf, color, (0, fill_h - 1 - yy), (w, fill_h - 1 - yy))
+    return surf
+
+
+class BarAtlas:
+    # Una columna por altura de relleno posible (0..bar_h), alineadas abajo; dibujar la barra
+    # es un blit del recorte de la columna fill_h
+    def __init__(self, w, bar_h, colors):
+        self.w = w
+        self.bar_h = bar_h
+        self.atlas = pygame.Surface((w * (bar_h + 1), bar_h))
+        for fill_h in range(1, bar_h + 1):
+            self.atlas.blit(gradient_fill(w, fill_h, colors), (fill_h * w, bar_h - fill_h))
+
+    def draw(self, s, pos, fill_h):
+        fill_h = max(0, min(self.bar_h, fill_h))
+        if fill_h:
+            s.blit(self.atlas, (pos[0], pos[1] + self.bar_h - fill_h),
+                   (fill_h * self.w, self.bar_h - fill_h, self.w, fill_h))
+
+
+# -------------------- Clásico (neón) --------------------
+class ClassicRenderer:
+    instructions = "L: Lluvia | T: Mamdani/Sugeno | SPACE: Demo | S: Guardar CSV | B: Instantánea | R: Reset | ESC: Salir"
+
+    def setup(self, sim):
+        load_sprites(sim, with_background=True)
+        self.obst_cache = prescaled_obstacles(sim)
+        self.car_cache = {}
+        self.canvas = SceneCanvas(config.RENDER_SCALE, config.RENDER_SMOOTH)
+        self.rain = RainSheet() if config.RAIN_SHEET else None
+        # Panel izquierdo, trazos del carril y barras Vis/Dist pre-dibujados (config.HUD_ATLAS)
+        self.hud_panel = pygame.Surface((380, 340), pygame.SRCALPHA)
+        self.hud_panel.fill((10,10,10,160))
+        if config.HUD_ATLAS:
+            self.dashes = DashStrip(SCREEN_W // 2, 110, SCREEN_H)
+            self.vis_bar = BarAtlas(16, 120, VIS_GRADIENT)
+            self.dist_bar = BarAtlas(16, 120, DIST_GRADIENT)
+        else:
+            self.dashes = self.vis_bar = self.dist_bar = None
+
+    def vehicle_rect(self, sim, distance, lane):
+        SCREEN_Wi, SCREEN_Hi = sim.screen.get_size()
+        center_x = SCREEN_Wi // 2
+        road_horizon_y = 120
+        car_front_y = sim.car_y
+        d = max(0.0, min(100.0, distance))
+        t = d / 100.0
+        max_travel = max(20.0, (car_front_y - road_horizon_y - 40.0))
+        y = int(road_horizon_y + (1.0 - t) * max_travel)
+        width = int(max(24, 24 + (1.0 - t) * 120))
+        height = int(max(20, 20 + (1.0 - t) * 80))
+        x = center_x - width // 2 + lane * LANE_OFFSET_PX
+        return pygame.Rect(x, y, width, height)
+
+    def obstacle_screen_rect(self, sim, st):
+        # El obstáculo "activo" es el más cercano (el que ve el controlador)
+        return self.vehicle_rect(sim, st.obst_distance_m, st.obst_lane)
+
+    def distance_at(self, sim, my):
+        # Inversa de obstacle_screen_rect para arrastrar el obstáculo con el mouse
+        road_horizon_y = 120
+        car_front_y = sim.car_y
+        my_clamped = max(road_horizon_y + 10, min(car_front_y - 20, my))
+        t = (my_clamped - road_horizon_y) / max(1.0, (car_front_y - road_horizon_y - 40))
+        return max(0.0, min(100.0, (1.0 - t) * 100.0))
+
+    def draw_neon_text(self, surf, text, pos, size=24, glow_color=(120,60,220)):
+        f = pygame.font.SysFont("Consolas", size, bold=True)
+        base = f.render(text, True, (255,255,255))
+        x,y = pos
+        for i,_ in enumerate([60,30,15]):
+            s = f.render(text, True, (glow_color[0], glow_color[1], glow_color[2]))
+            s.set_alpha(80 - i*20)
+            surf.blit(s, (x- i -2, y - i -2))
+        surf.blit(base, pos)
+
+    def draw(self, sim, st):
+        c = self.canvas
+        c.begin(sim.screen)
+        self.draw_scene(c, sim, st)
+        c.present(sim.screen)
+        self.draw_hud(sim.screen, sim, st)
+
+    def draw_scene(self, c, sim, st):
+        SCREEN_Wi, SCREEN_Hi = sim.screen.get_size()
+        center_x = SCREEN_Wi // 2
+
+        draw_sky(c.surface, st.daytime)
+
+        # Oscurecer si llueve (overlay)
+        if st.rain_enabled:
+            c.overlay((0, 0, 10, 90))
+
+        # --- Carretera ---
+        road_bottom_y = SCREEN_Hi
+        road_horizon_y = 110
+        lane_color = (70, 170, 255)
+        asphalt_color = (20, 20, 24)
+        road_left_w = 180
+        road_right_w = 180
+        road_horizon_inner = 40
+        c.polygon(asphalt_color, [
+            (center_x - road_left_w, road_bottom_y),
+            (center_x - road_horizon_inner, road_horizon_y),
+            (center_x + road_horizon_inner, road_horizon_y),
+            (center_x + road_right_w, road_bottom_y)
+        ])
+        c.line(lane_color, (center_x - road_left_w, road_bottom_y), (center_x - road_horizon_inner, road_horizon_y), 3)
+        c.line(lane_color, (center_x + road_left_w, road_bottom_y), (center_x + road_horizon_inner, road_horizon_y), 3)
+
+        # --- Líneas centrales animadas ---
+        brightness = int(180 + min(60, st.display_speed * 0.6))
+        if self.dashes is not None:
+            self.dashes.draw(c, st.road_offset, (brightness, brightness, 255))
+        else:
+            for alpha, rect in lane_dashes(int(st.road_offset), center_x, road_horizon_y, SCREEN_Hi):
+                c.alpha_rect((brightness, brightness, 255, alpha), rect)
+
+        # --- Obstáculos (solo los visibles, del más lejano al más cercano) ---
+        for distance, lane in st.vehicles:
+            rect = self.vehicle_rect(sim, distance, lane)
+            if sim.obst_sprite:
+                c.sprite(self.obst_cache, sim.obst_sprite, rect)
+            else:
+                c.alpha_rect((215,75,75,60), (rect.x-8, rect.y-8, rect.w+16, rect.h+16), border_radius=6)
+                gfxdraw.box(c.surface, c.r(rect), (215,75,75))
+                gfxdraw.rectangle(c.surface, c.r(rect), (255,120,120))
+
+        # --- Lluvia detrás del coche ---
+        draw_rain(c, st, self.rain)
+
+        # --- Coche (con animación de rebase) ---
+        cx, cy, cw, ch = sim.car_x, sim.car_y, sim.car_w, sim.car_h
+        if st.rebase_anim > 0.0:
+            offset_x = int(st.rebase_dir * 80 * st.rebase_anim)
+            offset_y = int(-40 * st.rebase_anim)
+            cx += offset_x
+            cy += offset_y
+
+            # Overlay translúcido (sensación de desenfoque)
+            c.overlay((255, 255, 200, 40))
+
+        if sim.car_sprite:
+            c.sprite(self.car_cache, sim.car_sprite, (cx, cy, cw, ch))
+        else:
+            body_color = (38, 58, 80)
+            c.rect(body_color, (cx + 8, cy + 8, cw - 16, ch - 16), border_radius=14)
+            c.rect((70,90,120), (cx + 18, cy + 16, cw - 36, ch // 3), border_radius=8)
+            c.rect((150, 30, 30), (cx + 40, cy + ch - 40, 10, 1))
+            c.rect((150, 30, 30), (cx + cw - 60, cy + ch - 40, 10, 1))
+            c.rect((110,140,190), (cx + cw//2 - 8, cy + ch - 28, 16, 4), border_radius=2)
+            c.rect((20, 20, 28), (cx, cy + 8, 8, ch - 16))
+            c.rect((20, 20, 28), (cx + cw - 8, cy + 8, 8, ch - 16))
+
+        # Luces delanteras automáticas
+        if st.headlights_on:
+            lx = cx + cw//2
+            ly = cy + 20
+            c.overlay_polygon((255, 255, 200, 90),
+                [(lx-40, ly), (lx+40, ly), (lx+260, ly-120), (lx-260, ly-120)])
+
+        # Luces de freno
+        if st.brake_on:
+            c.rect((255,12,12), (cx + 40, cy + ch - 74, 16, 6))
+            c.rect((255,12,12), (cx + cw - 60, cy + ch - 74, 16, 6))
+
+        # Partículas rebase (destellos)
+        for x,y,life,_,_ in st.rebase_particles:
+            alpha = int(255 * (life / 1.2))
+            c.alpha_circle((255,200,80, alpha), (int(x), int(y)), 4, 2)
+
+        # Partículas normales (humo/freno)
+        for x,y,life,_,_,col in st.particles:
+            alpha = int(255 * (life/1.0))
+            c.alpha_circle((*col, alpha), (x, y), 6, 3)
+
+    def draw_hud(self, s, sim, st):
+        SCREEN_Wi, SCREEN_Hi = s.get_size()
+        center_x = SCREEN_Wi // 2
+
+        # HUD Izquierdo
+        s.blit(self.hud_panel, (20, 30))
+        sim.slider_speed.draw(s, sim.font)
+        sim.slider_dist.draw(s, sim.font)
+        sim.slider_vis.draw(s, sim.font)
+        hour_txt = sim.font.render(f"Hora: {int(st.daytime):02d}:{int((st.daytime%1)*60):02d}", True, (210,210,210))
+        s.blit(hour_txt, (30, 30 + 300))
+
+        # HUD Central (velocidad)
+        speed_text = sim.bigfont.render(f"{st.display_speed:.0f}", True, (255,255,255))
+        unit_text = sim.font.render("km/h", True, (190,190,190))
+        s.blit(speed_text, (center_x - 20, 28))
+        s.blit(unit_text, (center_x + 46, 56))
+
+        # Barras laterales (Visibilidad/Distancia)
+        vis_bar_h = 120
+        dist_bar_h = 120
+        bar_w = 16
+        base_y = SCREEN_Hi - vis_bar_h - 80
+        base_x = SCREEN_Wi - 100
+
+        # Visibilidad
+        vis_x = base_x
+        vis_y = base_y
+        pygame.draw.rect(s, (40, 40, 40), (vis_x, vis_y, bar_w, vis_bar_h), border_radius=4)
+        vis_fill_h = int((st.visibility / 100.0) * vis_bar_h)
+        if self.vis_bar is not None:
+            self.vis_bar.draw(s, (vis_x, vis_y), vis_fill_h)
+        else:
+            s.blit(gradient_fill(bar_w, vis_fill_h, VIS_GRADIENT), (vis_x, vis_y + (vis_bar_h - vis_fill_h)))
+        text_vis = sim.font.render("Vis", True, (200, 200, 200))
+        s.blit(text_vis, (vis_x - 4, vis_y + vis_bar_h + 6))
+
+        # Distancia
+        dist_x = base_x + 40
+        dist_y = base_y
+        pygame.draw.rect(s, (40, 40, 40), (dist_x, dist_y, bar_w, dist_bar_h), border_radius=4)
+        dnorm = max(0.0, min(1.0, 1.0 - (st.obst_distance_m / 100.0)))
+        dist_fill_h = int(dnorm * dist_bar_h)
+        if self.dist_bar is not None:
+            self.dist_bar.draw(s, (dist_x, dist_y), dist_fill_h)
+        else:
+            s.blit(gradient_fill(bar_w, dist_fill_h, DIST_GRADIENT), (dist_x, dist_y + (dist_bar_h - dist_fill_h)))
+        text_dist = sim.font.render("Dist", True, (200, 200, 200))
+        s.blit(text_dist, (dist_x - 8, dist_y + dist_bar_h + 6))
+
+        # Estado derecha
+        if st.time > 0.0:
+            txt = f"Acción: {st.action_text} ({st.action_val:.1f})"
+            actsurf = sim.font.render(txt, True, (255, 200, 120))
+            s.blit(actsurf, (SCREEN_Wi - 340, 48))
+
+        # Instrucciones
+        inst = sim.font.render(self.instructions, True, (180,180,180))
+        s.blit(inst, (SCREEN_Wi//2 - inst.get_width()//2, SCREEN_Hi - 28))
+
+
+# -------------------- Arcade (niebla, botones, adherencia) --------------------
+class ArcadeRenderer:
+    instructions = "C: Clima | T: Mamdani/Sugeno | SPACE: Demo | S: Guardar | B: Instantánea | R: Reset | ESC: Salir"
+
+    def setup(self, sim):
+        load_sprites(sim)
+        self.obst_cache = prescaled_obstacles(sim)
+        self.car_cache = {}
+        self.canvas = SceneCanvas(config.RENDER_SCALE, config.RENDER_SMOOTH)
+        self.rain = RainSheet() if config.RAIN_SHEET else None
+        # Texturas para niebla/polvo (del paquete de assets si está)
+        size = (SCREEN_W + 200, SCREEN_H)
+        self.cloud_surf = bundled(sim, "texture/cloud", size)
+        if self.cloud_surf is None:
+            self.cloud_surf = self.generate_cloud_texture(size, (255,255,255), 200)
+        self.dust_surf = bundled(sim, "texture/dust", size)
+        if self.dust_surf is None:
+            self.dust_surf = self.generate_cloud_texture(size, (160, 110, 50), 250)
+
+    def generate_cloud_texture(self, size, color, density):
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        for _ in range(density):
+            x = random.randint(0, size[0])
+            y = random.randint(0, size[1])
+            radius = random.randint(80, 200)
+            alpha = random.randint(40, 100)
+            for i in range(radius, 0, -20):
+                a = int(alpha * (i/radius))
+                pygame.draw.circle(surf, (*color, a), (x, y), i)
+        return surf
+
+    def vehicle_rect(self, sim, distance, lane):
+        cx = SCREEN_W // 2
+        horizon_y = 120
+        prog = 1.0 - (distance / 100)
+        y = horizon_y + prog * (sim.car_y - horizon_y - 50)
+        w = int(100 * (0.2 + 0.8 * prog)); h = int(80 * (0.2 + 0.8 * prog))
+        lx = lane * LANE_OFFSET_PX * prog
+        return pygame.Rect(cx - w//2 + int(lx), int(y), w, h)
+
+    def obstacle_screen_rect(self, sim, st):
+        return self.vehicle_rect(sim, st.obst_distance_m, st.obst_lane)
+
+    def distance_at(self, sim, my):
+        t = 1.0 - ((my - 120) / (sim.car_y - 160))
+        return max(0, min(100, t * 100))
+
+    def draw(self, sim, st):
+        c = self.canvas
+        c.begin(sim.screen)
+        self.draw_scene(c, sim, st)
+        c.present(sim.screen)
+        self.draw_hud(sim.screen, sim, st)
+
+    def draw_scene(self, c, sim, st):
+        cx = SCREEN_W // 2
+
+        # Fondo con difuminación progresiva según la hora (día claro ↔ noche oscuro)
+        draw_sky(c.surface, st.daytime)
+
+        # Niebla / Polvo
+        if st.fog_enabled:
+            fog_layer = c.layer("fog")
+            # Mover textura para sensación de profundidad
+            cloud = c.scaled(self.cloud_surf)
+            fog_layer.blit(cloud, c.p((-int(st.cloud_offset_x), 0)))
+            fog_layer.blit(cloud, c.p((SCREEN_W - int(st.cloud_offset_x), 0)))
+            col_layer = c.layer("fog_color")
+            col_layer.fill((*st.fog_color, 200))
+            fog_layer.blit(col_layer, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
+            c.surface.blit(fog_layer, (0,0))
+
+        # Oscurecer en lluvia
+        if st.rain_enabled:
+            c.overlay((0,0,10,120))
+
+        # Carretera
+        ry = SCREEN_H; hy = 110
+        c.polygon((20,20,24), [(cx-180, ry), (cx-40, hy), (cx+40, hy), (cx+180, ry)])
+        c.line((70,170,255), (cx-180, ry), (cx-40, hy), 3)
+        c.line((70,170,255), (cx+180, ry), (cx+40, hy), 3)
+
+        # Líneas centrales
+        off = int(st.road_offset)
+        for y in range(int(hy-130), int(ry+130), 130):
+            yy = y + off
+            if yy < hy or yy > ry: continue
+            t = (yy-hy)/(ry-hy)
+            w = int(3*(1.0+t*1.3)); h_l = int(40*(0.5+t*0.7))
+            c.rect((255,255,0), (cx-w//2, yy, w, h_l))
+
+        # Obstáculos visibles
+        for distance, lane in st.vehicles:
+            rect = self.vehicle_rect(sim, distance, lane)
+            if sim.obst_sprite:
+                c.sprite(self.obst_cache, sim.obst_sprite, rect)
+            else:
+                c.rect((255,50,50), rect)
+
+        # Lluvia
+        draw_rain(c, st, self.rain)
+
+        # Coche y animación de rebase
+        cx_car = sim.car_x
+        if st.rebase_anim > 0.0:
+            cx_car += int(st.rebase_dir * 80 * st.rebase_anim)
+            c.overlay((255,255,255,40))
+
+        if sim.car_sprite:
+            c.sprite(self.car_cache, sim.car_sprite, (cx_car, sim.car_y, sim.car_w, sim.car_h))
+        else:
+            c.rect((255,255,255), (cx_car, sim.car_y, sim.car_w, sim.car_h))
+
+        # Luces delanteras
+        if st.headlights_on:
+            c.overlay_polygon((255,255,200,60), [(cx_car+20, sim.car_y+40), (cx_car+sim.car_w-20, sim.car_y+40), (cx+150, sim.car_y - 100), (cx-150, sim.car_y - 100)])
+
+        # Luces de freno intensas
+        if st.brake_on:
+            c.rect((255, 0, 0), (cx_car+40, sim.car_y+100, 20, 10))
+            c.rect((255, 0, 0), (cx_car+sim.car_w-60, sim.car_y+100, 20, 10))
+            c.alpha_rect((255, 50, 50, 150), (cx_car+38, sim.car_y+98, 24, 14))
+            c.alpha_rect((255, 50, 50, 150), (cx_car+sim.car_w-62, sim.car_y+98, 24, 14))
+
+        # Partículas de freno
+        for p in st.particles:
+            alpha = int(255 * p[2])
+            c.alpha_circle((*p[5], alpha), (int(p[0])-5, int(p[1])-5), 10, 5)
+
+        # Partículas de rebase
+        for p in st.rebase_particles:
+            alpha = int(255 * (p[2]/1.2))
+            c.alpha_circle((255,200,0, alpha), (int(p[0])-2, int(p[1])-2), 4, 2)
+
+    def draw_hud(self, s, sim, st):
+        cx = SCREEN_W // 2
+
+        # UI panel
+        panel = pygame.Surface((440, 400), pygame.SRCALPHA)
+        panel.fill((80, 70, 100, 220))
+        s.blit(panel, (20, 20))
+
+        sim.slider_speed.draw(s, sim.font)
+        sim.slider_dist.draw(s, sim.font)
+        sim.slider_vis.draw(s, sim.font)
+
+        # Botones
+        for btn in getattr(sim.weather, "buttons", ()):
+            btn.draw(s, sim.font)
+
+        # Hora visible (minutos aproximados para sensación de avance)
+        minutes = int((st.daytime % 1) * 60)
+        s.blit(sim.font.render(f"Hora: {int(st.daytime):02d}:{minutes:02d}", True, (255,255,255)), (40, 280))
+        names = getattr(sim.weather, "weather_names", None)
+        if names:
+            s.blit(sim.bigfont.render(f"CLIMA: {names[st.weather_mode]}", True, (255,255,0)), (220, 275))
+
+        s.blit(sim.bigfont.render(f"{int(st.display_speed)}", True, (255,255,255)), (cx-20, 30))
+        s.blit(sim.font.render("km/h", True, (200,200,200)), (cx+30, 45))
+
+        txt = f"Acción: {st.action_text} (F {st.brake_val:.0f} / A {st.throttle_val:.0f})"
+        s.blit(sim.font.render(txt, True, (255,200,100)), (SCREEN_W-350, 30))
+
+        # Barras laterales
+        bx = SCREEN_W - 100; by = SCREEN_H - 150
+        pygame.draw.rect(s, (50,50,50), (bx, by, 20, 100))
+        vh = int(st.visibility)
+        pygame.draw.rect(s, (0,255,0), (bx, by + (100-vh), 20, vh))
+        s.blit(sim.font.render("Vis", True, (150,150,150)), (bx, by+110))
+        pygame.draw.rect(s, (50,50,50), (bx+40, by, 20, 100))
+        dh = int(st.obst_distance_m)
+        pygame.draw.rect(s, (255,50,50), (bx+40, by + (100-dh), 20, dh))
+        s.blit(sim.font.render("Dist", True, (150,150,150)), (bx+40, by+110))
+
+        s.blit(sim.font.render(f"Grip: {int(st.grip)}%", True, (100,255,100)), (bx-20, by-30))
+
+        inst = sim.font.render(self.instructions, True, (180,180,180))
+        s.blit(inst, (cx - 200, SCREEN_H - 30))
@@ -0,0 +1,80 @@
+"""
+Índice de activación de reglas para CompiledRuleBase
+- Por cada entrada, su universo se parte en intervalos donde el conjunto de términos con
+  membresía > 0 no cambia (p. ej. distancia[larga] es 0 por debajo de 60 m).
+- Cada intervalo guarda qué reglas pueden disparar según esa entrada: se evalúa el
+  antecedente con "término activo" en vez de su grado (AND/OR lógicos; NOT siempre puede).
+- Una muestra solo necesita las reglas que ninguna entrada descarta; el resto tiene
+  activación exactamente 0, así que el resultado es idéntico al de evaluar todas.
+- Búsqueda por np.searchsorted en los bordes (O(log k) por entrada).
+"""
+
+import numpy as np
+
+
+def _can_fire(node, name, active):
+    # active: {término de esta entrada: bool por intervalo}; otras entradas -> puede
+    kind = node[0]
+    if kind == "term":
+        return active[node[2]] if node[1] == name else True
+    if kind == "not":
+        return True
+    a = _can_fire(node[1], name, active)
+    b = _can_fire(node[2], name, active)
+    return (a & b) if kind == "and" else (a | b)
+
+
+class RuleIndex:
+    def __init__(self, compiled):
+        self.n_rules = len(compiled.rules)
+        self.input_names = compiled.input_names
+        self.inputs = []    # (nombre, lo, hi, inicio de cada intervalo, reglas posibles K x R, términos activos)
+        for name, univ, terms in compiled.inputs:
+            # Celda cerrada [u_k, u_k+1]: el término es > 0 en ella si lo es en algún extremo
+            mf = np.stack([terms[lbl] for lbl in terms])
+            cell = np.maximum(mf[:, :-1], mf[:, 1:]) > 0 if len(univ) > 1 else mf > 0
+            active = {lbl: cell[t] for t, lbl in enumerate(terms)}
+            ok = np.ones((cell.shape[1], self.n_rules), dtype=bool)
+            for r, (antecedent, _) in enumerate(compiled.rules):
+                ok[:, r] = _can_fire(antecedent, name, active)
+
+            # Se fusionan celdas contiguas con los mismos términos activos
+            key = np.concatenate([cell.T, ok], axis=1)
+            change = np.ones(key.shape[0], dtype=bool)
+            change[1:] = np.any(key[1:] != key[:-1], axis=1)
+            starts = np.flatnonzero(change)
+            self.inputs.append((name, univ[0], univ[-1], univ[starts], ok[starts], cell.T[starts]))
+
+    @property
+    def intervals(self):
+        return {name: len(edges) for name, _, _, edges, _, _ in self.inputs}
+
+    def locate(self, name, x):
+        # Índice del intervalo de cada valor (recortado al universo como la inferencia)
+        for n, lo, hi, edges, _, _ in self.inputs:
+            if n == name:
+                x = np.clip(np.asarray(x, dtype=float).ravel(), lo, hi)
+                return np.maximum(np.searchsorted(edges, x, side="right") - 1, 0)
+        raise KeyError(name)
+
+    def candidates(self, values):
+        # (n, R) bool: reglas que pueden disparar en cada muestra
+        mask = None
+        for name, _, _, _, ok, _ in self.inputs:
+            rows = ok[self.locate(name, values[name])]
+            mask = rows if mask is None else mask & rows
+        return mask
+
+    def rule_ids(self, values):
+        # Candidatas del lote: por entrada, las que admite algún intervalo visitado (con una
+        # muestra son exactamente las que pueden disparar; con muchas, un superconjunto barato)
+        mask = None
+        for name, _, _, _, ok, _ in self.inputs:
+            rows = ok[np.unique(self.locate(name, values[name]))].any(axis=0)
+            mask = rows if mask is None else mask & rows
+        return np.flatnonzero(mask)
+
+    def stats(self, values):
+        # Fracción media de reglas candidatas por muestra
+        mask = self.candidates(values)
+        return float(mask.sum(axis=1).mean()) / max(1, self.n_rules)
@@ -0,0 +1,203 @@
+"""
+Rule base declarativa para los FuzzyController de AUTOMAX
+- Membresías y reglas en un archivo JSON (o YAML si PyYAML está instalado), ver rules/.
+- Se compila directamente al evaluador vectorizado (fuzzy_fast.CompiledRuleBase).
+- RuleBaseWatcher vigila el archivo y hace hot-swap atómico del evaluador en caliente.
+
+Formato:
+    {
+      "inputs":  {"velocidad": {"universe": [0, 120, 1], "terms": {"baja": {"trimf": [0, 0, 50]}, ...}}, ...},
+      "outputs": {"accion": {...}},
+      "rules": [{"if": "distancia[corta] & (velocidad[media] | velocidad[alta])", "then": {"accion": "frenar"}}, ...]
+    }
+Antecedentes con la misma sintaxis que skfuzzy: & (AND), | (OR), ~ (NOT) y paréntesis.
+Un consecuente puede ser "término" o ["término", peso].
+"""
+
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import skfuzzy as fuzz
+
+from . import config, jit
+from .fuzzy_fast import CompiledRuleBase
+from .rule_index import RuleIndex
+from .worker import get_async_logger
+
+log = get_async_logger()
+
+
+class RuleBaseError(ValueError):
+    pass
+
+
+# -------------------- Lectura --------------------
+def load_spec(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuleBaseError("Se necesita PyYAML para leer reglas en YAML")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _universe(spec):
+    lo, hi, step = spec
+    return np.arange(lo, hi + step, step, dtype=float)
+
+
+def _membership(univ, term_spec):
+    # {"trimf": [a, b, c]} -> fuzz.trimf(univ, [a, b, c]); cualquier *mf de skfuzzy
+    if len(term_spec) != 1:
+        raise RuleBaseError(f"Término mal definido: {term_spec}")
+    (kind, params), = term_spec.items()
+    func = getattr(fuzz, kind, None)
+    if func is None or not kind.endswith("mf"):
+        raise RuleBaseError(f"Función de membresía desconocida: {kind}")
+    if kind == "trimf" or kind == "trapmf":
+        return func(univ, params)
+    return func(univ, *params)
+
+
+def _variables(section):
+    out = []
+    for name, var in section.items():
+        univ = _universe(var["universe"])
+        terms = {lbl: _membership(univ, t) for lbl, t in var["terms"].items()}
+        out.append((name, univ, terms))
+    return out
+
+
+# -------------------- Parser de antecedentes --------------------
+_TOKEN = re.compile(r"\s*(?:(\w+)\[(\w+)\]|([&|~()]))")
+
+
+def parse_antecedent(text, inputs=None):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise RuleBaseError(f"Antecedente inválido cerca de '{text[pos:]}'")
+        tokens.append(("term", m.group(1), m.group(2)) if m.group(1) else (m.group(3),))
+        pos = m.end()
+
+    def peek():
+        return tokens[0][0] if tokens else None
+
+    def expr():      # or
+        node = conj()
+        while peek() == "|":
+            tokens.pop(0)
+            node = ("or", node, conj())
+        return node
+
+    def conj():      # and
+        node = unary()
+        while peek() == "&":
+            tokens.pop(0)
+            node = ("and", node, unary())
+        return node
+
+    def unary():
+        tok = tokens.pop(0) if tokens else None
+        if tok is None:
+            raise RuleBaseError(f"Antecedente incompleto: '{text}'")
+        if tok[0] == "~":
+            return ("not", unary())
+        if tok[0] == "(":
+            node = expr()
+            if peek() != ")":
+                raise RuleBaseError(f"Falta ')' en '{text}'")
+            tokens.pop(0)
+            return node
+        if tok[0] == "term":
+            if inputs is not None and tok[2] not in inputs.get(tok[1], ()):
+                raise RuleBaseError(f"Término desconocido: {tok[1]}[{tok[2]}]")
+            return tok
+        raise RuleBaseError(f"Token inesperado '{tok[0]}' en '{text}'")
+
+    node = expr()
+    if tokens:
+        raise RuleBaseError(f"Sobra '{tokens[0][0]}' en '{text}'")
+    return node
+
+
+# -------------------- Compilación --------------------
+def compile_spec(spec, resolution=0.25):
+    inputs = _variables(spec["inputs"])
+    outputs = _variables(spec["outputs"])
+    in_terms = {name: terms for name, _, terms in inputs}
+    out_terms = {name: terms for name, _, terms in outputs}
+
+    rules = []
+    for i, rule in enumerate(spec["rules"]):
+        antecedent = parse_antecedent(rule["if"], in_terms)
+        cons = []
+        for out, term in rule["then"].items():
+            lbl, weight = (term, 1.0) if isinstance(term, str) else (term[0], float(term[1]))
+            if lbl not in out_terms.get(out, ()):
+                raise RuleBaseError(f"Regla {i}: consecuente desconocido {out}[{lbl}]")
+            cons.append((out, lbl, weight))
+        rules.append((antecedent, cons))
+    compiled = CompiledRuleBase(inputs, outputs, rules, resolution)
+    if config.RULE_INDEX:
+        compiled.index = RuleIndex(compiled)
+    return jit.attach(compiled) if config.JIT else compiled
+
+
+def load_rulebase(path, resolution=0.25):
+    return compile_spec(load_spec(path), resolution)
+
+
+def check_compatible(current, new):
+    # El simulador lee entradas/salidas por nombre: no se permite cambiarlas en caliente
+    if new.input_names != current.input_names or new.output_names != current.output_names:
+        raise RuleBaseError(
+            f"Entradas/salidas distintas: {new.input_names} -> {new.output_names}, "
+            f"se esperaba {current.input_names} -> {current.output_names}")
+
+
+# -------------------- Hot reload --------------------
+class RuleBaseWatcher(threading.Thread):
+    def __init__(self, path, on_reload, interval=0.5):
+        super().__init__(name="automax-rules", daemon=True)
+        self.path = path
+        self.on_reload = on_reload    # recibe el CompiledRuleBase nuevo
+        self.interval = interval
+        self._stop_evt = threading.Event()
+        self._mtime = self._current_mtime()
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def check(self):
+        mtime = self._current_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            compiled = load_rulebase(self.path)
+            self.on_reload(compiled)
+        except Exception as e:
+            # Archivo a medio guardar o con errores: se conserva la rule base actual
+            log.error("Reglas '%s' no recargadas: %s", self.path, e)
+            return False
+        log.info("Reglas recargadas desde '%s' (%d reglas).", self.path, len(compiled.rules))
+        return True
+
+    def run(self):
+        while not self._stop_evt.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self._stop_evt.set()
@@ -0,0 +1,80 @@
+"""
+Escenarios headless del controlador clásico (salida 'accion') de AUTOMAX
+- Reproduce ClassicPhysics.update (mapa accion -> aceleración, relajación al slider,
+  obstáculo a velocidad fija, rebase a 5 m) para S escenarios a la vez:
+  una sola llamada batched al evaluador por paso.
+- Sin pygame ni aleatoriedad: el mismo rule base da siempre el mismo costo.
+"""
+
+import numpy as np
+
+from . import config
+from .jit import HAVE_NUMBA, classic_kinematics, classic_kinematics_np
+
+# Malla de escenarios por defecto: slider de velocidad, velocidad del obstáculo,
+# visibilidad y distancia inicial
+SCENARIO_GRID = {
+    "speed": [30, 50, 70, 90, 110],
+    "obst_speed": [40, 60, 80],
+    "visibility": [30, 60, 100],
+    "distance": [25, 70],
+}
+
+# Pesos del costo: rebases forzados (colisiones evitadas in extremis), frenadas
+# fuertes y desvío medio respecto al slider (km/h)
+COST_WEIGHTS = {"collisions": 10.0, "hard_brakes": 1.0, "speed_error": 0.2}
+
+REBASE_M = 5.0
+RESPAWN_M = 90.0
+
+
+def scenario_grid(grid=None):
+    grid = SCENARIO_GRID if grid is None else grid
+    mesh = np.meshgrid(*[np.asarray(v, dtype=float) for v in grid.values()], indexing="ij")
+    return {k: m.ravel() for k, m in zip(grid, mesh)}
+
+
+def rollout(fuzzy, scen, duration=30.0, dt=0.1, fallback=50.0):
+    # fuzzy: CompiledRuleBase con entradas velocidad/distancia/visibilidad y salida accion
+    speed = scen["speed"]
+    obst_speed = scen["obst_speed"]
+    vis = scen["visibility"]
+    dist = scen["distance"].copy()
+    disp = speed.copy()
+    n = speed.size
+
+    collisions = np.zeros(n)
+    hard_brakes = np.zeros(n)
+    speed_err = np.zeros(n)
+    min_dist = dist.copy()
+    braking = np.zeros(n, dtype=bool)
+    hit = np.zeros(n, dtype=bool)
+    steps = int(round(duration / dt))
+    relax = min(1.0, 1.8 * dt)
+    kinematics = classic_kinematics if HAVE_NUMBA and config.JIT else classic_kinematics_np
+
+    for _ in range(steps):
+        out, valid = fuzzy.evaluate({"velocidad": speed, "distancia": dist, "visibilidad": vis})
+        action = np.where(valid, out["accion"], fallback)
+
+        brake = action < 35
+        hard_brakes += brake & ~braking
+        braking = brake
+
+        # Map a aceleración, relajación al slider, distancia y rebase (igual que ClassicPhysics)
+        kinematics(action, speed, disp, dist, obst_speed, dt, relax, REBASE_M, RESPAWN_M, hit)
+        speed_err += np.abs(speed - disp)
+        np.minimum(min_dist, np.where(hit, 0.0, dist), out=min_dist)
+        collisions += hit
+
+    return {
+        "collisions": collisions,
+        "hard_brakes": hard_brakes,
+        "speed_error": speed_err / steps,
+        "min_distance": min_dist,
+    }
+
+
+def cost(result, weights=None):
+    weights = COST_WEIGHTS if weights is None else weights
+    return float(sum(w * np.mean(result[k]) for k, w in weights.items()))
@@ -0,0 +1,135 @@
+"""
+Análisis de sensibilidad global de las salidas de un FuzzyController
+- Sobol: índices de primer orden (Saltelli 2010) y totales (Jansen) con matrices A, B y
+  A_B^i de una secuencia Sobol aleatorizada: N (d + 2) evaluaciones en lote.
+- Convergencia: los índices se recalculan sobre prefijos N/8, N/4, N/2, N de la misma
+  secuencia, más un intervalo bootstrap al 95 % con N.
+- Morris: r trayectorias en una rejilla de p niveles; mu* (media de |efecto elemental|)
+  y sigma por entrada.
+- evaluate_parallel reparte el lote en bloques entre procesos (un controlador por proceso).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.stats import qmc
+
+_controller = None
+
+
+# -------------------- Evaluación en procesos --------------------
+def _init_worker(rules_path, fallback):
+    global _controller
+    from .controller import FuzzyController
+
+    _controller = FuzzyController(rules_path, fallback)
+
+
+def _eval_chunk(X):
+    return _controller.compute_batch(*X.T)
+
+
+def evaluate_parallel(rules_path, fallback, X, workers=None, chunk=20000):
+    # X: (n, entradas) en el orden del archivo de reglas -> (n, salidas)
+    jobs = [X[a:a + chunk] for a in range(0, len(X), chunk)]
+    parts = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(rules_path, fallback)) as pool:
+        for part in pool.map(_eval_chunk, jobs):
+            parts.append(np.column_stack(part if isinstance(part, tuple) else (part,)))
+    return np.concatenate(parts)
+
+
+def scale(U, bounds):
+    lo, hi = bounds[:, 0], bounds[:, 1]
+    return lo + U * (hi - lo)
+
+
+# -------------------- Sobol --------------------
+def saltelli_samples(bounds, n, seed=0):
+    # Filas: A (n), B (n), A_B^1 ... A_B^d (n cada una)
+    d = len(bounds)
+    U = qmc.Sobol(2 * d, scramble=True, seed=seed).random(n)
+    A, B = U[:, :d], U[:, d:]
+    blocks = [A, B]
+    for i in range(d):
+        AB = A.copy()
+        AB[:, i] = B[:, i]
+        blocks.append(AB)
+    return scale(np.concatenate(blocks), np.asarray(bounds, dtype=float))
+
+
+def sobol_indices(fA, fB, fAB):
+    # fA, fB: (n,), fAB: (d, n) -> S1, ST (d,)
+    var = np.var(np.concatenate([fA, fB]))
+    if var <= 0:
+        return np.zeros(len(fAB)), np.zeros(len(fAB))
+    s1 = np.mean(fB * (fAB - fA), axis=1) / var
+    st = 0.5 * np.mean((fA - fAB) ** 2, axis=1) / var
+    return s1, st
+
+
+def sobol_analysis(Y, n, d, boot=200, seed=0):
+    # Y: (n (d + 2),) de una salida en el orden de saltelli_samples
+    fA, fB = Y[:n], Y[n:2 * n]
+    fAB = Y[2 * n:].reshape(d, n)
+    conv = []
+    m = max(n // 8, 16)
+    while m <= n:
+        s1, st = sobol_indices(fA[:m], fB[:m], fAB[:, :m])
+        conv.append({"n": m, "S1": s1.tolist(), "ST": st.tolist()})
+        if m == n:
+            break
+        m = min(2 * m, n)
+
+    rng = np.random.default_rng(seed)
+    bs1 = np.empty((boot, d))
+    bst = np.empty((boot, d))
+    for b in range(boot):
+        idx = rng.integers(0, n, n)
+        bs1[b], bst[b] = sobol_indices(fA[idx], fB[idx], fAB[:, idx])
+    s1, st = sobol_indices(fA, fB, fAB)
+    return {
+        "S1": s1.tolist(),
+        "ST": st.tolist(),
+        "S1_ci95": (1.96 * bs1.std(axis=0)).tolist(),
+        "ST_ci95": (1.96 * bst.std(axis=0)).tolist(),
+        "convergence": conv,
+    }
+
+
+# -------------------- Morris --------------------
+def morris_samples(bounds, r, levels=8, seed=0):
+    # r trayectorias de d + 1 puntos; cada paso mueve una entrada +-delta (orden aleatorio)
+    d = len(bounds)
+    rng = np.random.default_rng(seed)
+    delta = levels / (2.0 * (levels - 1))
+    grid = np.arange(levels // 2) / (levels - 1)     # arranques que permiten +delta
+    traj = np.empty((r, d + 1, d))
+    for t in range(r):
+        x = rng.choice(grid, d)
+        sign = rng.choice([-1.0, 1.0], d)
+        x = np.where(sign < 0, x + delta, x)          # con -delta se arranca arriba
+        traj[t, 0] = x
+        for k, i in enumerate(rng.permutation(d)):
+            x = x.copy()
+            x[i] += sign[i] * delta
+            traj[t, k + 1] = x
+    return scale(traj.reshape(-1, d), np.asarray(bounds, dtype=float)), delta
+
+
+def morris_analysis(X, Y, r, d, bounds, delta):
+    # Efecto elemental por paso: (f(x + e_i delta) - f(x)) / delta en unidades de [0, 1]
+    X = X.reshape(r, d + 1, d)
+    Y = Y.reshape(r, d + 1)
+    span = np.asarray(bounds, dtype=float)[:, 1] - np.asarray(bounds, dtype=float)[:, 0]
+    ee = np.empty((r, d))
+    for t in range(r):
+        dx = np.diff(X[t], axis=0) / span
+        i = np.argmax(np.abs(dx), axis=1)
+        ee[t, i] = np.diff(Y[t]) / dx[np.arange(d), i]
+    return {
+        "mu": ee.mean(axis=0).tolist(),
+        "mu_star": np.abs(ee).mean(axis=0).tolist(),
+        "sigma": ee.std(axis=0, ddof=1).tolist() if r > 1 else [0.0] * d,
+    }
@@ -0,0 +1,368 @@
+"""
+Núcleo de simulación AUTOMAX
+RetroNeonSim reúne componentes intercambiables:
+- controller: FuzzyController (rules/*.json)
+- physics:    ClassicPhysics / ArcadePhysics (con Traffic: obstáculos por carril)
+- weather:    RainToggleWeather / WeatherCycle
+- renderer:   ClassicRenderer / ArcadeRenderer
+La física corre en un hilo (PhysicsWorker) y publica SimSnapshot; el hilo de pygame
+solo procesa eventos y dibuja el último snapshot.
+"""
+
+import os
+import random
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+import pandas as pd
+import pygame
+
+from . import config
+from .audio import AudioManager
+from .branch import capture
+from .bundle import open_bundle
+from .config import ASSETS_DIR, FPS, RESULTS_DIR, SCREEN_H, SCREEN_W
+from .datalog import DeltaLog, make_log
+from .metrics import SafetyMetrics
+from .recording import Recorder
+from .sugeno import SugenoController
+from .telemetry import TelemetryServer
+from .ui import Slider
+from .weather import update_rain_particles
+from .worker import PhysicsWorker, SnapshotBuffer, get_async_logger
+
+log = get_async_logger()
+
+# Estado que necesita el render (snapshot inmutable publicado por la física)
+SimSnapshot = namedtuple("SimSnapshot", [
+    "time", "daytime", "speed", "display_speed", "obst_distance_m", "obst_lane",
+    "visibility", "grip", "headlights_on", "brake_on", "weather_mode",
+    "rain_enabled", "fog_enabled", "fog_color", "road_offset", "cloud_offset_x",
+    "rebase_anim", "rebase_dir", "particles", "rebase_particles", "rain_particles",
+    "action_text", "action_val", "brake_val", "throttle_val", "vehicles",
+])
+
+SOUNDS = {
+    "rain": (["rain_loop.wav.mp3", "rain_loop.wav"], 0.5),
+    "horn": (["horn.wav.mp3", "horn.wav"], None),
+}
+
+
+class RetroNeonSim:
+    def __init__(self, controller, physics, weather, renderer, caption="Automax", demo_period=2.0, demo_speed=(20, 100)):
+        pygame.init()
+        pygame.display.set_caption(caption)
+        self.screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.SysFont("Arial", 18)
+        self.bigfont = pygame.font.SysFont("Consolas", 28, bold=True)
+
+        # componentes (el controlador se puede cambiar en marcha: Mamdani <-> Sugeno)
+        self.controllers = {"mamdani": controller}
+        self.fuzzy = controller
+        self.controller_name = "mamdani"
+        if config.CONTROLLER != "mamdani":
+            self.select_controller(config.CONTROLLER)
+        self.physics = physics
+        self.weather = weather
+        self.renderer = renderer
+        self.demo_period = demo_period
+        self.demo_speed = demo_speed
+
+        # coche visual
+        self.car_vis_w = 180
+        self.car_vis_h = 140
+        self.car_x = SCREEN_W // 2 - self.car_vis_w // 2
+        self.car_y = SCREEN_H - self.car_vis_h - 18
+        self.car_w = self.car_vis_w
+        self.car_h = self.car_vis_h
+
+        # assets pre-procesados (build_assets.py); None = decodificar los originales
+        self.assets = open_bundle() if config.ASSET_BUNDLE else None
+
+        # sonidos (PCM en caché, órdenes por cola; backend nulo si no hay audio)
+        self.audio = AudioManager(ASSETS_DIR, SOUNDS, self.assets)
+
+        # sliders
+        sx = 40; sw = 380; sy = 60
+        self.slider_speed = Slider((sx, sy, sw, 30), 0, 120, 40.0, "Velocidad (km/h)")
+        self.slider_dist = Slider((sx, sy+80, sw, 30), 0, 100, 40.0, "Distancia (m)")
+        self.slider_vis = Slider((sx, sy+160, sw, 30), 0, 100, 100.0, "Visibilidad (%)")
+
+        self.px_per_m = 5.0
+        self.obst_speed = 60.0  # km/h fijo
+        self.running = True
+        self.demo_mode = False
+        self.dragging_obstacle = False
+        self.init_state()
+
+        self.renderer.setup(self)
+        self.weather.setup(self)
+        self.physics.setup(self)
+
+        # física en hilo + doble buffer de snapshots
+        self.state_lock = threading.Lock()
+        self.snapshots = SnapshotBuffer(self.snapshot())
+        self.worker = PhysicsWorker(self.step, self.snapshot, self.snapshots, self.state_lock, FPS,
+                                    on_fatal=self.physics_failed)
+        self.rules_watcher = self.controllers["mamdani"].watcher(on_reload=self.reload_rules)
+        self.recorder = Recorder(keyframe_every=config.RECORD_KEYFRAME) if config.RECORD else None
+        self.telemetry = None
+        if config.TELEMETRY_PORT is not None:
+            self.telemetry = TelemetryServer(port=config.TELEMETRY_PORT, udp_port=config.TELEMETRY_UDP_PORT,
+                                             rate_hz=config.TELEMETRY_RATE, batch=config.TELEMETRY_BATCH)
+
+    def init_state(self):
+        # simulación
+        self.speed = 40.0        # km/h (slider)
+        self.display_speed = self.speed
+        self.obst_distance_m = 40.0
+        self.obst_lane = 0       # -1 izquierda, 0 centro, +1 derecha
+        self.time = 0.0
+        self.dt = 1.0 / FPS
+        self.demo_timer = 0.0
+
+        # entorno
+        self.visibility = 100.0
+        self.grip = 100.0
+        self.daytime = 12.0      # hora simulada (0..24)
+        self.headlights_on = False
+        self.weather_mode = 0
+        self.rain_enabled = False
+        self.fog_enabled = False
+        self.fog_color = (200,200,200)
+        self.road_offset = 0.0
+        self.cloud_offset_x = 0.0
+
+        # decisión fuzzy
+        self.action_val = 50.0
+        self.action_text = "MANTENER"
+        self.brake_val = 0.0
+        self.throttle_val = 0.0
+        self.horn_val = 0.0
+        self.brake_on = False
+        self.horn_playing = False
+
+        # rebase y partículas
+        self.rebase_anim = 0.0   # progreso 0..1
+        self.rebase_dir = 0      # -1 izq, +1 der
+        self.rebase_count = 0
+        self.particles = []
+        self.rebase_particles = []
+        self.rain_particles = []
+        self.log = make_log(config.LOG_MODE, max_gap=config.LOG_MAX_GAP)
+        self.metrics = SafetyMetrics()   # KPIs de seguridad de la sesión
+
+    # -------- Bucle principal --------
+    def run(self):
+        if self.recorder is not None:
+            self.recorder.start(self)
+        if config.PHYSICS_THREAD:
+            self.worker.start()
+        self.rules_watcher.start()
+        if self.telemetry is not None:
+            self.telemetry.start()
+        while self.running:
+            dt = self.clock.tick(FPS) / 1000.0
+            with self.state_lock:
+                self.handle_events()
+                if not config.PHYSICS_THREAD:
+                    self.step(dt)
+                    self.snapshots.publish(self.snapshot())
+            self.renderer.draw(self, self.snapshots.latest())
+            pygame.display.flip()
+        self.worker.stop()
+        self.rules_watcher.stop()
+        if self.telemetry is not None:
+            self.telemetry.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            log.info("Grabación: %s", self.recorder.path)
+        self.save_metrics()
+        self.audio.shutdown()
+        pygame.quit()
+
+    def step(self, dt):
+        self.dt = dt
+        self.time += dt
+        self.update(dt)
+        if self.recorder is not None:
+            self.recorder.step(self)
+
+    def snapshot(self):
+        return SimSnapshot(
+            time=self.time,
+            daytime=self.daytime,
+            speed=self.speed,
+            display_speed=self.display_speed,
+            obst_distance_m=self.obst_distance_m,
+            obst_lane=self.obst_lane,
+            visibility=self.visibility,
+            grip=self.grip,
+            headlights_on=self.headlights_on,
+            brake_on=self.brake_on,
+            weather_mode=self.weather_mode,
+            rain_enabled=self.rain_enabled,
+            fog_enabled=self.fog_enabled,
+            fog_color=self.fog_color,
+            road_offset=self.road_offset,
+            cloud_offset_x=self.cloud_offset_x,
+            rebase_anim=self.rebase_anim,
+            rebase_dir=self.rebase_dir,
+            particles=tuple(tuple(p) for p in self.particles),
+            rebase_particles=tuple(tuple(p) for p in self.rebase_particles),
+            rain_particles=tuple(tuple(p) for p in self.rain_particles),
+            action_text=self.action_text,
+            action_val=self.action_val,
+            brake_val=self.brake_val,
+            throttle_val=self.throttle_val,
+            vehicles=self.traffic.visible(),   # solo los visibles (0..horizonte)
+        )
+
+    # -------- Eventos --------
+    def handle_events(self):
+        for e in pygame.event.get():
+            self.handle_event(e)
+
+    def handle_event(self, e):
+        if self.recorder is not None:
+            self.recorder.event(e)
+        # Cerrar ventana
+        if e.type == pygame.QUIT:
+            self.running = False
+
+        # Sliders
+        self.slider_speed.handle_event(e)
+        self.slider_dist.handle_event(e)
+        self.slider_vis.handle_event(e)
+
+        # Teclado
+        if e.type == pygame.KEYDOWN:
+            if e.key == pygame.K_ESCAPE:
+                self.running = False
+            elif e.key == pygame.K_SPACE:
+                self.demo_mode = not self.demo_mode
+                log.info("Demo mode: %s", self.demo_mode)
+            elif e.key == pygame.K_s:
+                self.save_log_csv()
+                self.save_metrics()
+            elif e.key == pygame.K_b:
+                # Instantánea para ramas "¿y si...?" (whatif.py)
+                log.info("Instantánea guardada: %s", capture(self).save())
+            elif e.key == pygame.K_r:
+                self.reset_sim()
+            elif e.key == pygame.K_t:
+                self.select_controller("sugeno" if self.controller_name == "mamdani" else "mamdani")
+
+        self.weather.handle_event(self, e)
+
+        # Mouse: arrastrar obstáculo
+        if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+            if self.renderer.obstacle_screen_rect(self, self).collidepoint(e.pos):
+                self.dragging_obstacle = True
+        elif e.type == pygame.MOUSEBUTTONUP and e.button == 1:
+            self.dragging_obstacle = False
+        elif e.type == pygame.MOUSEMOTION and self.dragging_obstacle:
+            self.obst_distance_m = self.renderer.distance_at(self, e.pos[1])
+            self.slider_dist.value = self.obst_distance_m
+            self.traffic.move_nearest(self.obst_distance_m)
+
+    def select_controller(self, name):
+        # El TSK se ajusta la primera vez que se pide (una fracción de segundo)
+        if name not in self.controllers:
+            if name != "sugeno":
+                raise ValueError(f"Controlador desconocido: {name}")
+            if not hasattr(self.controllers["mamdani"], "fast"):
+                log.warning("Sugeno no disponible con el servidor de inferencia remoto")
+                return
+            self.controllers[name] = SugenoController(self.controllers["mamdani"])
+        self.fuzzy = self.controllers[name]
+        self.controller_name = name
+        log.info("Controlador: %s", name)
+
+    def physics_failed(self, exc):
+        # Hilo de física: sin pasos válidos no tiene sentido seguir dibujando el último
+        log.error("Simulación detenida: la física falla sin parar (%s). Revisa el log.", exc)
+        self.running = False
+
+    def reload_rules(self, compiled):
+        # Hilo del watcher, sin state_lock: el reajuste del TSK no detiene la física
+        if "sugeno" in self.controllers:
+            self.controllers["sugeno"].swap(compiled)    # reajusta y cambia también el Mamdani
+        else:
+            self.controllers["mamdani"].swap(compiled)
+
+    def reset_sim(self):
+        self.init_state()
+        self.slider_speed.value = self.speed
+        self.slider_dist.value = self.obst_distance_m
+        self.slider_vis.value = self.visibility
+        self.weather.reset(self)
+        self.physics.reset(self)
+        self.audio.set_loop("horn", False)
+
+    # -------- Paso de simulación --------
+    def update(self, dt):
+        # Animación de rebase
+        if self.rebase_anim > 0.0:
+            self.rebase_anim = max(0.0, self.rebase_anim - 0.05)
+
+        # Lectura sliders
+        self.speed = self.slider_speed.value
+
+        # Día/noche, clima, visibilidad y luces
+        self.weather.update(self, dt)
+
+        # Modo demo
+        if self.demo_mode:
+            self.demo_timer += dt
+            if self.demo_timer > self.demo_period:
+                self.demo_timer = 0.0
+                self.slider_speed.value = random.uniform(*self.demo_speed)
+                self.speed = self.slider_speed.value
+                self.weather.demo(self)
+                self.physics.demo(self)
+
+        # Decisión fuzzy, velocidad, obstáculo, rebase y partículas
+        self.physics.update(self, dt)
+        update_rain_particles(self, dt)
+
+        # Log
+        row = {
+            "time": round(self.time,3),
+            "slider_speed": round(self.speed,3),
+            "display_speed": round(self.display_speed,3),
+            "distance_m": round(self.obst_distance_m,3),
+            "visibility": round(self.visibility,3),
+            "action_text": self.action_text,
+            "hour": round(self.daytime,2),
+        }
+        row.update(self.physics.log_fields(self))
+        self.log.append(row)
+        self.metrics.update(self, dt)
+        if self.telemetry is not None:
+            self.telemetry.publish(self)
+
+    def save_log_csv(self):
+        if not self.log:
+            return
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if isinstance(self.log, DeltaLog):
+            fname = self.log.save(os.path.join(RESULTS_DIR, f"log_{stamp}.dlog"))
+            log.info("Saved %s (%d registros / %d fotogramas)", fname, len(self.log.records), len(self.log))
+            return
+        fname = os.path.join(RESULTS_DIR, f"log_{stamp}.csv")
+        df = pd.DataFrame(self.log)
+        df.to_csv(fname, index=False)
+        log.info("Saved %s", fname)
+
+    def save_metrics(self):
+        if self.metrics.elapsed <= 0.0:
+            return
+        kpi = self.metrics.to_dict()
+        fname = self.metrics.save()
+        log.info("KPIs: TTC p5=%s s, headway mín=%.1f m, frenadas fuertes=%d, claxon=%.0f%%, rebases/min=%.2f -> %s",
+                 kpi["ttc_s"].get("p5"), kpi["min_headway_m"], kpi["hard_brakes"],
+                 kpi["horn_duty_cycle"] * 100, kpi["rebases_per_min"], fname)
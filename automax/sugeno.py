@@ -0,0 +1,161 @@
+"""
+Controlador Takagi-Sugeno (TSK de primer orden) ajustado a la superficie Mamdani
+- Mismos antecedentes que el rule base Mamdani (misma activación de reglas), pero cada
+  regla tiene un consecuente lineal y = p·x + c: la salida es el promedio ponderado
+  por la activación, sin agregación ni centroide sobre el universo de salida.
+- Los coeficientes se ajustan por mínimos cuadrados sobre una malla de muestras de la
+  superficie Mamdani (paso LSE de ANFIS).
+- Misma interfaz que FuzzyController. Con Numba (config.JIT) activaciones y consecuentes
+  van en un kernel nativo (jit.TskEvaluator); sin él, NumPy.
+- Recarga en caliente: swap() reajusta en el hilo del watcher (fuera del lock de la física)
+  y publica el ajuste nuevo con una sola asignación.
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .jit import TskEvaluator
+from .rulebase import RuleBaseWatcher
+
+# Ajuste inmutable: el rule base con el que se ajustó y todo lo que se evalúa con él
+TskFit = namedtuple("TskFit", "compiled in_range out_range rule_ids coef kernel")
+
+
+class SugenoController:
+    def __init__(self, source, max_samples=20000, ridge=1e-6):
+        # source: FuzzyController Mamdani del que se toma la superficie
+        self.source = source
+        self.max_samples = max_samples
+        self.ridge = ridge
+        self.fallback = source.fallback
+        self.model = self.fit(source.fast)
+
+    @property
+    def input_names(self):
+        return self.source.input_names
+
+    @property
+    def output_names(self):
+        return self.source.output_names
+
+    @property
+    def rules_path(self):
+        return self.source.rules_path
+
+    # -------- Ajuste --------
+    @staticmethod
+    def _features(model, values):
+        # Activaciones (N x R) y entradas escaladas a [0, 1] con columna de unos (N x k)
+        fast = model.compiled
+        mu, n = fast.memberships(values)
+        F = np.empty((n, len(fast.rules)))
+        for r, act in fast.firing(mu).items():
+            F[:, r] = act
+        X = np.ones((n, len(model.in_range) + 1))
+        for j, (name, lo, hi) in enumerate(model.in_range):
+            X[:, j] = (np.clip(values[name], lo, hi) - lo) / (hi - lo)
+        return F, X
+
+    def fit(self, fast):
+        # Devuelve un TskFit nuevo sin tocar el que está en uso
+        in_range = [(name, univ[0], univ[-1]) for name, univ, _ in fast.inputs]
+        out_range = {name: (univ[0], univ[-1]) for name, univ, _ in fast.outputs}
+        # Reglas que aportan a cada salida
+        rule_ids = {out: np.array([r for r, (_, cons) in enumerate(fast.rules)
+                                   if any(c[0] == out for c in cons)], dtype=int)
+                    for out in fast.output_names}
+
+        # Malla regular con ~max_samples puntos
+        per_axis = max(3, int(self.max_samples ** (1.0 / len(fast.inputs))))
+        axes = [np.linspace(univ[0], univ[-1], per_axis) for _, univ, _ in fast.inputs]
+        grid = np.meshgrid(*axes, indexing="ij")
+        values = {name: g.ravel() for name, g in zip(fast.input_names, grid)}
+        target, valid = fast.evaluate(values)
+
+        F, X = self._features(TskFit(fast, in_range, out_range, rule_ids, None, None), values)
+        k = X.shape[1]
+        coef = {}
+        for out, ids in rule_ids.items():
+            W = F[:, ids]
+            total = W.sum(axis=1)
+            rows = valid & (total > 0)
+            Wn = W[rows] / total[rows, None]
+            # Fila de diseño: concatenación por regla de w_r * [x, 1]
+            A = (Wn[:, :, None] * X[rows][:, None, :]).reshape(rows.sum(), len(ids) * k)
+            lhs = A.T @ A + self.ridge * np.eye(A.shape[1])
+            coef[out] = np.linalg.solve(lhs, A.T @ target[out][rows]).reshape(len(ids), k)
+        kernel = None
+        if fast.jit is not None:
+            kernel = TskEvaluator(fast.jit, rule_ids, coef, out_range, self.fallback)
+        return TskFit(fast, in_range, out_range, rule_ids, coef, kernel)
+
+    # -------- Inferencia --------
+    def evaluate_batch(self, values):
+        model = self.model
+        if model.kernel is not None:
+            return model.kernel.evaluate(values)
+        F, X = self._features(model, values)
+        out = {}
+        for name, ids in model.rule_ids.items():
+            W = F[:, ids]
+            total = W.sum(axis=1)
+            # y = sum_r w_r (p_r . x) / sum_r w_r
+            num = ((W @ model.coef[name]) * X).sum(axis=1)
+            lo, hi = model.out_range[name]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                y = np.clip(num / total, lo, hi)
+            out[name] = np.where(total > 0, y, self.fallback)
+        return out
+
+    def evaluate(self, values):
+        return {name: float(arr[0]) for name, arr in self.evaluate_batch(values).items()}
+
+    def compute(self, *args):
+        out = self.evaluate(dict(zip(self.input_names, args)))
+        vals = tuple(out[name] for name in self.output_names)
+        return vals[0] if len(vals) == 1 else vals
+
+    def compute_batch(self, *args):
+        out = self.evaluate_batch(dict(zip(self.input_names, args)))
+        vals = tuple(out[name] for name in self.output_names)
+        return vals[0] if len(vals) == 1 else vals
+
+    def swap(self, compiled):
+        # Único camino de reajuste: se ajusta antes de publicar; el Mamdani cambia a la vez
+        model = self.fit(compiled)
+        self.source.swap(compiled)
+        self.model = model
+
+    def watcher(self, interval=0.5, on_reload=None):
+        return RuleBaseWatcher(self.rules_path, on_reload or self.swap, interval)
+
+
+# -------------------- Reporte error / velocidad --------------------
+def compare(mamdani, sugeno, n=20000, scalar_calls=300, seed=0):
+    rng = np.random.default_rng(seed)
+    fast = mamdani.fast
+    values = {name: rng.uniform(univ[0], univ[-1], n) for name, univ, _ in fast.inputs}
+    ref = mamdani.evaluate_batch(values)
+    approx = sugeno.evaluate_batch(values)
+    report = {"samples": n, "outputs": {}}
+    for name in mamdani.output_names:
+        err = np.abs(ref[name] - approx[name])
+        report["outputs"][name] = {
+            "mae": float(err.mean()), "rmse": float(np.sqrt((err ** 2).mean())),
+            "p95": float(np.percentile(err, 95)), "max": float(err.max()),
+        }
+
+    def timed(fn, arg, reps):
+        t = time.perf_counter()
+        for _ in range(reps):
+            fn(arg)
+        return (time.perf_counter() - t) / reps
+
+    one = {name: float(v[0]) for name, v in values.items()}
+    t_m1, t_s1 = timed(mamdani.evaluate, one, scalar_calls), timed(sugeno.evaluate, one, scalar_calls)
+    t_mb, t_sb = timed(mamdani.evaluate_batch, values, 3), timed(sugeno.evaluate_batch, values, 3)
+    report["scalar_ms"] = {"mamdani": t_m1 * 1e3, "sugeno": t_s1 * 1e3, "speedup": t_m1 / t_s1}
+    report["batch_us_per_sample"] = {"mamdani": t_mb / n * 1e6, "sugeno": t_sb / n * 1e6, "speedup": t_mb / t_sb}
+    return report
@@ -0,0 +1,222 @@
+"""
+Servidor local de telemetría de AUTOMAX (asyncio, TCP y UDP opcional)
+- La física llama publish(sim) cada paso; se diezma a rate_hz y se empaquetan
+  registros binarios (struct) en lotes de 'batch' registros por trama.
+- El bucle asyncio corre en su propio hilo; la física solo hace un call_soon_threadsafe
+  por trama, nunca espera a la red.
+- TCP: trama con prefijo de longitud. Cada suscriptor tiene una cola acotada; si no
+  consume a tiempo se descartan sus tramas más viejas (contrapresión sin frenar a nadie).
+- stop() envía el lote a medias y da a cada suscriptor hasta drain_s para vaciar su cola
+  antes de cortar la conexión.
+- UDP: un cliente envía b"SUB" al puerto y recibe las tramas (b"UNSUB" para salir).
+
+Trama: HEADER (magic, versión, n) + n * RECORD (ver FIELDS).
+"""
+
+import asyncio
+import struct
+import threading
+
+from .worker import get_async_logger
+
+log = get_async_logger()
+
+MAGIC = b"AMXT"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<I10fBB")
+LENGTH = struct.Struct("<I")
+FIELDS = ("seq", "time", "speed", "distance", "visibility", "grip", "brake", "throttle",
+          "horn", "action", "daytime", "weather", "flags")
+# flags: bit 0 lluvia, 1 niebla, 2 luces, 3 claxon sonando
+FLAG_RAIN, FLAG_FOG, FLAG_LIGHTS, FLAG_HORN = 1, 2, 4, 8
+
+
+def pack_record(seq, sim):
+    flags = ((FLAG_RAIN if sim.rain_enabled else 0) | (FLAG_FOG if sim.fog_enabled else 0)
+             | (FLAG_LIGHTS if sim.headlights_on else 0) | (FLAG_HORN if sim.horn_playing else 0))
+    return RECORD.pack(seq & 0xFFFFFFFF, sim.time, sim.display_speed, sim.obst_distance_m,
+                       sim.visibility, sim.grip, sim.brake_val, sim.throttle_val, sim.horn_val,
+                       sim.action_val, sim.daytime, sim.weather_mode & 0xFF, flags)
+
+
+def decode_frame(frame):
+    magic, version, n = HEADER.unpack_from(frame)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Trama desconocida: {magic!r} v{version}")
+    return [dict(zip(FIELDS, RECORD.unpack_from(frame, HEADER.size + i * RECORD.size))) for i in range(n)]
+
+
+async def subscribe(host="127.0.0.1", port=8765):
+    # Cliente TCP: genera listas de registros (dict) según llegan las tramas
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            (size,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+            yield decode_frame(await reader.readexactly(size))
+    except asyncio.IncompleteReadError:
+        return
+    finally:
+        writer.close()
+
+
+class _Client:
+    def __init__(self, writer, max_queue):
+        self.writer = writer
+        self.peer = writer.get_extra_info("peername")
+        self.task = asyncio.current_task()
+        self.queue = asyncio.Queue(max_queue)
+        self.dropped = 0
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, addr):
+        if data.startswith(b"UNSUB"):
+            self.server._udp_subs.discard(addr)
+        elif data.startswith(b"SUB"):
+            self.server._udp_subs.add(addr)
+
+
+class TelemetryServer:
+    def __init__(self, host="127.0.0.1", port=8765, udp_port=None, rate_hz=20.0, batch=5, max_queue=64,
+                 drain_s=1.0):
+        self.host = host
+        self.port = port
+        self.udp_port = udp_port
+        self.period = 1.0 / rate_hz
+        self.batch = batch
+        self.max_queue = max_queue
+        self.drain_s = drain_s
+        self.frames_sent = 0
+        self.dropped = 0
+        self._clients = set()
+        self._udp_subs = set()
+        self._udp = None
+        self._pending = []
+        self._seq = 0
+        self._last_t = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def clients(self):
+        return len(self._clients) + len(self._udp_subs)
+
+    # -------- Hilo del servidor --------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="automax-telemetry", daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+
+    def stop(self):
+        if self._loop is not None and self._thread.is_alive():
+            self.flush()    # call_soon_threadsafe es FIFO: se difunde antes de parar
+            self._loop.call_soon_threadsafe(self._stop_evt.set)
+            self._thread.join(timeout=self.drain_s + 2.0)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        except OSError as e:
+            log.error("Telemetría no disponible en %s:%s: %s", self.host, self.port, e)
+            self._ready.set()
+        finally:
+            self._loop.close()
+
+    async def _serve(self):
+        self._stop_evt = asyncio.Event()
+        server = await asyncio.start_server(self._on_client, self.host, self.port)
+        try:
+            if self.udp_port is not None:
+                self._udp, _ = await self._loop.create_datagram_endpoint(
+                    lambda: _UdpProtocol(self), local_addr=(self.host, self.udp_port))
+            log.info("Telemetría en tcp://%s:%s%s", self.host, self.port,
+                     f" y udp://{self.host}:{self.udp_port}" if self.udp_port is not None else "")
+            self._ready.set()
+            await self._stop_evt.wait()
+            server.close()
+            await self._drain_clients()
+        finally:
+            # También si falla el bind UDP: no queda el puerto TCP abierto
+            server.close()
+            if self._udp is not None:
+                self._udp.close()
+                self._udp = None
+            await server.wait_closed()
+
+    async def _drain_clients(self):
+        # Fin de flujo tras lo encolado; quien no vacíe en drain_s (bloqueado en drain()) se corta
+        for c in self._clients:
+            if c.queue.full():
+                c.queue.get_nowait()
+                c.dropped += 1
+                self.dropped += 1
+            c.queue.put_nowait(None)
+        tasks = [c.task for c in self._clients]
+        if not tasks:
+            return
+        _, late = await asyncio.wait(tasks, timeout=self.drain_s)
+        for c in list(self._clients):
+            if c.task in late:
+                c.writer.transport.abort()
+                c.task.cancel()
+        await asyncio.gather(*late, return_exceptions=True)
+
+    async def _on_client(self, reader, writer):
+        client = _Client(writer, self.max_queue)
+        self._clients.add(client)
+        log.info("Telemetría: cliente %s conectado", client.peer)
+        try:
+            while True:
+                data = await client.queue.get()
+                if data is None:
+                    break
+                writer.write(data)
+                await writer.drain()   # contrapresión TCP: solo espera este cliente
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(client)
+            writer.close()
+            log.info("Telemetría: cliente %s desconectado (%d tramas descartadas)", client.peer, client.dropped)
+
+    def _broadcast(self, frame):
+        # En el hilo asyncio: una copia por suscriptor, descartando la más vieja si está lleno
+        data = LENGTH.pack(len(frame)) + frame
+        for c in self._clients:
+            if c.queue.full():
+                c.queue.get_nowait()
+                c.dropped += 1
+                self.dropped += 1
+            c.queue.put_nowait(data)
+        if self._udp is not None:
+            for addr in list(self._udp_subs):
+                self._udp.sendto(frame, addr)
+        self.frames_sent += 1
+
+    # -------- Lado de la física --------
+    def publish(self, sim):
+        # Diezmado por tiempo simulado (reset_sim vuelve el tiempo a 0)
+        if self._last_t is not None and 0.0 <= sim.time - self._last_t < self.period:
+            return
+        self._last_t = sim.time
+        self._pending.append(pack_record(self._seq, sim))
+        self._seq += 1
+        if len(self._pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if not self._pending or self._loop is None or self._loop.is_closed():
+            self._pending = []
+            return
+        frame = HEADER.pack(MAGIC, VERSION, len(self._pending)) + b"".join(self._pending)
+        self._pending = []
+        try:
+            self._loop.call_soon_threadsafe(self._broadcast, frame)
+        except RuntimeError:
+            pass   # el bucle se está cerrando
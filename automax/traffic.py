@@ -0,0 +1,112 @@
+"""
+Tráfico de AUTOMAX: varios obstáculos repartidos en los tres carriles
+- Posiciones relativas al coche propio (m, > 0 delante); cada vehículo con su velocidad (km/h).
+- Índice ordenado por carril: el más cercano delante es una búsqueda binaria
+  (np.searchsorted) y el recorte para dibujar es un rango contiguo del índice.
+- El avance es vectorizado por carril; tras moverse el orden casi no cambia y se
+  reordena con un sort estable (casi lineal sobre datos casi ordenados).
+"""
+
+import random
+
+import numpy as np
+
+from . import config
+from .jit import HAVE_NUMBA, advance_lane
+
+LANES = (-1, 0, 1)
+
+
+class Traffic:
+    def __init__(self, lanes=LANES, horizon=100.0, behind=10.0, alongside=2.0):
+        self.lanes = tuple(lanes)
+        self.horizon = horizon       # distancia máxima sensada / dibujada (m)
+        self.length = horizon        # tramo simulado delante del coche (crece con la densidad)
+        self.behind = behind         # los que quedan más atrás se reciclan al fondo del tramo
+        self.alongside = alongside   # aún "no rebasado" aunque ya esté un poco por detrás
+        self.clear()
+
+    def clear(self):
+        self.pos = {lane: np.empty(0) for lane in self.lanes}
+        self.speed = {lane: np.empty(0) for lane in self.lanes}
+
+    def __len__(self):
+        return sum(len(p) for p in self.pos.values())
+
+    def populate(self, n, first_distance, first_lane, base_speed, spread=0.0, spacing=20.0):
+        # El primero reproduce el obstáculo único original; el resto se reparte en el tramo
+        self.clear()
+        self.length = max(self.horizon, n / len(self.lanes) * spacing)
+        self.add(first_lane, first_distance, base_speed)
+        for _ in range(n - 1):
+            self.add(random.choice(self.lanes), random.uniform(0.0, self.length),
+                     base_speed + random.uniform(-spread, spread))
+
+    # -------- Índice por carril --------
+    def add(self, lane, distance, speed):
+        i = int(np.searchsorted(self.pos[lane], distance))
+        self.pos[lane] = np.insert(self.pos[lane], i, distance)
+        self.speed[lane] = np.insert(self.speed[lane], i, speed)
+        return i
+
+    def remove(self, lane, i):
+        speed = float(self.speed[lane][i])
+        self.pos[lane] = np.delete(self.pos[lane], i)
+        self.speed[lane] = np.delete(self.speed[lane], i)
+        return speed
+
+    def respawn(self, lane, i, new_lane, distance):
+        # Rebase: el vehículo reaparece adelante (posiblemente en otro carril) con su velocidad
+        return self.add(new_lane, distance, self.remove(lane, i))
+
+    def nearest(self, lanes=None):
+        # (distancia, carril, índice) del más cercano no rebasado en los carriles dados; None si no hay
+        best = None
+        for lane in (self.lanes if lanes is None else lanes):
+            pos = self.pos[lane]
+            i = int(np.searchsorted(pos, -self.alongside))
+            if i < len(pos) and (best is None or pos[i] < best[0]):
+                best = (float(pos[i]), lane, i)
+        return best
+
+    def move_nearest(self, distance, lanes=None):
+        # Arrastre con el mouse / slider: mueve el más cercano a la distancia indicada
+        near = self.nearest(lanes)
+        if near is not None:
+            _, lane, i = near
+            self.add(lane, distance, self.remove(lane, i))
+
+    def visible(self, max_distance=None):
+        # (distancia, carril) entre 0 y max_distance, del más lejano al más cercano (orden de dibujo)
+        max_distance = self.horizon if max_distance is None else max_distance
+        out = []
+        for lane in self.lanes:
+            pos = self.pos[lane]
+            a = np.searchsorted(pos, 0.0)
+            b = np.searchsorted(pos, max_distance, side="right")
+            out.extend((float(d), lane) for d in pos[a:b])
+        out.sort(reverse=True)
+        return tuple(out)
+
+    # -------- Dinámica --------
+    def advance(self, ego_speed, dt, scale=1.0):
+        # ego_speed en km/h; la distancia baja si el coche propio es más rápido que el vehículo
+        for lane in self.lanes:
+            pos = self.pos[lane]
+            if not len(pos):
+                continue
+            speed = self.speed[lane]
+            if HAVE_NUMBA and config.JIT:
+                if not pos.flags.writeable:
+                    # Arrays compartidos de una instantánea (automax.branch): copia al escribir
+                    pos = self.pos[lane] = pos.copy()
+                    speed = self.speed[lane] = speed.copy()
+                advance_lane(pos, speed, ego_speed, dt, scale, self.behind, self.length)
+                continue
+            pos = pos - (ego_speed - speed) / 3.6 * dt * scale
+            # Los que quedan atrás vuelven al fondo; los que se alejan se quedan en el borde del tramo
+            pos = np.where(pos < -self.behind, pos + self.length + self.behind, pos)
+            np.minimum(pos, self.length, out=pos)
+            order = np.argsort(pos, kind="stable")
+            self.pos[lane] = pos[order]
+            self.speed[lane] = speed[order]
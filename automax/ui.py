@@ -0,0 +1,121 @@
+"""
+Widgets de interfaz de AUTOMAX: Slider y Button
+"""
+
+import pygame
+
+
+# -------------------- Slider --------------------
+class Slider:
+    def __init__(self, rect, minv, maxv, val, label, color=(200,200,200), glow=True):
+        self.rect = pygame.Rect(rect)
+        self.minv = minv
+        self.maxv = maxv
+        self.value = val
+        self.label = label
+        self.dragging = False
+        self.color = color
+        self.glow = glow
+        self.handle_radius = 10
+
+    def handle_x(self):
+        rel = (self.value - self.minv) / (self.maxv - self.minv)
+        return self.rect.x + int(rel * self.rect.w)
+
+    def draw(self, surf, font):
+        x,y,w,h = self.rect
+        line_y = y + h//2
+        pygame.draw.rect(surf, (50,50,50), (x, line_y-3, w, 6), border_radius=3)
+        hx = self.handle_x()
+        if self.glow:
+            for i,_ in enumerate([40,80,140]):
+                col = (100, 60+i*40, 200)
+                s = pygame.Surface((self.handle_radius*3, self.handle_radius*3), pygame.SRCALPHA)
+                pygame.draw.circle(s, col + (40 - i*10,), (self.handle_radius*1, self.handle_radius*1), self.handle_radius + (2-i))
+                surf.blit(s, (hx - self.handle_radius -1, line_y - self.handle_radius -1))
+        pygame.draw.circle(surf, (255,255,255), (hx, line_y), self.handle_radius)
+        lbl = font.render(f"{self.label}: {self.value:.0f}", True, (230,230,230))
+        surf.blit(lbl, (x, y - 22))
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            mx,my = event.pos
+            line_y = self.rect.y + self.rect.h//2
+            hx = self.handle_x()
+            on_handle = (mx-hx)**2 + (my-line_y)**2 <= (self.handle_radius+5)**2
+            if on_handle or self.rect.collidepoint(mx, my):
+                self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            mx,my = event.pos
+            x,y,w,h = self.rect
+            clamped = max(x, min(x+w, mx))
+            rel = (clamped - x) / w
+            self.value = self.minv + rel * (self.maxv - self.minv)
+
+
+# -------------------- Button --------------------
+class Button:
+    def __init__(self, x, y, w, h, text):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.text = text
+        self.color = (70, 70, 90)
+        self.hover_color = (100, 100, 120)
+
+    def draw(self, surf, font):
+        mouse_pos = pygame.mouse.get_pos()
+        col = self.hover_color if self.rect.collidepoint(mouse_pos) else self.color
+        pygame.draw.rect(surf, col, self.rect, border_radius=5)
+        pygame.draw.rect(surf, (200, 200, 200), self.rect, 2, border_radius=5)
+        txt_surf = font.render(self.text, True, (255, 255, 255))
+        txt_rect = txt_surf.get_rect(center=self.rect.center)
+        surf.blit(txt_surf, txt_rect)
+
+    def is_clicked(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.rect.collidepoint(event.pos):
+                return True
+        return False
+
+
+# -------------------- ScrubBar --------------------
+class ScrubBar:
+    # Barra de tiempo de la reproducción: clic o arrastre devuelven el tiempo pedido
+    def __init__(self, rect, duration, marks=()):
+        self.rect = pygame.Rect(rect)
+        self.duration = max(duration, 1e-9)
+        self.marks = marks          # tiempos de las instantáneas (saltos baratos)
+        self.dragging = False
+
+    def time_at(self, mx):
+        rel = (max(self.rect.x, min(self.rect.right, mx)) - self.rect.x) / self.rect.w
+        return rel * self.duration
+
+    def draw(self, surf, font, t, hour, paused=False):
+        x, y, w, h = self.rect
+        panel = pygame.Surface((w + 20, h + 34), pygame.SRCALPHA)
+        panel.fill((10, 10, 20, 170))
+        surf.blit(panel, (x - 10, y - 28))
+        pygame.draw.rect(surf, (50, 50, 60), self.rect, border_radius=3)
+        fill = int(w * min(1.0, t / self.duration))
+        pygame.draw.rect(surf, (120, 60, 220), (x, y, fill, h), border_radius=3)
+        for m in self.marks:
+            mx = x + int(w * m / self.duration)
+            pygame.draw.line(surf, (90, 90, 110), (mx, y + h), (mx, y + h + 3))
+        pygame.draw.circle(surf, (255, 255, 255), (x + fill, y + h // 2), h // 2 + 3)
+        state = "PAUSA" if paused else "PLAY"
+        txt = (f"{state}  t={t:7.2f}/{self.duration:.2f} s  hora {int(hour):02d}:{int(hour % 1 * 60):02d}"
+               "   Espacio: pausa  <-/->: 5 s  ,/.: paso  [/]: hora")
+        surf.blit(font.render(txt, True, (230, 230, 230)), (x, y - 24))
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and \
+                self.rect.inflate(0, 16).collidepoint(event.pos):
+            self.dragging = True
+            return self.time_at(event.pos[0])
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            return self.time_at(event.pos[0])
+        return None
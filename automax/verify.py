@@ -0,0 +1,261 @@
+"""
+Verificación exhaustiva de propiedades de seguridad de un FuzzyController
+- Propiedad: "salida < umbral" siempre que las entradas cumplan una caja de premisas
+  (p. ej. acelerador < 20 cuando distancia < 10).
+- Aritmética de intervalos sobre una caja de entradas: membresías (mín/máx exactos de la
+  función lineal por tramos), reglas (min/max/1-x), recortes y agregación por punto de la
+  malla de salida, y cota del centroide tipo Karnik-Mendel (el centroide es un cociente
+  lineal en la agregación: sus extremos están en configuraciones "L hasta k, U desde k").
+  Si alguna salida puede quedar sin reglas activas, el fallback entra en el rango.
+- Ramificación y poda: las cajas no decididas se parten por la dimensión más ancha; en
+  cada caja se evalúa el controlador real en centro y esquinas para buscar contraejemplos.
+- Resultado: demostrada / refutada (con contraejemplos) / indeterminada (cajas mínimas).
+"""
+
+import heapq
+import itertools
+import re
+import time
+
+import numpy as np
+
+_OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+_COND = re.compile(r"^\s*(\w+)\s*(<=|>=|<|>)\s*(-?[\d.]+)\s*$")
+_EPS = 1e-9
+
+
+def parse_condition(text):
+    # "distancia < 10" -> ("distancia", "<", 10.0)
+    m = _COND.match(text)
+    if not m:
+        raise ValueError(f"Condición inválida: '{text}' (se espera 'nombre < valor')")
+    return m.group(1), m.group(2), float(m.group(3))
+
+
+class IntervalModel:
+    # Cotas de las salidas de un CompiledRuleBase sobre lotes de cajas de entrada
+    def __init__(self, compiled, fallback):
+        self.compiled = compiled
+        self.fallback = fallback
+        self.input_names = compiled.input_names
+        self.output_names = compiled.output_names
+
+        # Mín/máx de cada membresía entre dos puntos de la malla (tabla de rangos)
+        self._terms = {}
+        for name, univ, terms in compiled.inputs:
+            for lbl, mf in terms.items():
+                mf = np.asarray(mf, dtype=float)
+                n = len(mf)
+                rmin = np.full((n + 1, n + 1), np.inf)
+                rmax = np.full((n + 1, n + 1), -np.inf)
+                for i in range(n):
+                    rmin[i, i + 1:] = np.minimum.accumulate(mf[i:])
+                    rmax[i, i + 1:] = np.maximum.accumulate(mf[i:])
+                self._terms[(name, lbl)] = (univ, mf, rmin, rmax)
+
+        # Coeficientes de área y momento del centroide por punto de la malla de salida
+        self._out = {}
+        for name in self.output_names:
+            xs, labels, mfs = compiled._out[name]
+            dx = np.diff(xs)
+            a = np.zeros(len(xs))
+            b = np.zeros(len(xs))
+            a[:-1] += dx / 2
+            a[1:] += dx / 2
+            b[:-1] += dx * (2 * xs[:-1] + xs[1:]) / 6
+            b[1:] += dx * (xs[:-1] + 2 * xs[1:]) / 6
+            order = np.argsort(b / a, kind="stable")
+            self._out[name] = (labels, mfs[:, order], a[order], b[order])
+
+    def _membership(self, key, lo, hi):
+        univ, mf, rmin, rmax = self._terms[key]
+        f_lo = np.interp(lo, univ, mf)
+        f_hi = np.interp(hi, univ, mf)
+        # Puntos de la malla estrictamente dentro de (lo, hi)
+        i0 = np.searchsorted(univ, lo, side="right")
+        i1 = np.searchsorted(univ, hi, side="left")
+        inner_min = np.where(i1 > i0, rmin[i0, np.maximum(i1, i0 + 1)], np.inf)
+        inner_max = np.where(i1 > i0, rmax[i0, np.maximum(i1, i0 + 1)], -np.inf)
+        return (np.minimum(np.minimum(f_lo, f_hi), inner_min),
+                np.maximum(np.maximum(f_lo, f_hi), inner_max))
+
+    def _antecedent(self, node, mu):
+        kind = node[0]
+        if kind == "term":
+            return mu[(node[1], node[2])]
+        if kind == "not":
+            lo, hi = self._antecedent(node[1], mu)
+            return 1.0 - hi, 1.0 - lo
+        (alo, ahi), (blo, bhi) = self._antecedent(node[1], mu), self._antecedent(node[2], mu)
+        f = np.fmin if kind == "and" else np.fmax
+        return f(alo, blo), f(ahi, bhi)
+
+    def bounds(self, lo, hi):
+        # lo/hi: (B, entradas) -> {salida: (mín, máx)} por caja
+        mu = {}
+        for i, (name, univ, terms) in enumerate(self.compiled.inputs):
+            a = np.clip(lo[:, i], univ[0], univ[-1])
+            b = np.clip(hi[:, i], univ[0], univ[-1])
+            for lbl in terms:
+                mu[(name, lbl)] = self._membership((name, lbl), a, b)
+
+        n = lo.shape[0]
+        cuts = {name: (np.zeros((n, len(self._out[name][0]))), np.zeros((n, len(self._out[name][0]))))
+                for name in self.output_names}
+        for antecedent, cons in self.compiled.rules:
+            act_lo, act_hi = self._antecedent(antecedent, mu)
+            for out, lbl, w in cons:
+                t = self._out[out][0].index(lbl)
+                c_lo, c_hi = cuts[out]
+                np.fmax(c_lo[:, t], act_lo * w, out=c_lo[:, t])
+                np.fmax(c_hi[:, t], act_hi * w, out=c_hi[:, t])
+
+        result = {}
+        maybe_empty = np.zeros(n, dtype=bool)
+        for name in self.output_names:
+            _, mfs, a, b = self._out[name]
+            L = np.minimum(cuts[name][0][:, :, None], mfs[None]).max(axis=1)
+            U = np.minimum(cuts[name][1][:, :, None], mfs[None]).max(axis=1)
+            maybe_empty |= ~(L > 0).any(axis=1)
+            result[name] = _centroid_range(L, U, a, b)
+        for name, (c_lo, c_hi) in result.items():
+            # Sin reglas activas en alguna salida -> todas valen fallback
+            c_lo = np.where(maybe_empty, np.fmin(c_lo, self.fallback), c_lo)
+            c_hi = np.where(maybe_empty, np.fmax(c_hi, self.fallback), c_hi)
+            result[name] = (c_lo, c_hi)
+        return result
+
+    def evaluate(self, X):
+        # Controlador real (con fallback) en los puntos X (n, entradas)
+        out, valid = self.compiled.evaluate(dict(zip(self.input_names, X.T)))
+        return {name: np.where(valid, out[name], self.fallback) for name in self.output_names}
+
+
+def _centroid_range(L, U, a, b):
+    # Extremos de (b·y)/(a·y) con L <= y <= U, puntos ya ordenados por b/a.
+    # máx: L en los k primeros y U en el resto; mín: U en los k primeros y L en el resto.
+    def sweep(first, rest):
+        A_first = np.concatenate([np.zeros((first.shape[0], 1)), np.cumsum(first * a, axis=1)], axis=1)
+        B_first = np.concatenate([np.zeros((first.shape[0], 1)), np.cumsum(first * b, axis=1)], axis=1)
+        A_rest = np.concatenate([np.cumsum((rest * a)[:, ::-1], axis=1)[:, ::-1],
+                                 np.zeros((rest.shape[0], 1))], axis=1)
+        B_rest = np.concatenate([np.cumsum((rest * b)[:, ::-1], axis=1)[:, ::-1],
+                                 np.zeros((rest.shape[0], 1))], axis=1)
+        area = A_first + A_rest
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(area > 0, (B_first + B_rest) / area, np.nan)
+
+    # Sin área (ninguna regla puede disparar): mín = +inf, máx = -inf; lo cubre el fallback
+    hi = sweep(L, U)
+    lo = sweep(U, L)
+    c_max = np.where(np.isnan(hi), -np.inf, hi).max(axis=1)
+    c_min = np.where(np.isnan(lo), np.inf, lo).min(axis=1)
+    return c_min, c_max
+
+
+class Result:
+    def __init__(self, status, counterexamples, undecided, boxes, elapsed):
+        self.status = status                    # "demostrada" | "refutada" | "indeterminada"
+        self.counterexamples = counterexamples  # [(entradas, salida)]
+        self.undecided = undecided              # [(lo, hi)] cajas mínimas sin decidir
+        self.boxes = boxes
+        self.elapsed = elapsed
+
+    def to_dict(self):
+        return {
+            "status": self.status,
+            "boxes": self.boxes,
+            "elapsed_s": round(self.elapsed, 3),
+            "counterexamples": [{"inputs": x, "output": y} for x, y in self.counterexamples],
+            "undecided": [{"lo": lo, "hi": hi} for lo, hi in self.undecided],
+        }
+
+
+def verify(controller, claim, premises=(), min_width=1e-3, max_boxes=200000, batch=256, max_counterexamples=5):
+    # claim: "acelerador < 20"; premises: ["distancia < 10", ...]; controller: FuzzyController
+    model = IntervalModel(controller.fast, controller.fallback)
+    out_name, op, thr = parse_condition(claim)
+    if out_name not in model.output_names:
+        raise ValueError(f"Salida desconocida: {out_name} (hay {model.output_names})")
+    holds = _OPS[op]
+
+    names = model.input_names
+    lo0 = np.array([univ[0] for _, univ, _ in controller.fast.inputs], dtype=float)
+    hi0 = np.array([univ[-1] for _, univ, _ in controller.fast.inputs], dtype=float)
+    span = hi0 - lo0
+    conds = []
+    for text in premises:
+        name, pop, value = parse_condition(text)
+        if name not in names:
+            raise ValueError(f"Entrada desconocida: {name} (hay {names})")
+        i = names.index(name)
+        conds.append((i, _OPS[pop], value))
+        if pop in ("<", "<="):
+            hi0[i] = min(hi0[i], value)
+        else:
+            lo0[i] = max(lo0[i], value)
+    if np.any(lo0 > hi0):
+        return Result("demostrada", [], [], 0, 0.0)   # premisa vacía
+
+    # Cola por prioridad: primero las cajas que más pueden violar la propiedad
+    t0 = time.perf_counter()
+    counter = itertools.count()
+    heap = [(0.0, next(counter), lo0, hi0)]
+    cex, undecided = [], []
+    boxes = 0
+    while heap and boxes < max_boxes and len(cex) < max_counterexamples:
+        items = [heapq.heappop(heap) for _ in range(min(batch, len(heap)))]
+        lo = np.stack([it[2] for it in items])
+        hi = np.stack([it[3] for it in items])
+        boxes += len(items)
+        b_lo, b_hi = model.bounds(lo, hi)[out_name]
+
+        # Propiedad garantizada en toda la caja
+        safe = holds(b_hi + _EPS, thr) if op in ("<", "<=") else holds(b_lo - _EPS, thr)
+
+        # Contraejemplos: centro y esquinas de las cajas dudosas
+        doubt = np.flatnonzero(~safe)
+        if len(doubt):
+            pts = _probe_points(lo[doubt], hi[doubt])
+            for i, cond, value in conds:   # premisas estrictas: la caja es cerrada
+                pts = pts[cond(pts[:, i], value)]
+            vals = model.evaluate(pts)[out_name]
+            bad = ~holds(vals, thr)
+            for p, v in zip(pts[bad], vals[bad]):
+                if len(cex) < max_counterexamples:
+                    cex.append(({n: float(x) for n, x in zip(names, p)}, float(v)))
+
+        for j in doubt:
+            width = (hi[j] - lo[j]) / np.where(span > 0, span, 1.0)
+            d = int(np.argmax(width))
+            if width[d] <= min_width:
+                undecided.append(([float(x) for x in lo[j]], [float(x) for x in hi[j]]))
+                continue
+            mid = 0.5 * (lo[j, d] + hi[j, d])
+            # Prioridad: cuánto podría exceder el umbral (más negativa = más sospechosa)
+            excess = (b_hi[j] - thr) if op in ("<", "<=") else (thr - b_lo[j])
+            left_hi = hi[j].copy()
+            left_hi[d] = mid
+            right_lo = lo[j].copy()
+            right_lo[d] = mid
+            heapq.heappush(heap, (-excess, next(counter), lo[j], left_hi))
+            heapq.heappush(heap, (-excess, next(counter), right_lo, hi[j]))
+
+    if cex:
+        status = "refutada"
+    elif heap or undecided:
+        status = "indeterminada"
+        undecided += [([float(x) for x in it[2]], [float(x) for x in it[3]]) for it in heap]
+    else:
+        status = "demostrada"
+    return Result(status, cex, undecided, boxes, time.perf_counter() - t0)
+
+
+def _probe_points(lo, hi):
+    # Centro + las 2^d esquinas de cada caja
+    d = lo.shape[1]
+    corners = np.array(list(itertools.product((0.0, 1.0), repeat=d)))
+    pts = [0.5 * (lo + hi)]
+    for c in corners:
+        pts.append(lo + c * (hi - lo))
+    return np.concatenate(pts)
@@ -0,0 +1,208 @@
+"""
+Clima y ciclo día/noche de AUTOMAX
+- RainToggleWeather: lluvia on/off con la tecla L (simulador.py / test.py).
+- WeatherCycle: despejado / lluvia / neblina / polvo con adherencia (simulator.py).
+Cada componente fija visibility, grip, rain_enabled, fog_* y headlights_on en la simulación.
+"""
+
+import random
+
+import numpy as np
+import pygame
+
+from . import config
+from .config import SCREEN_H, SCREEN_W
+from .ui import Button
+from .worker import get_async_logger
+
+log = get_async_logger()
+
+
+# -------- Día/Noche --------
+def day_night_visibility(daytime):
+    h = daytime % 24.0
+    if 7 <= h <= 19:
+        return 100.0  # día
+    elif 19 < h <= 22:
+        return max(30.0, 100.0 - (h - 19) * 20)  # atardecer 100→40 aprox
+    elif 22 < h or h < 6:
+        return 30.0   # noche profunda
+    elif 6 <= h < 7:
+        return 30.0 + (h - 6) * 70  # amanecer 30→100
+    return 100.0
+
+
+def day_night_visibility_batch(daytime):
+    # Versión vectorizada de day_night_visibility (entornos headless)
+    h = np.asarray(daytime, dtype=float) % 24.0
+    return np.select(
+        [(h >= 7) & (h <= 19), (h > 19) & (h <= 22), (h > 22) | (h < 6)],
+        [100.0, np.maximum(30.0, 100.0 - (h - 19) * 20), 30.0],
+        30.0 + (h - 6) * 70)
+
+
+def day_factor(daytime):
+    # 0 noche → 1 día, para el color del fondo
+    h = daytime % 24.0
+    if 7 <= h <= 19:
+        return 1.0                              # día
+    elif 19 < h <= 22:
+        return max(0.0, 1.0 - (h - 19) / 3.0)   # atardecer
+    elif 22 < h or h < 6:
+        return 0.0                              # noche
+    return h - 6                                # amanecer
+
+
+# -------- Lluvia (partículas) --------
+def update_rain_particles(sim, dt):
+    # Con config.RAIN_SHEET la lluvia es una textura del render: no hay gotas que simular
+    if not sim.rain_enabled or config.RAIN_SHEET:
+        sim.rain_particles = []
+        return
+    if random.random() < 0.8:
+        for _ in range(15):
+            x = random.randint(0, SCREEN_W)
+            y = random.randint(-50, -10)
+            l = random.randint(15, 25)
+            speed = random.randint(15, 20)
+            sim.rain_particles.append([x, y, l, speed])
+    new_rain = []
+    for p in sim.rain_particles:
+        p[1] += p[3]
+        if p[1] < SCREEN_H:
+            new_rain.append(p)
+    sim.rain_particles = new_rain
+
+
+# -------------------- Lluvia con tecla L --------------------
+class RainToggleWeather:
+    def __init__(self, hours_per_sec=0.25, rain_vis=40.0, rain_max_speed=50.0):
+        self.hours_per_sec = hours_per_sec
+        self.rain_vis = rain_vis
+        self.rain_max_speed = rain_max_speed
+
+    def setup(self, sim):
+        sim.visibility_before_rain = sim.slider_vis.value
+
+    def handle_event(self, sim, e):
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_l:
+            sim.rain_enabled = not sim.rain_enabled
+            if sim.rain_enabled:
+                sim.visibility_before_rain = sim.slider_vis.value
+            else:
+                sim.slider_vis.value = sim.visibility_before_rain
+            sim.audio.set_loop("rain", sim.rain_enabled)
+            log.info("Lluvia activada: %s", sim.rain_enabled)
+
+    def reset(self, sim):
+        sim.rain_enabled = False
+        sim.audio.set_loop("rain", False)
+
+    def update(self, sim, dt):
+        # Avanza ciclo día/noche
+        sim.daytime = (sim.daytime + dt * self.hours_per_sec) % 24.0
+        day_vis = day_night_visibility(sim.daytime)
+
+        # Visibilidad efectiva: mínimo entre slider y día/noche
+        effective_vis = min(sim.slider_vis.value, day_vis)
+
+        # Lluvia: fuerza límite adicional
+        if sim.rain_enabled:
+            effective_vis = min(effective_vis, self.rain_vis)
+            # Limitar velocidad en lluvia
+            if sim.speed > self.rain_max_speed:
+                sim.slider_speed.value = max(self.rain_max_speed, sim.speed - dt * 25.0)
+                sim.speed = sim.slider_speed.value
+
+        # Aplicar visibilidad y luces
+        sim.visibility = effective_vis
+        sim.headlights_on = sim.visibility < 60.0
+
+    def demo(self, sim):
+        if sim.rain_enabled:
+            sim.slider_vis.value = random.uniform(20, 60)
+        else:
+            sim.slider_vis.value = random.uniform(50, 100)
+
+
+# -------------------- Ciclo de climas con adherencia --------------------
+class WeatherCycle:
+    NAMES = ["DESPEJADO", "LLUVIA", "NEBLINA", "POLVO"]
+    # modo: (visibilidad máxima, adherencia, niebla, color niebla)
+    MODES = [
+        (100, 100, False, (200,200,200)),
+        (40, 40, False, (200,200,200)),     # Lluvia
+        (25, 90, True, (220,220,230)),      # Niebla
+        (50, 70, True, (160,120,50)),       # Polvo
+    ]
+
+    def __init__(self, hours_per_sec=0.24):
+        self.hours_per_sec = hours_per_sec
+        self.weather_names = self.NAMES
+
+    def setup(self, sim):
+        self.btn_time = Button(40, 320, 160, 40, "CAMBIAR HORA")
+        self.btn_weather = Button(220, 320, 180, 40, "CAMBIAR CLIMA")
+        self.buttons = [self.btn_time, self.btn_weather]
+        # Flags para ajuste de visibilidad en 00:00 y 12:00
+        self._night_applied = False
+        self._day_applied = False
+
+    def cycle(self, sim):
+        sim.weather_mode = (sim.weather_mode + 1) % len(self.MODES)
+        sim.audio.set_loop("rain", sim.weather_mode == 1)
+
+    def handle_event(self, sim, e):
+        if e.type == pygame.KEYDOWN and e.key in (pygame.K_c, pygame.K_w):
+            self.cycle(sim)
+
+        # Botón: cambiar hora manual (el fondo difumina automáticamente)
+        if self.btn_time.is_clicked(e):
+            sim.daytime = 0.0 if 6 <= sim.daytime <= 18 else 12.0
+            self._night_applied = False
+            self._day_applied = False
+
+        if self.btn_weather.is_clicked(e):
+            self.cycle(sim)
+
+    def reset(self, sim):
+        sim.weather_mode = 0
+        sim.audio.set_loop("rain", False)
+        self._night_applied = False
+        self._day_applied = False
+
+    def update(self, sim, dt):
+        sim.daytime = (sim.daytime + dt * self.hours_per_sec) % 24.0
+
+        # Forzar visibilidad en eventos de hora exacta
+        if (0.0 <= sim.daytime < 0.25) and not self._night_applied:
+            if not sim.slider_vis.dragging:
+                sim.slider_vis.value = 50.0
+            self._night_applied = True
+            self._day_applied = False
+        if (12.0 <= sim.daytime < 12.25) and not self._day_applied:
+            if not sim.slider_vis.dragging:
+                sim.slider_vis.value = 100.0
+            self._day_applied = True
+            self._night_applied = False
+
+        # Límites por clima
+        day_vis = day_night_visibility(sim.daytime)
+        target_vis, sim.grip, sim.fog_enabled, sim.fog_color = self.MODES[sim.weather_mode]
+        sim.rain_enabled = sim.weather_mode == 1
+        final_vis = min(sim.slider_vis.value, day_vis, target_vis)
+
+        # Retorno automático del slider de visibilidad
+        if sim.weather_mode == 0 and not sim.slider_vis.dragging:
+            if sim.slider_vis.value < day_vis:
+                sim.slider_vis.value += (day_vis - sim.slider_vis.value) * 0.05
+        elif not sim.slider_vis.dragging and sim.slider_vis.value > final_vis + 1:
+            sim.slider_vis.value += (final_vis - sim.slider_vis.value) * 0.1
+
+        sim.visibility = sim.slider_vis.value
+        sim.headlights_on = (sim.visibility < 60 or sim.weather_mode != 0
+                             or (sim.daytime < 6 or sim.daytime > 19))
+
+    def demo(self, sim):
+        if random.random() < 0.2:
+            self.cycle(sim)
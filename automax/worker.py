@@ -0,0 +1,111 @@
+"""
+Worker de física para AUTOMAX
+- El paso de simulación (velocidad, obstáculo, fuzzy, partículas) corre en un hilo aparte.
+- Cada paso publica un snapshot inmutable en un doble buffer.
+- El hilo principal de pygame solo procesa eventos y dibuja el último snapshot.
+- Logger asíncrono: los mensajes se escriben desde un hilo aparte, fuera del frame.
+- Un paso que falla se registra y se salta; si falla sin parar (max_failures pasos
+  seguidos) el hilo se detiene y avisa con on_fatal en lugar de morir en silencio.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+_log_listener = None
+
+
+# -------------------- Logging fuera del hilo de render --------------------
+def get_async_logger(name="automax"):
+    global _log_listener
+    logger = logging.getLogger(name)
+    if _log_listener is None:
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter("%(message)s"))
+        _log_listener = logging.handlers.QueueListener(log_queue, console)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)   # vaciar la cola al salir
+    return logger
+
+
+# -------------------- Doble buffer de snapshots --------------------
+class SnapshotBuffer:
+    def __init__(self, initial=None):
+        self._slots = [initial, initial]
+        self._front = 0
+        self._seq = 0
+
+    def publish(self, snap):
+        # Escribe en el slot trasero y luego voltea el índice (asignación atómica bajo el GIL)
+        back = 1 - self._front
+        self._slots[back] = snap
+        self._front = back
+        self._seq += 1
+
+    def latest(self):
+        return self._slots[self._front]
+
+    @property
+    def seq(self):
+        return self._seq
+
+
+# -------------------- Hilo de física a paso fijo --------------------
+class PhysicsWorker(threading.Thread):
+    def __init__(self, step, snapshot, buffer, lock, fps, on_fatal=None, max_failures=None):
+        super().__init__(name="automax-physics", daemon=True)
+        self.step = step            # step(dt): avanza la simulación
+        self.snapshot = snapshot    # snapshot(): estado inmutable para render
+        self.buffer = buffer
+        self.lock = lock            # compartido con handle_events()
+        self.dt = 1.0 / fps
+        self.on_fatal = on_fatal    # on_fatal(exc): el hilo se detuvo por errores seguidos
+        self.max_failures = max_failures or 2 * fps
+        self.failures = 0           # pasos fallidos seguidos
+        self.error = None           # última excepción
+        self._stop_evt = threading.Event()
+
+    def run(self):
+        log = get_async_logger()
+        next_t = time.perf_counter()
+        while not self._stop_evt.is_set():
+            try:
+                with self.lock:
+                    self.step(self.dt)
+                    snap = self.snapshot()
+            except Exception as e:
+                # Se registra la primera de cada racha; el render sigue con el último snapshot
+                if self.failures == 0:
+                    log.exception("Paso de física fallido; se reintenta en el siguiente")
+                self.failures += 1
+                self.error = e
+                if self.failures >= self.max_failures:
+                    log.error("Física detenida tras %d pasos fallidos seguidos: %s", self.failures, e)
+                    if self.on_fatal is not None:
+                        self.on_fatal(e)
+                    return
+            else:
+                if self.failures:
+                    log.warning("Física recuperada tras %d pasos fallidos", self.failures)
+                    self.failures = 0
+                self.buffer.publish(snap)
+
+            next_t += self.dt
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                self._stop_evt.wait(delay)
+            else:
+                # Vamos atrasados: no acumular deuda de pasos
+                next_t = time.perf_counter()
+
+    def stop(self):
+        self._stop_evt.set()
+        if self.is_alive():
+            self.join(timeout=1.0)
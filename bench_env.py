@@ -0,0 +1,56 @@
+"""
+Benchmark del entorno vectorizado de AUTOMAX (automax.env)
+- Pasos-entorno por minuto sin ventana (política aleatoria y FuzzyController).
+- Métricas de la política difusa de referencia frente a acciones aleatorias.
+
+Uso:
+    python bench_env.py --envs 4096 --steps 500
+    python bench_env.py --envs 1 --steps 600 --render    # ver el entorno 0
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from automax import FuzzyController
+from automax.config import rules_file
+from automax.env import FuzzyPolicy, VecDrivingEnv, evaluate_policy
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de VecDrivingEnv")
+    ap.add_argument("--envs", type=int, default=4096)
+    ap.add_argument("--steps", type=int, default=500)
+    ap.add_argument("--dt", type=float, default=0.1)
+    ap.add_argument("--render", action="store_true")
+    args = ap.parse_args()
+
+    env = VecDrivingEnv(args.envs, dt=args.dt, render_mode="human" if args.render else None)
+    rng = np.random.default_rng(0)
+    policies = {
+        "aleatoria": lambda obs: rng.uniform(0.0, 100.0, env.action_shape),
+        "fuzzy": FuzzyPolicy(FuzzyController(rules_file("simulator"))),
+    }
+    if args.render:
+        obs, _ = env.reset(seed=0)
+        for _ in range(args.steps):
+            obs, *_ = env.step(policies["fuzzy"](obs))
+            env.render()
+        env.close()
+        return
+
+    for name, policy in policies.items():
+        t = time.perf_counter()
+        stats = evaluate_policy(env, policy, steps=args.steps)
+        elapsed = time.perf_counter() - t
+        rate = stats["env_steps"] / elapsed * 60
+        print(f"{name:<10} {rate / 1e6:7.1f} M pasos/min  recompensa/paso {stats['reward_per_step']:+.4f}  "
+              f"choques/1k {stats['collisions_per_1k']:.3f}  frenadas fuertes/1k {stats['hard_brakes_per_1k']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
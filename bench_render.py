@@ -0,0 +1,150 @@
+"""
+Benchmark del render de AUTOMAX sin ventana
+- Tiempo por cuadro de draw() con las capas a pantalla completa activas (lluvia, niebla,
+  luces, rebase) para varias escalas internas (config.RENDER_SCALE); HUD siempre nativo.
+- Guarda una captura por escala en results/bench_render/ para comparar a ojo.
+- Al final, solo la lluvia: gota a gota (partículas de la simulación) frente a las capas
+  pre-dibujadas de RainSheet (config.RAIN_SHEET).
+- Y los trazos del carril y las barras Vis/Dist del clásico: por cuadro (una superficie por
+  trazo, degradados línea a línea) frente a DashStrip/BarAtlas (config.HUD_ATLAS).
+
+Uso:
+    python bench_render.py
+    python bench_render.py --script simulador --scales 1 0.75 0.5 --frames 300
+"""
+
+import argparse
+import importlib
+import os
+import random
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from automax import config
+from automax.config import RESULTS_DIR
+from automax.render import (DIST_GRADIENT, VIS_GRADIENT, BarAtlas, DashStrip, RainSheet, SceneCanvas,
+                            draw_rain_particles, gradient_fill, lane_dashes)
+from automax.weather import update_rain_particles
+
+
+def heavy_state(sim, script):
+    # Todas las capas a pantalla completa a la vez (el peor cuadro)
+    sim.daytime = 22.0
+    sim.rebase_dir = 1
+    if script == "simulator":
+        sim.weather.cycle(sim)      # lluvia
+        sim.weather.cycle(sim)      # niebla
+        sim.rain_enabled = True
+    else:
+        sim.rain_enabled = True
+
+
+def bench(sim, script, scale, frames, out_dir):
+    sim.renderer.canvas = SceneCanvas(scale, config.RENDER_SMOOTH)
+    sim.demo_mode = True
+    times = []
+    for i in range(frames):
+        sim.step(1.0 / config.FPS)
+        if i == 0:
+            heavy_state(sim, script)
+        sim.rebase_anim = 0.5
+        st = sim.snapshot()
+        t0 = time.perf_counter()
+        sim.renderer.draw(sim, st)
+        times.append(time.perf_counter() - t0)
+    pygame.image.save(sim.screen, os.path.join(out_dir, f"{script}_x{scale:g}.png"))
+    times.sort()
+    return sum(times) / len(times), times[len(times) // 2], times[int(len(times) * 0.95)]
+
+
+def bench_rain(sim, frames):
+    # Coste del dibujo de la lluvia con la población de gotas en régimen estable
+    c = SceneCanvas(1.0)
+    c.begin(sim.screen)
+    sheet = RainSheet()
+    sheet.sheets(c)
+    sim.rain_enabled = True
+    sim.rain_particles = []
+    use_sheet, config.RAIN_SHEET = config.RAIN_SHEET, False
+    drops = []
+    for _ in range(60):
+        update_rain_particles(sim, 1.0 / config.FPS)
+    t_drops = t_sheet = 0.0
+    for i in range(frames):
+        update_rain_particles(sim, 1.0 / config.FPS)
+        drops.append(len(sim.rain_particles))
+        st = sim.snapshot()
+        t0 = time.perf_counter()
+        draw_rain_particles(c, st)
+        t1 = time.perf_counter()
+        sheet.draw(c, st.time + i / config.FPS)
+        t_drops += t1 - t0
+        t_sheet += time.perf_counter() - t1
+    config.RAIN_SHEET = use_sheet
+    sim.rain_particles = []
+    print(f"lluvia: gota a gota {t_drops / frames * 1000:.3f} ms/cuadro ({sum(drops) / frames:.0f} gotas, "
+          f"una línea cada una); capas {t_sheet / frames * 1000:.3f} ms/cuadro "
+          f"({2 * len(RainSheet.LAYERS)} blits) -> {t_drops / t_sheet:.1f}x")
+
+
+def bench_road_hud(sim, frames):
+    # Trazos centrales y barras laterales con road_offset, velocidad y rellenos variando
+    c = SceneCanvas(1.0)
+    s = c.begin(sim.screen)
+    cx, hy, h = config.SCREEN_W // 2, 110, config.SCREEN_H
+    dashes = DashStrip(cx, hy, h)
+    bars = [BarAtlas(16, 120, VIS_GRADIENT), BarAtlas(16, 120, DIST_GRADIENT)]
+    for phase in range(130):
+        dashes.strip(c, phase)
+    t_old = t_new = 0.0
+    blits = 0
+    for i in range(frames):
+        offset = (i * 7.3) % 130
+        b = 180 + (i // 60) % 61      # el brillo sigue a la velocidad: cambia poco entre cuadros
+        fills = (i * 13) % 121, (i * 29) % 121
+        t0 = time.perf_counter()
+        for alpha, rect in lane_dashes(int(offset), cx, hy, h):
+            c.alpha_rect((b, b, 255, alpha), rect)
+            blits += 1
+        for k, colors in enumerate((VIS_GRADIENT, DIST_GRADIENT)):
+            s.blit(gradient_fill(16, fills[k], colors), (1100 + 40 * k, 400 + 120 - fills[k]))
+        t1 = time.perf_counter()
+        dashes.draw(c, offset, (b, b, 255))
+        for k, bar in enumerate(bars):
+            bar.draw(s, (1100 + 40 * k, 400), fills[k])
+        t_old += t1 - t0
+        t_new += time.perf_counter() - t1
+    print(f"carril + barras: por cuadro {t_old / frames * 1000:.3f} ms/cuadro "
+          f"({blits / frames + 2:.1f} superficies nuevas, degradados línea a línea); "
+          f"pre-dibujado {t_new / frames * 1000:.3f} ms/cuadro (3 blits) -> {t_old / t_new:.1f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tiempo por cuadro del render según la escala interna")
+    ap.add_argument("--script", choices=["simulador", "simulator", "test"], default="simulator")
+    ap.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.75, 0.5])
+    ap.add_argument("--frames", type=int, default=200)
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "bench_render"))
+    args = ap.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    random.seed(0)
+    sim = importlib.import_module(args.script).make_sim()
+    base = None
+    print(f"{args.script}: {args.frames} cuadros por escala")
+    for scale in args.scales:
+        mean, p50, p95 = bench(sim, args.script, scale, args.frames, args.out)
+        base = base or mean
+        print(f"  x{scale:<5g} media {mean * 1000:6.2f} ms  p50 {p50 * 1000:6.2f} ms  p95 {p95 * 1000:6.2f} ms  "
+              f"({base / mean:.2f}x, {1.0 / mean:.0f} FPS máx.)")
+    bench_rain(sim, args.frames)
+    bench_road_hud(sim, args.frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark del índice de activación de reglas de AUTOMAX (automax.rule_index)
+- Rule bases sintéticas en rejilla: k términos triangulares por entrada y k^3 reglas
+  (27 ... cientos), más las reglas reales de rules/.
+- Tiempo por llamada escalar (la del bucle de física) y por lote, con y sin índice,
+  en NumPy y en el kernel JIT; paridad con la evaluación densa.
+
+Uso:
+    python bench_rules.py
+    python bench_rules.py --terms 3 5 7 9 --calls 1000
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from automax import config
+from automax.config import rules_file
+from automax.jit import HAVE_NUMBA, attach
+from automax.rule_index import RuleIndex
+from automax.rulebase import compile_spec, load_spec
+
+INPUTS = ("velocidad", "distancia", "visibilidad")
+
+
+def grid_spec(k):
+    # k triángulos solapados por entrada; la salida sube con velocidad y baja con distancia/visibilidad
+    def terms(hi):
+        centers = np.linspace(0, hi, k)
+        w = centers[1] - centers[0]
+        return {f"t{i}": {"trimf": [float(c - w), float(c), float(c + w)]} for i, c in enumerate(centers)}
+
+    out_terms = {f"o{i}": {"trimf": [float(c - 12.5), float(c), float(c + 12.5)]}
+                 for i, c in enumerate(np.linspace(0, 100, 9))}
+    rules = []
+    for a in range(k):
+        for b in range(k):
+            for c in range(k):
+                level = int(round(8 * (a + (k - 1 - b) + (k - 1 - c)) / (3 * (k - 1))))
+                rules.append({"if": f"velocidad[t{a}] & distancia[t{b}] & visibilidad[t{c}]",
+                              "then": {"accion": f"o{level}"}})
+    return {
+        "inputs": {"velocidad": {"universe": [0, 120, 1], "terms": terms(120)},
+                   "distancia": {"universe": [0, 100, 1], "terms": terms(100)},
+                   "visibilidad": {"universe": [0, 100, 1], "terms": terms(100)}},
+        "outputs": {"accion": {"universe": [0, 100, 1], "terms": out_terms}},
+        "rules": rules,
+    }
+
+
+def per_call(fn, values, calls):
+    fn(values)
+    t = time.perf_counter()
+    for _ in range(calls):
+        fn(values)
+    return (time.perf_counter() - t) / calls * 1e6
+
+
+def bench(label, spec, calls, batch, rng):
+    config.JIT = False
+    compiled = compile_spec(spec)
+    index = compiled.index or RuleIndex(compiled)
+    names = compiled.input_names
+    univ = {name: u for name, u, _ in compiled.inputs}
+    one = {name: float(rng.uniform(univ[name][0], univ[name][-1])) for name in names}
+    many = {name: rng.uniform(univ[name][0], univ[name][-1], batch) for name in names}
+
+    # Referencia densa
+    compiled.index = None
+    ref, ref_ok = compiled.evaluate(many)
+    dense_1 = per_call(compiled.evaluate, one, calls)
+    dense_n = per_call(compiled.evaluate, many, max(1, calls // 100))
+    compiled.index = index
+    got, got_ok = compiled.evaluate(many)
+    sparse_1 = per_call(compiled.evaluate, one, calls)
+    sparse_n = per_call(compiled.evaluate, many, max(1, calls // 100))
+    diff = max(float(np.max(np.abs(ref[k] - got[k])[ref_ok], initial=0.0)) for k in ref)
+    same = bool(np.array_equal(ref_ok, got_ok))
+
+    line = (f"{label:12s} {len(compiled.rules):4d} reglas, candidatas {index.stats(many) * 100:5.1f}%  "
+            f"numpy escalar {dense_1:7.1f} -> {sparse_1:7.1f} us  lote {batch} {dense_n / 1000:6.1f} -> "
+            f"{sparse_n / 1000:6.1f} ms")
+    if HAVE_NUMBA:
+        compiled.index = None
+        dense_jit = per_call(attach(compiled).evaluate, one, calls)
+        compiled.index = index
+        jit_ref = attach(compiled)
+        sparse_jit = per_call(jit_ref.evaluate, one, calls)
+        got, got_ok = jit_ref.evaluate(many)
+        diff = max(diff, max(float(np.max(np.abs(ref[k] - got[k])[ref_ok], initial=0.0)) for k in ref))
+        same &= bool(np.array_equal(ref_ok, got_ok))
+        line += f"  jit escalar {dense_jit:6.1f} -> {sparse_jit:6.1f} us"
+    print(line + f"  máx diff {diff:.1e} {'OK' if same and diff < 1e-9 else 'FALLA'}")
+    return same and diff < 1e-9
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Índice de reglas: costo vs tamaño del rule base")
+    ap.add_argument("--terms", type=int, nargs="+", default=[3, 5, 7, 9])
+    ap.add_argument("--calls", type=int, default=1000)
+    ap.add_argument("--batch", type=int, default=2000)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    ok = True
+    for target in ("simulador", "simulator"):
+        ok &= bench(target, load_spec(rules_file(target)), args.calls, args.batch, rng)
+    for k in args.terms:
+        ok &= bench(f"rejilla k={k}", grid_spec(k), args.calls, args.batch, rng)
+    print("Paridad con evaluación densa:", "OK" if ok else "FALLA")
+
+
+if __name__ == "__main__":
+    main()
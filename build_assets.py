@@ -0,0 +1,178 @@
+"""
+Construcción del paquete de assets de AUTOMAX (automax.bundle -> assets/automax.bundle)
+- Decodifica una vez car.png/obstacle.png y los sonidos, y genera las texturas de
+  niebla/polvo del modo arcade; guarda todo ya listo en un único archivo.
+- Sprites al tamaño en que se dibujan: coche a car_w x car_h y el obstáculo en todos los
+  tamaños que producen los dos renderers (además del original, para otras escalas).
+- Sonidos en PCM con el formato del mixer; si al arrancar el mixer usa otro, se decodifica.
+- --check: abre el paquete, compara píxel a píxel y muestra a muestra con la decodificación
+  normal y mide el arranque de los assets por las dos vías.
+- Volver a ejecutarlo tras cambiar assets/ (el simulador avisa si el paquete quedó viejo).
+
+Uso:
+    python build_assets.py
+    python build_assets.py --check
+"""
+
+import argparse
+import importlib
+import os
+import random
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import numpy as np
+import pygame
+
+from automax import config
+from automax.audio import mixer_format
+from automax.bundle import BUNDLE_FILE, AssetBundle, pcm_entry, surface_entry, write_bundle
+from automax.config import ASSETS_DIR, SCREEN_H, SCREEN_W
+from automax.render import ArcadeRenderer
+from automax.sim import SOUNDS
+
+SCRIPTS = ("simulador", "simulator")
+
+
+def make_sims(seed):
+    # Simuladores con la carga de siempre (sin paquete), de donde salen los assets
+    config.ASSET_BUNDLE = False
+    random.seed(seed)
+    return {name: importlib.import_module(name).make_sim() for name in SCRIPTS}
+
+
+def obstacle_sizes(sims, steps=20001):
+    # Tamaños del obstáculo en pantalla en todo el rango visible (renderers a escala 1)
+    sizes = set()
+    for sim in sims.values():
+        for d in np.linspace(0.0, sim.traffic.horizon, steps):
+            sizes.add(sim.renderer.vehicle_rect(sim, float(d), 0).size)
+    return sorted(sizes)
+
+
+def sound_file(files):
+    for fname in files:
+        path = os.path.join(ASSETS_DIR, fname)
+        if os.path.exists(path):
+            return fname, path
+    return None, None
+
+
+def build(path, seed):
+    t0 = time.perf_counter()
+    sims = make_sims(seed)
+    classic, arcade = sims["simulador"], sims["simulator"]
+    entries = {}
+    sources = {}
+    if classic.car_sprite is not None:
+        entries["sprite/car"] = surface_entry(classic.car_sprite)
+        sources["car.png"] = os.path.join(ASSETS_DIR, "car.png")
+    if classic.bg_sprite is not None:
+        entries["sprite/background"] = surface_entry(classic.bg_sprite.convert_alpha())
+        sources["background.png"] = os.path.join(ASSETS_DIR, "background.png")
+    if classic.obst_sprite is not None:
+        entries["sprite/obstacle"] = surface_entry(classic.obst_sprite)
+        sources["obstacle.png"] = os.path.join(ASSETS_DIR, "obstacle.png")
+        for size in obstacle_sizes(sims):
+            entries[f"obstacle/{size[0]}x{size[1]}"] = surface_entry(
+                pygame.transform.smoothscale(classic.obst_sprite, size))
+    entries["texture/cloud"] = surface_entry(arcade.renderer.cloud_surf)
+    entries["texture/dust"] = surface_entry(arcade.renderer.dust_surf)
+
+    pygame.mixer.init()
+    fmt_tag = mixer_format()
+    for name, (files, _) in SOUNDS.items():
+        fname, p = sound_file(files)
+        if p is None:
+            print(f"  sin sonido '{name}' ({files})")
+            continue
+        entries[f"sound/{name}"] = pcm_entry(pygame.mixer.Sound(p).get_raw(), fmt_tag)
+        sources[fname] = p
+
+    params = {"screen": [SCREEN_W, SCREEN_H], "car": [classic.car_w, classic.car_h],
+              "mixer": fmt_tag, "seed": seed}
+    size = write_bundle(path, entries, sources, params)
+    n_obst = sum(1 for n in entries if n.startswith("obstacle/"))
+    print(f"{path}: {len(entries)} entradas ({n_obst} tamaños de obstáculo), {size / 2**20:.1f} MB, "
+          f"{time.perf_counter() - t0:.1f} s")
+
+
+# -------------------- Comprobación --------------------
+def same_pixels(a, b):
+    return a.get_size() == b.get_size() and pygame.image.tobytes(a, "RGBA") == pygame.image.tobytes(b, "RGBA")
+
+
+def time_decode(sim):
+    # Arranque de los assets sin paquete: PNG + smoothscale, MP3 -> PCM y texturas
+    t0 = time.perf_counter()
+    for f in ("car.png", "obstacle.png"):
+        surf = pygame.image.load(os.path.join(ASSETS_DIR, f)).convert_alpha()
+        if f == "car.png":
+            pygame.transform.smoothscale(surf, (sim.car_w, sim.car_h))
+    for files, _ in SOUNDS.values():
+        _, p = sound_file(files)
+        if p is not None:
+            pygame.mixer.Sound(p)
+    r = ArcadeRenderer()
+    for color, density in (((255, 255, 255), 200), ((160, 110, 50), 250)):
+        r.generate_cloud_texture((SCREEN_W + 200, SCREEN_H), color, density)
+    return time.perf_counter() - t0
+
+
+def time_bundle(path):
+    t0 = time.perf_counter()
+    bundle = AssetBundle(path)
+    surfs = [bundle.surface(n) for n in bundle.entries if bundle.entries[n]["kind"] == "surface"]
+    sounds = [pygame.mixer.Sound(buffer=bundle.pcm(n[6:], mixer_format())) for n in bundle.names("sound/")]
+    elapsed = time.perf_counter() - t0
+    del surfs, sounds
+    bundle.close()
+    return elapsed
+
+
+def check(path, seed):
+    sims = make_sims(seed)
+    classic, arcade = sims["simulador"], sims["simulator"]
+    pygame.mixer.init()
+    bundle = AssetBundle(path)
+    bad = []
+    pairs = [("sprite/car", classic.car_sprite), ("sprite/obstacle", classic.obst_sprite),
+             ("texture/cloud", arcade.renderer.cloud_surf), ("texture/dust", arcade.renderer.dust_surf)]
+    pairs += [(n, pygame.transform.smoothscale(classic.obst_sprite, bundle.surface(n).get_size()))
+              for n in bundle.names("obstacle/")]
+    for name, ref in pairs:
+        if ref is not None and not same_pixels(bundle.surface(name), ref):
+            bad.append(name)
+    for name, (files, _) in SOUNDS.items():
+        _, p = sound_file(files)
+        if p is not None and bytes(bundle.pcm(name, mixer_format())) != pygame.mixer.Sound(p).get_raw():
+            bad.append(f"sound/{name}")
+    stale = bundle.stale()
+    bundle.close()
+    print(f"{len(pairs)} superficies y {len(bundle.names('sound/'))} sonidos comparados: "
+          f"{'OK' if not bad else 'DIFERENTES: ' + ', '.join(bad)}"
+          f"{'; desactualizado: ' + ', '.join(stale) if stale else ''}")
+    t_dec = time_decode(classic)
+    t_bun = time_bundle(path)
+    mb = os.path.getsize(path) / 2**20
+    print(f"arranque de assets: decodificando {t_dec * 1000:.0f} ms; paquete {t_bun * 1000:.0f} ms "
+          f"({mb:.1f} MB, hash incluido, {mb / t_bun:.0f} MB/s) -> {t_dec / t_bun:.1f}x")
+    return not bad and not stale
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Paquete de assets pre-procesados")
+    ap.add_argument("--out", default=BUNDLE_FILE)
+    ap.add_argument("--seed", type=int, default=0, help="semilla de las texturas de niebla/polvo")
+    ap.add_argument("--check", action="store_true", help="comparar con la decodificación y medir el arranque")
+    args = ap.parse_args()
+    if args.check:
+        raise SystemExit(0 if check(args.out, args.seed) else 1)
+    build(args.out, args.seed)
+
+
+if __name__ == "__main__":
+    main()
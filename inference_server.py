@@ -0,0 +1,125 @@
+"""
+Servidor de inferencia difusa de AUTOMAX (automax.inference)
+- Un proceso por rule base y host; los simuladores lo usan con config.INFERENCE_ADDR.
+- Publica en el log las métricas de caudal y latencia cada --report segundos.
+- --bench N: lanza N procesos cliente que llaman en bucle (como N simuladores) y compara
+  con la evaluación local por llamada.
+
+Uso:
+    python inference_server.py --rules simulador --port 8770
+    python inference_server.py --rules simulator --bench 16 --calls 500
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from automax import FuzzyController
+from automax.config import rules_file
+from automax.inference import InferenceServer, RemoteController
+from automax.worker import get_async_logger
+
+log = get_async_logger()
+
+# Mismo fallback que los simuladores (simulador.py: 50 = mantener)
+FALLBACKS = {"simulador": 50.0, "simulator": 0.0}
+
+
+def _samples(controller, n, seed):
+    rng = np.random.default_rng(seed)
+    return [{name: float(rng.uniform(univ[0], univ[-1])) for name, univ, _ in controller.fast.inputs}
+            for _ in range(n)]
+
+
+def _client(address, calls, seed, start, out):
+    # Bajo carga de prueba (N clientes en pocos núcleos) se mide caudal, no se cae al fallback
+    remote = RemoteController(address, request_timeout_s=5.0)
+    local = FuzzyController(rules_file(remote.rules_path.removesuffix(".json")), remote.fallback)
+    values = _samples(local, calls, seed)
+    start.wait()
+    t0 = time.perf_counter()
+    worst = 0.0
+    for v in values:
+        got = remote.evaluate(v)
+        ref = local.evaluate(v)
+        worst = max(worst, max(abs(got[k] - ref[k]) for k in ref))
+    out.put((time.perf_counter() - t0, worst))
+    remote.close()
+
+
+def bench(server, address, n_clients, calls):
+    ctx = mp.get_context("spawn")
+    start = ctx.Event()
+    out = ctx.Queue()
+    procs = [ctx.Process(target=_client, args=(address, calls, i, start, out)) for i in range(n_clients)]
+    for p in procs:
+        p.start()
+    time.sleep(1.0 + 0.5 * n_clients)   # importaciones de los clientes
+    server.reset_metrics()
+    start.set()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    m = server.metrics()
+
+    # Referencia: la misma carga evaluada llamada a llamada en un solo proceso
+    values = _samples(server.controller, calls, 0)
+    t0 = time.perf_counter()
+    for v in values:
+        server.controller.evaluate(v)
+    local_per_call = (time.perf_counter() - t0) / calls
+
+    print(f"{n_clients} clientes x {calls} llamadas")
+    print(f"  servidor: {m['requests_per_s']:.0f} peticiones/s, lote medio {m['batch_size']['mean']:.1f}, "
+          f"latencia p50 {m['latency_ms']['p50']:.2f} ms / p95 {m['latency_ms']['p95']:.2f} ms "
+          f"(evaluación p50 {m['eval_ms']['p50']:.3f} ms)")
+    print(f"  cliente: ida y vuelta media {np.mean([r[0] for r in results]) / calls * 1000:.2f} ms, "
+          f"máx |remoto - local| = {max(r[1] for r in results):.2e}")
+    print(f"  local por llamada: {local_per_call * 1e6:.0f} us -> {1 / local_per_call:.0f} llamadas/s en un núcleo")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Servidor de inferencia difusa con micro-batching")
+    ap.add_argument("--rules", default="simulador", help="rules/<nombre>.json")
+    ap.add_argument("--fallback", type=float, default=None)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8770)
+    ap.add_argument("--wait-ms", type=float, default=2.0, help="ventana de agrupado")
+    ap.add_argument("--max-batch", type=int, default=4096)
+    ap.add_argument("--report", type=float, default=10.0, help="segundos entre reportes de métricas")
+    ap.add_argument("--bench", type=int, default=0, metavar="N", help="N clientes de prueba")
+    ap.add_argument("--calls", type=int, default=500)
+    args = ap.parse_args()
+
+    fallback = FALLBACKS.get(args.rules, 0.0) if args.fallback is None else args.fallback
+    controller = FuzzyController(rules_file(args.rules), fallback)
+    server = InferenceServer(controller, args.host, args.port, args.wait_ms / 1000, args.max_batch)
+    server.start()
+    address = f"{args.host}:{args.port}"
+    if args.bench:
+        bench(server, address, args.bench, args.calls)
+        server.stop()
+        return
+
+    watcher = controller.watcher()
+    watcher.start()
+    try:
+        while True:
+            time.sleep(args.report)
+            log.info("%s", json.dumps(server.metrics()))
+            server.reset_metrics()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
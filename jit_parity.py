@@ -0,0 +1,95 @@
+"""
+Prueba de paridad de los kernels compilados de AUTOMAX (automax.jit) contra NumPy
+- Inferencia: kernel vs CompiledRuleBase sobre muestras aleatorias (incluye fuera de universo).
+- Cinemática: classic_kinematics y advance_lane contra sus equivalentes NumPy.
+- Tiempos de la llamada escalar (la del bucle de física) con y sin kernel.
+Sin Numba los kernels corren como Python puro: la paridad se comprueba igual, los tiempos no aplican.
+
+Uso:
+    python jit_parity.py
+    python jit_parity.py --samples 5000 --tol 1e-9
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from automax import config
+from automax.config import rules_file
+from automax.jit import HAVE_NUMBA, JitEvaluator, advance_lane, check_parity, classic_kinematics, classic_kinematics_np
+from automax.rulebase import load_rulebase
+
+
+def kinematics_parity(n, seed=0):
+    rng = np.random.default_rng(seed)
+    args = [rng.uniform(0, 100, n), rng.uniform(0, 120, n), rng.uniform(0, 120, n),
+            rng.uniform(0, 100, n), rng.uniform(30, 90, n)]
+    a = [x.copy() for x in args] + [np.zeros(n, dtype=bool)]
+    b = [x.copy() for x in args] + [np.zeros(n, dtype=bool)]
+    for _ in range(50):
+        classic_kinematics(a[0], a[1], a[2], a[3], a[4], 0.1, 0.18, 5.0, 90.0, a[5])
+        classic_kinematics_np(b[0], b[1], b[2], b[3], b[4], 0.1, 0.18, 5.0, 90.0, b[5])
+    diff = max(float(np.max(np.abs(a[i] - b[i]))) for i in (2, 3))
+    return diff, bool(np.array_equal(a[5], b[5]))
+
+
+def traffic_parity(n, seed=0):
+    rng = np.random.default_rng(seed)
+    pos = np.sort(rng.uniform(-5, 400, n))
+    speed = rng.uniform(40, 80, n)
+    p1, s1 = pos.copy(), speed.copy()
+    p2, s2 = pos.copy(), speed.copy()
+    for _ in range(200):
+        advance_lane(p1, s1, 70.0, 1 / 60, 1.0, 10.0, 400.0)
+        p2 = p2 - (70.0 - s2) / 3.6 / 60
+        p2 = np.where(p2 < -10.0, p2 + 410.0, p2)
+        np.minimum(p2, 400.0, out=p2)
+        order = np.argsort(p2, kind="stable")
+        p2, s2 = p2[order], s2[order]
+    return float(np.max(np.abs(p1 - p2))), bool(np.array_equal(s1, s2))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Paridad kernels JIT vs NumPy")
+    ap.add_argument("--samples", type=int, default=2000 if HAVE_NUMBA else 300)
+    ap.add_argument("--tol", type=float, default=1e-9)
+    args = ap.parse_args()
+
+    print(f"Numba: {'sí' if HAVE_NUMBA else 'no (kernels en Python puro)'}")
+    ok = True
+    for target in ("simulador", "simulator"):
+        config.JIT = False
+        compiled = load_rulebase(rules_file(target))
+        diff, same_valid = check_parity(compiled, n=args.samples)
+        good = same_valid and all(d <= args.tol for d in diff.values())
+        ok &= good
+        print(f"{target}: máx |kernel - numpy| = {diff}, validez igual: {same_valid}  {'OK' if good else 'FALLA'}")
+
+        if HAVE_NUMBA:
+            kernel = JitEvaluator(compiled)
+            one = {name: float(univ[len(univ) // 3]) for name, univ, _ in compiled.inputs}
+            kernel.evaluate(one)   # compila
+            for label, fn in (("numpy", compiled.evaluate), ("jit", kernel.evaluate)):
+                t = time.perf_counter()
+                for _ in range(2000):
+                    fn(one)
+                print(f"  escalar {label}: {(time.perf_counter() - t) / 2000 * 1e6:.1f} us")
+
+    diff, same_hit = kinematics_parity(500)
+    good = same_hit and diff <= args.tol
+    ok &= good
+    print(f"classic_kinematics: máx diff {diff:.2e}, rebases iguales: {same_hit}  {'OK' if good else 'FALLA'}")
+    diff, same_speed = traffic_parity(300)
+    good = same_speed and diff <= args.tol
+    ok &= good
+    print(f"advance_lane: máx diff {diff:.2e}, orden igual: {same_speed}  {'OK' if good else 'FALLA'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
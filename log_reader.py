@@ -0,0 +1,100 @@
+"""
+Lector de logs delta de AUTOMAX (automax.datalog, config.LOG_MODE = "delta")
+- Reconstruye la serie a frecuencia completa de un .dlog y la exporta a CSV.
+- --record S: graba S segundos en modo demo sin ventana, codifica el log completo en
+  delta y compara tamaño, error por canal y eventos de action_text.
+
+Uso:
+    python log_reader.py results/log_20250101_120000.dlog --csv full.csv
+    python log_reader.py --record 120 --script simulator
+"""
+
+import argparse
+import importlib
+import io
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pandas as pd
+
+from automax.datalog import DeltaLog, read_delta_log
+
+
+def summary(df):
+    span = df["time"].iloc[-1] - df["time"].iloc[0] if len(df) else 0.0
+    print(f"{len(df)} fotogramas, {span:.1f} s, columnas: {', '.join(df.columns)}")
+
+
+def record(script, seconds, dt):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    sim = importlib.import_module(script).make_sim()
+    sim.log = []
+    sim.demo_mode = True
+    for _ in range(int(round(seconds / dt))):
+        sim.step(dt)
+    return sim.log
+
+
+def compare(rows, path):
+    # Mismo flujo de filas en modo completo (CSV) y en modo delta
+    full = pd.DataFrame(rows)
+    buf = io.StringIO()
+    full.to_csv(buf, index=False)
+    dlog = DeltaLog()
+    for row in rows:
+        dlog.append(row)
+    dlog.save(path)
+    csv_bytes, dlog_bytes = len(buf.getvalue().encode()), os.path.getsize(path)
+    print(f"Filas: {len(rows)} -> {len(dlog.records)} registros; "
+          f"CSV {csv_bytes / 1024:.1f} KB -> dlog {dlog_bytes / 1024:.1f} KB (x{csv_bytes / dlog_bytes:.1f})")
+
+    back = read_delta_log(path)
+    ok = len(back) == len(full)
+    for col in full.columns:
+        if col == "time":
+            continue
+        if full[col].dtype.kind in "if":
+            err = float(np.max(np.abs(back[col].to_numpy(float) - full[col].to_numpy(float))))
+            tol = dlog.tolerances.get(col, 0.0)
+            ok &= err <= tol + 1e-6
+            print(f"  {col:14s} error máx {err:.4f} (tolerancia {tol:g})")
+        else:
+            same = bool((back[col] == full[col]).all())
+            ok &= same
+            print(f"  {col:14s} {'idéntico' if same else 'DIFERENTE'}")
+    events = np.flatnonzero(full["action_text"].to_numpy()[1:] != full["action_text"].to_numpy()[:-1])
+    print(f"Cambios de acción: {len(events)}, todos en su fotograma: {'OK' if ok else 'FALLA'}")
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Lectura y comprobación de logs delta")
+    ap.add_argument("log", nargs="?", help="archivo .dlog")
+    ap.add_argument("--csv", default=None, help="exporta la serie reconstruida a CSV")
+    ap.add_argument("--sparse", action="store_true", help="solo los registros (sin rellenar fotogramas)")
+    ap.add_argument("--record", type=float, default=None, metavar="S")
+    ap.add_argument("--script", choices=["simulador", "simulator", "test"], default="simulator")
+    ap.add_argument("--dt", type=float, default=1.0 / 60)
+    args = ap.parse_args()
+
+    if args.record:
+        rows = record(args.script, args.record, args.dt)
+        from automax.config import RESULTS_DIR
+
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        raise SystemExit(0 if compare(rows, os.path.join(RESULTS_DIR, f"log_{args.script}.dlog")) else 1)
+    if not args.log:
+        ap.error("falta el archivo .dlog (o --record)")
+
+    df = read_delta_log(args.log, full_rate=not args.sparse)
+    summary(df)
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+        print(f"Saved {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
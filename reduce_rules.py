@@ -0,0 +1,102 @@
+"""
+Reducción de las reglas de los FuzzyController de AUTOMAX (automax.reduce)
+- Detecta reglas redundantes (su corte nunca supera al de otra regla con el mismo
+  consecuente) y antecedentes subsumidos por otra regla.
+- --tol > 0 quita además reglas cuyo efecto en la salida defuzzificada es menor que tol.
+- Comprueba la base reducida contra la original en una malla densa desplazada (lote en
+  varios procesos) y guarda el rule base mínimo en results/reduced/<target>.json.
+- Código de salida 0 si la base reducida es equivalente dentro de la tolerancia.
+
+Uso:
+    python reduce_rules.py simulador
+    python reduce_rules.py simulator --tol 0.5 --points 2000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from automax.config import RESULTS_DIR, rules_file
+from automax.reduce import activations, dense_grid, prune_by_output, redundant_rules, subsumptions
+from automax.rulebase import compile_spec, load_spec
+from automax.sensitivity import evaluate_parallel
+
+FALLBACK = {"simulador": 50.0, "simulator": 0.0}
+OUT_DIR = os.path.join(RESULTS_DIR, "reduced")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Reducción y verificación de un rule base difuso")
+    ap.add_argument("target", choices=["simulador", "simulator"])
+    ap.add_argument("--rules", default=None, help="archivo de reglas (por defecto rules/<target>.json)")
+    ap.add_argument("--tol", type=float, default=0.0, help="poda por salida (0 = solo redundancia exacta)")
+    ap.add_argument("--points", type=int, default=250000, help="puntos de la malla de análisis")
+    ap.add_argument("--check-points", type=int, default=1000000, help="puntos de la malla de comprobación")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", default=OUT_DIR)
+    args = ap.parse_args()
+
+    path = args.rules or rules_file(args.target)
+    spec = load_spec(path)
+    compiled = compile_spec(spec)
+    texts = [r["if"] for r in spec["rules"]]
+
+    def show(r):
+        then = ", ".join(f"{o}[{lbl}]" + (f"*{w:g}" if w != 1 else "") for o, lbl, w in compiled.rules[r][1])
+        return f"R{r}: {texts[r]} -> {then}"
+
+    # Análisis en una malla regular (incluye los extremos de los universos)
+    t0 = time.perf_counter()
+    X = dense_grid(compiled, args.points)
+    acts = activations(compiled, X)
+    pairs = subsumptions(compiled, acts)
+    removed = redundant_rules(compiled, acts)
+    print(f"{args.target}: {len(compiled.rules)} reglas, malla de {len(X)} puntos "
+          f"({time.perf_counter() - t0:.2f} s)")
+
+    dead = np.flatnonzero(acts.max(axis=1) <= 0)
+    for r in dead:
+        print("  nunca se activa:", show(r))
+    for a, b, same in pairs:
+        kind = "subsumida por" if same else "solapada con (otro consecuente)"
+        print(f"  {show(a)}\n      {kind} {show(b)}")
+    for r in removed:
+        print("  redundante:", show(r))
+
+    keep = [r for r in range(len(compiled.rules)) if r not in removed]
+    if args.tol > 0:
+        extra = prune_by_output(compiled, X, keep, args.tol, FALLBACK[args.target])
+        for r in extra:
+            print(f"  efecto < {args.tol:g}:", show(r))
+        keep = [r for r in keep if r not in extra]
+
+    reduced = dict(spec, rules=[spec["rules"][r] for r in keep])
+    os.makedirs(args.out, exist_ok=True)
+    fname = os.path.join(args.out, f"{args.target}.json")
+    with open(fname, "w", encoding="utf-8") as f:
+        json.dump(reduced, f, indent=2, ensure_ascii=False)
+
+    # Comprobación en otra malla (desplazada medio paso, más densa) con el controlador completo
+    Xc = np.concatenate([dense_grid(compiled, args.check_points, offset=0.5),
+                         dense_grid(compiled, args.check_points // 8)])
+    t0 = time.perf_counter()
+    ref = evaluate_parallel(path, FALLBACK[args.target], Xc, args.workers)
+    got = evaluate_parallel(fname, FALLBACK[args.target], Xc, args.workers)
+    diff = np.abs(got - ref).max(axis=0)
+    ok = bool(np.all(diff <= max(args.tol, 1e-9)))
+    print(f"Reglas: {len(compiled.rules)} -> {len(keep)}. Comprobación en {len(Xc)} puntos "
+          f"({time.perf_counter() - t0:.1f} s): "
+          + ", ".join(f"max |Δ{o}| = {d:.2e}" for o, d in zip(compiled.output_names, diff))
+          + (" OK" if ok else " FALLA"))
+    print(f"Saved {fname}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Render de una grabación de AUTOMAX a PNG numerados (automax.offline)
+- Sin ventana y sin tiempo real: los tramos de la línea de tiempo se reparten entre
+  procesos y cada uno dibuja con los mismos renderers que el simulador.
+- --fps elige la cadencia de salida (60 = todos los pasos); --start/--end en segundos
+  de sesión.
+- La secuencia sirve tal cual para ffmpeg:
+    ffmpeg -framerate 30 -i results/frames/frame_%06d.png -pix_fmt yuv420p incidente.mp4
+
+Uso:
+    python render_frames.py results/rec_20250101_120000 --start 1800 --end 1830 --fps 30
+    python render_frames.py results/rec_20250101_120000 --workers 8 --out results/incidente
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from automax.config import FPS, RESULTS_DIR
+from automax.offline import render_recording
+from automax.recording import Recording
+
+SCRIPTS = {"ClassicPhysics": "simulador", "ArcadePhysics": "simulator"}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Render offline de una grabación a PNG")
+    ap.add_argument("recording", help="directorio results/rec_*")
+    ap.add_argument("--start", type=float, default=0.0, help="s de sesión")
+    ap.add_argument("--end", type=float, default=None, help="s de sesión (por defecto, el final)")
+    ap.add_argument("--fps", type=float, default=FPS, help="imágenes por segundo de sesión")
+    ap.add_argument("--script", choices=["simulador", "simulator", "test"], default=None)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--per-task", type=int, default=120, help="imágenes por tramo")
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "frames"))
+    args = ap.parse_args()
+
+    rec = Recording(args.recording)
+    script = args.script or SCRIPTS[rec.meta["physics"]]
+    start = rec.frame_at(args.start)
+    end = rec.frame_at(args.end) + 1 if args.end is not None else len(rec)
+    step_dt = float(rec.frames["dt"][start]) if len(rec) else 1.0 / FPS
+    stride = max(1, int(round(1.0 / (args.fps * step_dt))))
+    total = len(range(start, end, stride))
+    rec.close()
+
+    print(f"{script}: pasos {start}..{end - 1} cada {stride} -> {total} imágenes en {args.out}")
+    t0 = time.perf_counter()
+    done = 0
+    for names in render_recording(args.recording, args.out, script, start, end, stride,
+                                  args.workers, args.per_task):
+        done += len(names)
+        elapsed = time.perf_counter() - t0
+        print(f"  {done}/{total} ({done / elapsed:.1f} img/s)", end="\r", flush=True)
+    elapsed = time.perf_counter() - t0
+    print(f"\n{done} imágenes en {elapsed:.1f} s ({done / max(elapsed, 1e-9):.1f} img/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Reproducción de sesiones grabadas de AUTOMAX (config.RECORD = True, automax.recording)
+- Abre la grabación con mmap y salta a cualquier tiempo u hora sin cargarla entera:
+  índice disperso + instantánea anterior + re-simulación con los eventos grabados.
+- Barra de tiempo en el HUD: clic/arrastre para saltar; Espacio pausa, <-/-> 5 s
+  (Mayús: 60 s), ,/. un paso, [/] hora anterior/siguiente, Esc sale.
+- --check: graba S segundos sin ventana con eventos sintéticos y comprueba que los
+  saltos en orden aleatorio reproducen exactamente el estado de cada paso.
+
+Uso:
+    python replay.py results/rec_20250101_120000 --seek 1830
+    python replay.py results/rec_20250101_120000 --hour 21.5
+    python replay.py --check 60 --script simulator
+"""
+
+import argparse
+import importlib
+import os
+import random
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from automax.config import FPS, SCREEN_H, SCREEN_W
+from automax.recording import Player, Recorder, Recording
+from automax.ui import ScrubBar
+
+SCRIPTS = {"ClassicPhysics": "simulador", "ArcadePhysics": "simulator"}
+
+
+def make_sim(script):
+    sim = importlib.import_module(script).make_sim()
+    sim.recorder = None
+    return sim
+
+
+def play(sim, rec, player, start):
+    player.seek(start)
+    bar = ScrubBar((40, SCREEN_H - 30, SCREEN_W - 80, 10), rec.duration,
+                   marks=[float(t) for t in rec.keyframes["time"]])
+    font = pygame.font.SysFont("Arial", 16)
+    clock = pygame.time.Clock()
+    paused = False
+    frame = start
+    while True:
+        clock.tick(FPS)
+        target = None
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT or (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE):
+                return
+            t = bar.handle_event(e)
+            if t is not None:
+                target = rec.frame_at(t)
+            if e.type == pygame.KEYDOWN:
+                step = 60.0 if e.mod & pygame.KMOD_SHIFT else 5.0
+                now = float(rec.frames["time"][max(frame, 0)])
+                if e.key == pygame.K_SPACE:
+                    paused = not paused
+                elif e.key == pygame.K_RIGHT:
+                    target = rec.frame_at(now + step)
+                elif e.key == pygame.K_LEFT:
+                    target = rec.frame_at(now - step)
+                elif e.key == pygame.K_PERIOD:
+                    target = frame + 1
+                elif e.key == pygame.K_COMMA:
+                    target = frame - 1
+                elif e.key in (pygame.K_RIGHTBRACKET, pygame.K_LEFTBRACKET):
+                    hour = int(sim.daytime) + (1 if e.key == pygame.K_RIGHTBRACKET else -1)
+                    target = player.seek_hour(hour % 24)
+        if target is not None:
+            frame = player.seek(target)
+        elif not paused and frame < len(rec) - 1:
+            frame = player.seek(frame + 1)
+
+        sim.renderer.draw(sim, sim.snapshot())
+        bar.draw(sim.screen, font, float(rec.frames["time"][max(frame, 0)]), sim.daytime, paused)
+        pygame.display.flip()
+
+
+# -------------------- Comprobación sin ventana --------------------
+def synthetic_events(sim, rng):
+    # Arrastres de sliders, teclas del clima y del modo demo
+    s = sim.slider_speed.rect
+    y = s.y + s.h // 2
+    x0, x1 = rng.randint(s.x, s.right), rng.randint(s.x, s.right)
+    drag = [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(x0, y))]
+    drag += [pygame.event.Event(pygame.MOUSEMOTION, pos=(x0 + (x1 - x0) * k // 4, y), buttons=(1, 0, 0))
+             for k in range(1, 5)]
+    drag.append(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=(x1, y)))
+    keys = [pygame.event.Event(pygame.KEYDOWN, key=k, mod=0)
+            for k in (pygame.K_SPACE, pygame.K_l, pygame.K_c, pygame.K_r)]
+    return drag if rng.random() < 0.6 else [rng.choice(keys)]
+
+
+def check(script, seconds, dt, seeks, seed=0):
+    rng = random.Random(seed)
+    sim = make_sim(script)
+    sim.recorder = Recorder()
+    sim.recorder.start(sim)
+    sim.demo_mode = True
+    steps = int(round(seconds / dt))
+    truth = {}
+    queued = []
+    for i in range(steps):
+        if not queued and rng.random() < 0.02:
+            queued = synthetic_events(sim, rng)
+        if queued:
+            sim.handle_event(queued.pop(0))
+        sim.step(dt)
+        truth[i] = sim.snapshot()
+    sim.recorder.close()
+    path = sim.recorder.path
+
+    rec = Recording(path)
+    print(f"{script}: {len(rec)} pasos, {len(rec.events)} eventos, {len(rec.keyframes)} instantáneas "
+          f"({sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 1024:.0f} KB) -> {path}")
+    player = Player(make_sim(script), rec)
+    frames = [rng.randrange(steps) for _ in range(seeks)] + [steps - 1, 0]
+    bad = 0
+    t0 = time.perf_counter()
+    for f in frames:
+        t = float(rec.frames["time"][f])
+        assert rec.frame_at(t) == f
+        player.seek(f)
+        if player.sim.snapshot() != truth[f]:
+            bad += 1
+            print(f"  paso {f} (t={t:.3f} s): DIFERENTE")
+    elapsed = time.perf_counter() - t0
+    hour = float(rec.frames["hour"][steps // 2])
+    hf = rec.frame_at_hour(hour)
+    print(f"{len(frames)} saltos en {elapsed:.2f} s ({elapsed / len(frames) * 1000:.1f} ms/salto); "
+          f"hora {hour:.2f} -> paso {hf}; {'OK' if bad == 0 else f'{bad} DIFERENTES'}")
+    rec.close()
+    return bad == 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Reproducción con salto a tiempo/hora")
+    ap.add_argument("recording", nargs="?", help="directorio results/rec_*")
+    ap.add_argument("--seek", type=float, default=0.0, help="tiempo de sesión inicial (s)")
+    ap.add_argument("--hour", type=float, default=None, help="primera vez que el reloj marca esta hora")
+    ap.add_argument("--script", choices=["simulador", "simulator", "test"], default=None)
+    ap.add_argument("--check", type=float, default=None, metavar="S")
+    ap.add_argument("--seeks", type=int, default=40)
+    ap.add_argument("--dt", type=float, default=1.0 / FPS)
+    args = ap.parse_args()
+
+    if args.check:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        raise SystemExit(0 if check(args.script or "simulador", args.check, args.dt, args.seeks) else 1)
+    if not args.recording:
+        ap.error("falta el directorio de la grabación (o --check)")
+
+    rec = Recording(args.recording)
+    sim = make_sim(args.script or SCRIPTS[rec.meta["physics"]])
+    player = Player(sim, rec)
+    start = rec.frame_at_hour(args.hour) if args.hour is not None else rec.frame_at(args.seek)
+    play(sim, rec, player, start)
+    rec.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
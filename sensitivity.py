@@ -0,0 +1,90 @@
+"""
+Sensibilidad global (Sobol / Morris) de los FuzzyController de AUTOMAX (automax.sensitivity)
+- simulador: accion vs velocidad / distancia / visibilidad.
+- simulator: freno / acelerador / claxon vs velocidad / distancia / visibilidad / adherencia.
+- Cientos de miles de evaluaciones en lote repartidas entre procesos; convergencia por
+  prefijos de la secuencia e intervalos bootstrap.
+- Guarda un JSON en results/sensitivity/.
+
+Uso:
+    python sensitivity.py simulador
+    python sensitivity.py simulator --n 65536 --morris 200 --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from automax.config import RESULTS_DIR, rules_file
+from automax.rulebase import load_rulebase
+from automax.sensitivity import (evaluate_parallel, morris_analysis, morris_samples, saltelli_samples,
+                                 sobol_analysis)
+
+FALLBACK = {"simulador": 50.0, "simulator": 0.0}
+OUT_DIR = os.path.join(RESULTS_DIR, "sensitivity")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Índices de Sobol y Morris de un controlador difuso")
+    ap.add_argument("target", choices=["simulador", "simulator"])
+    ap.add_argument("--rules", default=None, help="archivo de reglas (por defecto rules/<target>.json)")
+    ap.add_argument("--n", type=int, default=32768, help="muestras base de Sobol (potencia de 2)")
+    ap.add_argument("--morris", type=int, default=100, help="trayectorias de Morris (0 = sin Morris)")
+    ap.add_argument("--levels", type=int, default=8)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=OUT_DIR)
+    args = ap.parse_args()
+
+    rules = args.rules or rules_file(args.target)
+    compiled = load_rulebase(rules)
+    names = compiled.input_names
+    outputs = compiled.output_names
+    bounds = np.array([[univ[0], univ[-1]] for _, univ, _ in compiled.inputs])
+    d = len(names)
+    n = 1 << max(4, int(np.ceil(np.log2(args.n))))
+
+    # Sobol: A, B y A_B^i en un solo lote
+    X = saltelli_samples(bounds, n, args.seed)
+    t0 = time.perf_counter()
+    Y = evaluate_parallel(rules, FALLBACK[args.target], X, args.workers)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.target}: {len(X)} evaluaciones en {elapsed:.1f} s ({len(X) / elapsed:.0f}/s)")
+
+    report = {"target": args.target, "rules": rules, "inputs": names, "n": n,
+              "evaluations": len(X), "seconds": elapsed, "sobol": {}, "morris": {}}
+    for o, out in enumerate(outputs):
+        res = sobol_analysis(Y[:, o], n, d, seed=args.seed)
+        report["sobol"][out] = res
+        print(f"\n[{out}] Sobol (N={n}, ±IC95)")
+        print(f"  {'entrada':12s} {'S1':>16s} {'ST':>16s}")
+        for i, name in enumerate(names):
+            print(f"  {name:12s} {res['S1'][i]:7.3f} ±{res['S1_ci95'][i]:6.3f}  "
+                  f"{res['ST'][i]:7.3f} ±{res['ST_ci95'][i]:6.3f}")
+        print("  convergencia ST: " + "  ".join(
+            f"N={c['n']}: " + "/".join(f"{v:.3f}" for v in c["ST"]) for c in res["convergence"]))
+
+    if args.morris:
+        Xm, delta = morris_samples(bounds, args.morris, args.levels, args.seed)
+        Ym = evaluate_parallel(rules, FALLBACK[args.target], Xm, args.workers)
+        for o, out in enumerate(outputs):
+            res = morris_analysis(Xm, Ym[:, o], args.morris, d, bounds, delta)
+            report["morris"][out] = res
+            print(f"\n[{out}] Morris (r={args.morris}, p={args.levels}): "
+                  + "  ".join(f"{name} mu*={res['mu_star'][i]:.1f} sigma={res['sigma'][i]:.1f}"
+                              for i, name in enumerate(names)))
+
+    os.makedirs(args.out, exist_ok=True)
+    fname = os.path.join(args.out, f"{args.target}_sensitivity.json")
+    with open(fname, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {fname}")
+
+
+if __name__ == "__main__":
+    main()
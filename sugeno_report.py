@@ -0,0 +1,57 @@
+"""
+Reporte Mamdani vs Takagi-Sugeno para los FuzzyController de AUTOMAX
+- Ajusta el TSK de primer orden a la superficie Mamdani (automax.sugeno).
+- Error (MAE / RMSE / p95 / máx) sobre muestras aleatorias y aceleración
+  en llamada escalar (la del bucle de física) y por lote.
+
+Uso:
+    python sugeno_report.py simulador
+    python sugeno_report.py simulator --samples 50000
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from automax import FuzzyController
+from automax.config import RESULTS_DIR, rules_file
+from automax.sugeno import SugenoController, compare
+
+FALLBACK = {"simulador": 50.0, "simulator": 0.0}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compara el controlador Mamdani con su aproximación Sugeno")
+    ap.add_argument("target", choices=sorted(FALLBACK))
+    ap.add_argument("--samples", type=int, default=20000, help="muestras aleatorias para el error")
+    ap.add_argument("--fit-samples", type=int, default=20000, help="puntos de la malla de ajuste")
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "sugeno"))
+    args = ap.parse_args()
+
+    mamdani = FuzzyController(rules_file(args.target), FALLBACK[args.target])
+    t = time.perf_counter()
+    sugeno = SugenoController(mamdani, max_samples=args.fit_samples)
+    fit_s = time.perf_counter() - t
+    report = compare(mamdani, sugeno, n=args.samples)
+    report["fit_s"] = fit_s
+
+    print(f"{args.target}: ajuste TSK en {fit_s:.2f}s, {report['samples']} muestras de validación")
+    print(f"{'salida':<12}{'MAE':>8}{'RMSE':>8}{'p95':>8}{'máx':>8}")
+    for name, e in report["outputs"].items():
+        print(f"{name:<12}{e['mae']:8.3f}{e['rmse']:8.3f}{e['p95']:8.3f}{e['max']:8.3f}")
+    sc, bt = report["scalar_ms"], report["batch_us_per_sample"]
+    print(f"escalar: Mamdani {sc['mamdani']:.3f} ms, Sugeno {sc['sugeno']:.3f} ms  (x{sc['speedup']:.1f})")
+    print(f"lote:    Mamdani {bt['mamdani']:.2f} us/m, Sugeno {bt['sugeno']:.2f} us/m  (x{bt['speedup']:.1f})")
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"{args.target}_report.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print("Saved", path)
+
+
+if __name__ == "__main__":
+    main()
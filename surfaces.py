@@ -0,0 +1,176 @@
+"""
+Superficies de control de los FuzzyController de AUTOMAX
+- simulador: accion(vel, dist) para cada nivel de visibilidad.
+- simulator: freno / acelerador / claxon (vel, dist) para cada corte (vis, grip).
+- Ejes vel/dist y escala de color desde los universos del rule base (rules/<target>.json).
+- Evalúa la malla con el evaluador vectorizado (fuzzy_fast) repartida en un pool de procesos.
+- Guarda un .npz comprimido y un mapa de calor PNG por salida.
+
+Uso:
+    python surfaces.py simulador --step 0.5
+    python surfaces.py simulator --vis 25 40 50 100 --grip 40 70 90 100 --workers 4
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+from automax import FuzzyController
+from automax.config import RESULTS_DIR, rules_file
+from automax.rulebase import load_rulebase
+
+# Por simulador: entradas de corte, valores por defecto y salidas
+TARGETS = {
+    "simulador": {
+        "slices": {"visibilidad": [0, 25, 50, 75, 100]},
+        "outputs": ["accion"],
+    },
+    "simulator": {
+        # Visibilidad/adherencia que imponen los modos de clima (despejado, lluvia, niebla, polvo)
+        "slices": {"visibilidad": [25, 40, 50, 100], "adherencia": [40, 70, 90, 100]},
+        "outputs": ["freno", "acelerador", "claxon"],
+    },
+}
+FALLBACK = {"simulador": 50.0, "simulator": 0.0}
+OUT_DIR = os.path.join(RESULTS_DIR, "surfaces")
+
+_controller = None
+
+
+def universes(target):
+    # {variable: (mín, máx)} de entradas y salidas del rule base
+    compiled = load_rulebase(rules_file(target))
+    return {name: (float(univ[0]), float(univ[-1])) for name, univ, _ in compiled.inputs + compiled.outputs}
+
+
+# -------------------- Evaluación en procesos --------------------
+def _init_worker(target):
+    global _controller
+    _controller = FuzzyController(rules_file(target), FALLBACK[target])
+
+
+def _eval_chunk(args):
+    target, values = args
+    return _controller.evaluate_batch(values)
+
+
+def evaluate_grid(target, vel, dist, slices, workers=None, chunk=50000):
+    # Malla completa: cortes x vel x dist, aplanada y repartida en bloques
+    axes = [np.asarray(v, dtype=float) for v in slices.values()] + [vel, dist]
+    names = list(slices) + ["velocidad", "distancia"]
+    grids = np.meshgrid(*axes, indexing="ij")
+    shape = grids[0].shape
+    flat = {n: g.ravel() for n, g in zip(names, grids)}
+    total = grids[0].size
+
+    jobs = []
+    for a in range(0, total, chunk):
+        jobs.append((target, {n: arr[a:a + chunk] for n, arr in flat.items()}))
+
+    outputs = TARGETS[target]["outputs"]
+    result = {k: np.empty(total) for k in outputs}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(target,)) as pool:
+        pos = 0
+        for part in pool.map(_eval_chunk, jobs):
+            n = len(part[outputs[0]])
+            for k in outputs:
+                result[k][pos:pos + n] = part[k]
+            pos += n
+    return {k: v.reshape(shape) for k, v in result.items()}
+
+
+# -------------------- Mapas de calor --------------------
+_CMAP_STOPS = np.array([0.0, 0.35, 0.65, 1.0])
+_CMAP_RGB = np.array([
+    [60, 200, 80],     # 0   verde
+    [70, 170, 255],    # 35  azul neón
+    [120, 60, 220],    # 65  violeta
+    [220, 60, 60],     # 100 rojo
+], dtype=float)
+
+
+def colorize(z, lo=0.0, hi=100.0):
+    t = np.clip((z - lo) / (hi - lo), 0.0, 1.0)
+    rgb = np.stack([np.interp(t, _CMAP_STOPS, _CMAP_RGB[:, c]) for c in range(3)], axis=-1)
+    return rgb.astype(np.uint8)
+
+
+def render_heatmap(path, title, surface, slice_labels, lo=0.0, hi=100.0, panel=(240, 200)):
+    # surface: (n_cortes, n_vel, n_dist); cada panel: x = distancia, y = velocidad (arriba = rápido)
+    pygame.font.init()
+    font = pygame.font.SysFont("Arial", 14)
+    bigfont = pygame.font.SysFont("Consolas", 20, bold=True)
+    n = surface.shape[0]
+    cols = min(4, n)
+    rows = (n + cols - 1) // cols
+    pw, ph = panel
+    pad, head = 10, 40
+    img = pygame.Surface((cols * (pw + pad) + pad, head + rows * (ph + pad + 20) + pad))
+    img.fill((20, 20, 24))
+    img.blit(bigfont.render(title, True, (255, 255, 255)), (pad, 10))
+    # Leyenda lo..hi (universo de la salida)
+    bar_w = 160
+    bar = colorize(np.linspace(lo, hi, bar_w), lo, hi)[:, None, :].repeat(12, axis=1)
+    lx = img.get_width() - bar_w - pad - 30
+    lo_txt = font.render(f"{lo:g}", True, (210, 210, 210))
+    img.blit(lo_txt, (lx - 4 - lo_txt.get_width(), 12))
+    img.blit(pygame.surfarray.make_surface(np.ascontiguousarray(bar)), (lx, 14))
+    img.blit(font.render(f"{hi:g}", True, (210, 210, 210)), (lx + bar_w + 4, 12))
+    for i in range(n):
+        r, c = divmod(i, cols)
+        x = pad + c * (pw + pad)
+        y = head + r * (ph + pad + 20)
+        # surfarray espera (ancho, alto, 3): eje x = distancia, y = velocidad invertida
+        rgb = colorize(surface[i], lo, hi)[::-1].swapaxes(0, 1)
+        tile = pygame.transform.scale(pygame.surfarray.make_surface(np.ascontiguousarray(rgb)), (pw, ph))
+        img.blit(tile, (x, y + 20))
+        img.blit(font.render(slice_labels[i], True, (210, 210, 210)), (x, y + 2))
+    pygame.image.save(img, path)
+
+
+# -------------------- CLI --------------------
+def main():
+    ap = argparse.ArgumentParser(description="Exporta superficies de control de FuzzyController")
+    ap.add_argument("target", choices=sorted(TARGETS))
+    ap.add_argument("--step", type=float, default=0.5, help="paso de la malla vel/dist")
+    ap.add_argument("--vis", type=float, nargs="+", help="cortes de visibilidad")
+    ap.add_argument("--grip", type=float, nargs="+", help="cortes de adherencia (solo simulator)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", default=OUT_DIR)
+    args = ap.parse_args()
+
+    spec = TARGETS[args.target]
+    slices = dict(spec["slices"])
+    if args.vis:
+        slices["visibilidad"] = args.vis
+    if args.grip and "adherencia" in slices:
+        slices["adherencia"] = args.grip
+
+    ranges = universes(args.target)
+    vel = np.arange(ranges["velocidad"][0], ranges["velocidad"][1] + 1e-9, args.step)
+    dist = np.arange(ranges["distancia"][0], ranges["distancia"][1] + 1e-9, args.step)
+    surfaces = evaluate_grid(args.target, vel, dist, slices, workers=args.workers)
+
+    os.makedirs(args.out, exist_ok=True)
+    npz = os.path.join(args.out, f"{args.target}_surfaces.npz")
+    axes = {k: np.asarray(v, dtype=float) for k, v in slices.items()}
+    np.savez_compressed(npz, velocidad=vel, distancia=dist, **axes, **surfaces)
+    print("Saved", npz)
+
+    # Etiquetas de los paneles: un panel por combinación de cortes
+    combos = np.stack(np.meshgrid(*axes.values(), indexing="ij"), axis=-1).reshape(-1, len(axes))
+    labels = [", ".join(f"{k[:3]}={v:g}" for k, v in zip(axes, row)) for row in combos]
+    for name, surf in surfaces.items():
+        png = os.path.join(args.out, f"{args.target}_{name}.png")
+        render_heatmap(png, f"{args.target}: {name}(vel, dist)", surf.reshape(-1, len(vel), len(dist)), labels,
+                       *ranges[name])
+        print("Saved", png)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Cliente de telemetría de AUTOMAX (automax.telemetry)
+- Se suscribe por TCP (o UDP) y muestra los registros y el caudal recibido.
+- El simulador publica si config.TELEMETRY_PORT no es None.
+
+Uso:
+    python telemetry_client.py --port 8765
+    python telemetry_client.py --udp 8766 --every 20
+"""
+
+import argparse
+import asyncio
+import socket
+import time
+
+from automax.telemetry import decode_frame, subscribe
+
+
+def show(rec):
+    print(f"t={rec['time']:8.2f}s  v={rec['speed']:6.1f} km/h  d={rec['distance']:6.1f} m  "
+          f"vis={rec['visibility']:5.1f}  grip={rec['grip']:5.1f}  freno={rec['brake']:5.1f}  "
+          f"acel={rec['throttle']:5.1f}  claxon={rec['horn']:5.1f}  accion={rec['action']:5.1f}  "
+          f"clima={rec['weather']}")
+
+
+class Stats:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.frames = 0
+        self.records = 0
+        self.last_seq = None
+        self.lost = 0
+
+    def add(self, recs):
+        self.frames += 1
+        self.records += len(recs)
+        for rec in recs:
+            if self.last_seq is not None and rec["seq"] > self.last_seq + 1:
+                self.lost += rec["seq"] - self.last_seq - 1
+            self.last_seq = rec["seq"]
+
+    def report(self):
+        dt = max(time.perf_counter() - self.t0, 1e-9)
+        print(f"{self.frames} tramas, {self.records} registros ({self.records / dt:.1f}/s), "
+              f"{self.lost} registros perdidos")
+
+
+async def run_tcp(args, stats):
+    async for recs in subscribe(args.host, args.port):
+        stats.add(recs)
+        for rec in recs:
+            if rec["seq"] % args.every == 0:
+                show(rec)
+
+
+def run_udp(args, stats):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.sendto(b"SUB", (args.host, args.udp))
+    try:
+        while True:
+            recs = decode_frame(sock.recv(65536))
+            stats.add(recs)
+            for rec in recs:
+                if rec["seq"] % args.every == 0:
+                    show(rec)
+    finally:
+        sock.sendto(b"UNSUB", (args.host, args.udp))
+        sock.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cliente de telemetría de AUTOMAX")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--udp", type=int, default=None, help="puerto UDP en lugar de TCP")
+    ap.add_argument("--every", type=int, default=10, help="muestra uno de cada N registros")
+    args = ap.parse_args()
+
+    stats = Stats()
+    try:
+        if args.udp is not None:
+            run_udp(args, stats)
+        else:
+            asyncio.run(run_tcp(args, stats))
+    except KeyboardInterrupt:
+        pass
+    stats.report()
+
+
+if __name__ == "__main__":
+    main()
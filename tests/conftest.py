@@ -0,0 +1,90 @@
+import os
+import sys
+import warnings
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from automax.config import rules_file
+from automax.rulebase import _variables, load_spec, parse_antecedent
+
+TARGETS = ("simulador", "simulator")
+
+
+def skfuzzy_system(path):
+    # El mismo rule base JSON armado con scikit-fuzzy (la referencia de fuzzy_fast)
+    from skfuzzy import control as ctrl
+
+    spec = load_spec(path)
+    ants, cons = {}, {}
+    for name, univ, terms in _variables(spec["inputs"]):
+        ants[name] = ctrl.Antecedent(univ, name)
+        for lbl, mf in terms.items():
+            ants[name][lbl] = mf
+    for name, univ, terms in _variables(spec["outputs"]):
+        cons[name] = ctrl.Consequent(univ, name)
+        for lbl, mf in terms.items():
+            cons[name][lbl] = mf
+
+    def term(node):
+        if node[0] == "term":
+            return ants[node[1]][node[2]]
+        if node[0] == "not":
+            return ~term(node[1])
+        a, b = term(node[1]), term(node[2])
+        return a & b if node[0] == "and" else a | b
+
+    rules = []
+    for rule in spec["rules"]:
+        then = []
+        for out, t in rule["then"].items():
+            lbl, weight = (t, 1.0) if isinstance(t, str) else (t[0], float(t[1]))
+            then.append(cons[out][lbl] % weight)
+        rules.append(ctrl.Rule(term(parse_antecedent(rule["if"])), then))
+    return ctrl.ControlSystem(rules)
+
+
+def skfuzzy_eval(system, values):
+    # {salida: array} muestra a muestra; NaN donde skfuzzy no puede defuzzificar
+    from skfuzzy import control as ctrl
+
+    names = list(values)
+    n = len(values[names[0]])
+    outs = [c.label for c in system.consequents]
+    res = {o: np.full(n, np.nan) for o in outs}
+    for i in range(n):
+        sim = ctrl.ControlSystemSimulation(system)
+        for name in names:
+            sim.input[name] = float(values[name][i])
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)   # np.maximum de skfuzzy
+                sim.compute()
+        except (ValueError, AssertionError):
+            continue    # ninguna regla activa
+        for o in outs:
+            if o in sim.output:
+                res[o][i] = sim.output[o]
+    return res
+
+
+def random_inputs(compiled, n, seed=0, margin=5.0):
+    # Incluye valores fuera del universo (se recortan como en skfuzzy)
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(univ[0] - margin, univ[-1] + margin, n) for name, univ, _ in compiled.inputs}
+
+
+@pytest.fixture(scope="session", params=TARGETS)
+def target(request):
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def rules_path(target):
+    return rules_file(target)
@@ -0,0 +1,101 @@
+import os
+import pathlib
+
+import pygame
+import pytest
+
+from automax.bundle import MAGIC, AssetBundle, open_bundle, pcm_entry, surface_entry, write_bundle
+
+
+def _surface(size, color):
+    s = pygame.Surface(size, pygame.SRCALPHA)
+    s.fill(color)
+    s.set_at((0, 0), (1, 2, 3, 4))
+    return s
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    src = tmp_path / "car.png"
+    src.write_bytes(b"png de prueba")
+    entries = {
+        "sprite/car": surface_entry(_surface((13, 7), (200, 100, 50, 128))),
+        "obstacle/5x3": surface_entry(_surface((5, 3), (10, 20, 30, 255))),
+        "sound/horn": pcm_entry(bytes(range(256)) * 3, "44100/-16/2"),
+    }
+    path = str(tmp_path / "automax.bundle")
+    write_bundle(path, entries, {"car.png": str(src)}, {"seed": 0})
+    return path
+
+
+def test_round_trip(bundle_path):
+    b = open_bundle(bundle_path)
+    assert b is not None
+    car = b.surface("sprite/car")
+    assert car.get_size() == (13, 7)
+    assert tuple(car.get_at((0, 0))) == (1, 2, 3, 4)
+    assert tuple(car.get_at((12, 6))) == (200, 100, 50, 128)
+    assert b.surface("sprite/car", (13, 7)) is not None
+    assert b.surface("sprite/car", (14, 7)) is None
+    assert b.names("obstacle/") == ["obstacle/5x3"]
+    assert bytes(b.pcm("horn", "44100/-16/2")) == bytes(range(256)) * 3
+    assert b.pcm("horn", "22050/-16/1") is None
+    assert b.stale(os.path.dirname(bundle_path)) == []
+    del car
+    b.close()
+
+
+def test_entries_aligned(bundle_path):
+    b = AssetBundle(bundle_path)
+    for e in b.entries.values():
+        assert (b._start + e["offset"]) % 64 == 0
+    b.close()
+
+
+@pytest.mark.parametrize("keep", [0, 5, len(MAGIC) + 4, 40])
+def test_truncated_header_rejected(bundle_path, keep):
+    data = pathlib.Path(bundle_path).read_bytes()
+    with open(bundle_path, "wb") as f:
+        f.write(data[:keep])
+    assert open_bundle(bundle_path) is None
+    with pytest.raises(ValueError):
+        AssetBundle(bundle_path)
+
+
+@pytest.mark.parametrize("name", ["sprite/car", "obstacle/5x3", "sound/horn"])
+def test_truncated_inside_data_rejected(bundle_path, name):
+    data = pathlib.Path(bundle_path).read_bytes()
+    b = AssetBundle(bundle_path)
+    e = b.entries[name]
+    end = b._start + e["offset"] + e["length"]
+    b.close()
+    with open(bundle_path, "wb") as f:
+        f.write(data[:end - 1])
+    assert open_bundle(bundle_path) is None
+    with pytest.raises(ValueError, match="truncado"):
+        AssetBundle(bundle_path)
+
+
+def test_corrupted_entry_rejected(bundle_path):
+    b = AssetBundle(bundle_path)
+    pos = b._start + b.entries["sound/horn"]["offset"] + 10
+    b.close()
+    with open(bundle_path, "r+b") as f:
+        f.seek(pos)
+        f.write(b"\xff")
+    assert open_bundle(bundle_path) is None
+
+
+def test_not_a_bundle_and_missing(tmp_path):
+    p = tmp_path / "otro.bundle"
+    p.write_bytes(b"PNG...." * 20)
+    assert open_bundle(str(p)) is None
+    assert open_bundle(str(tmp_path / "no_existe.bundle")) is None
+
+
+def test_stale_source_rejected(bundle_path):
+    src = os.path.join(os.path.dirname(bundle_path), "car.png")
+    with open(src, "ab") as f:
+        f.write(b" cambiado")
+    assert AssetBundle(bundle_path).stale(os.path.dirname(bundle_path)) == ["car.png"]
+    assert open_bundle(bundle_path) is None
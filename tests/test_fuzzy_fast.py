@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from conftest import random_inputs, skfuzzy_eval, skfuzzy_system
+
+from automax.fuzzy_fast import compile_control_system
+
+TOL = 0.1   # docstring de fuzzy_fast: muy por debajo de 0.1 unidades
+
+
+@pytest.fixture(scope="module")
+def system(rules_path):
+    return skfuzzy_system(rules_path)
+
+
+def test_compiled_matches_skfuzzy(system):
+    compiled = compile_control_system(system)
+    values = random_inputs(compiled, 150)
+    out, valid = compiled.evaluate(values)
+    ref = skfuzzy_eval(system, values)
+    for name in compiled.output_names:
+        ok = valid & np.isfinite(ref[name])
+        assert ok.sum() > 100
+        assert np.max(np.abs(out[name][ok] - ref[name][ok])) < TOL
+
+
+def test_no_rules_firing_is_invalid(system):
+    # Donde skfuzzy no puede defuzzificar, el compilado marca la muestra como inválida
+    compiled = compile_control_system(system)
+    values = random_inputs(compiled, 150, seed=1)
+    _, valid = compiled.evaluate(values)
+    ref = skfuzzy_eval(system, values)
+    for name in compiled.output_names:
+        assert not np.any(valid & ~np.isfinite(ref[name]))
+
+
+def test_scalar_inputs_broadcast(system):
+    compiled = compile_control_system(system)
+    values = random_inputs(compiled, 20, seed=2)
+    first = compiled.input_names[0]
+    mixed = dict(values, **{first: values[first][3]})
+    out, _ = compiled.evaluate(mixed)
+    ref, _ = compiled.evaluate({k: np.full(20, values[first][3]) if k == first else v for k, v in values.items()})
+    for name in compiled.output_names:
+        np.testing.assert_array_equal(out[name], ref[name])
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from conftest import random_inputs, skfuzzy_eval, skfuzzy_system
+
+from automax import config, jit
+from automax.jit import HAVE_NUMBA, JitEvaluator, check_parity, classic_kinematics, classic_kinematics_np
+from automax.rulebase import load_rulebase
+
+
+@pytest.fixture(scope="module")
+def compiled(rules_path):
+    return load_rulebase(rules_path)
+
+
+def test_kernel_matches_numpy(compiled):
+    # Con Numba el kernel nativo; sin él el mismo código en Python puro
+    diff, same_valid = check_parity(compiled, n=2000 if HAVE_NUMBA else 200)
+    assert same_valid
+    assert max(diff.values()) < 1e-9
+
+
+def test_rulebase_matches_skfuzzy(compiled, rules_path):
+    # Camino del simulador (índice de reglas + kernel si está activo) contra skfuzzy
+    system = skfuzzy_system(rules_path)
+    values = random_inputs(compiled, 150, seed=3)
+    out, valid = compiled.evaluate(values)
+    ref = skfuzzy_eval(system, values)
+    for name in compiled.output_names:
+        ok = valid & np.isfinite(ref[name])
+        assert ok.sum() > 100
+        assert np.max(np.abs(out[name][ok] - ref[name][ok])) < 0.1
+
+
+def test_attached_when_enabled(compiled):
+    assert (compiled.jit is not None) == (HAVE_NUMBA and config.JIT)
+
+
+def _deep_rule(compiled, depth):
+    # La primera regla con un antecedente anidado 'depth' niveles por la derecha
+    leaf = compiled.rules[0][0]
+    while leaf[0] != "term":
+        leaf = leaf[1]
+    node = leaf
+    for _ in range(depth - 1):
+        node = ("and", leaf, node)
+    compiled.rules[0] = (node, compiled.rules[0][1])
+    return compiled
+
+
+def test_stack_depth_checked(rules_path):
+    compiled = _deep_rule(load_rulebase(rules_path), jit._MAX_STACK)
+    JitEvaluator(compiled)
+    compiled = _deep_rule(load_rulebase(rules_path), jit._MAX_STACK + 1)
+    with pytest.raises(ValueError, match="profundidad"):
+        JitEvaluator(compiled)
+
+
+@pytest.mark.skipif(not HAVE_NUMBA, reason="sin Numba attach no crea kernel")
+def test_attach_falls_back_on_deep_rule(rules_path):
+    compiled = _deep_rule(load_rulebase(rules_path), jit._MAX_STACK + 1)
+    assert jit.attach(compiled).jit is None
+    out, valid = compiled.evaluate(random_inputs(compiled, 50))   # camino NumPy
+    assert valid.shape == (50,) and all(out[name].shape == (50,) for name in compiled.output_names)
+
+
+def test_classic_kinematics_matches_numpy():
+    rng = np.random.default_rng(0)
+    n = 500
+    args = [rng.uniform(0, 100, n), rng.uniform(0, 120, n), rng.uniform(0, 120, n),
+            rng.uniform(0, 100, n), rng.uniform(30, 90, n)]
+    a = [x.copy() for x in args] + [np.zeros(n, dtype=bool)]
+    b = [x.copy() for x in args] + [np.zeros(n, dtype=bool)]
+    for _ in range(50):
+        classic_kinematics(*a[:5], 0.1, 0.18, 5.0, 90.0, a[5])
+        classic_kinematics_np(*b[:5], 0.1, 0.18, 5.0, 90.0, b[5])
+    for i in (2, 3):
+        np.testing.assert_allclose(a[i], b[i], atol=1e-9)
+    np.testing.assert_array_equal(a[5], b[5])
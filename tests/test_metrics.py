@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from automax.metrics import P2Quantile, RunningStats, StreamSummary
+
+
+def _feed(obj, xs):
+    for x in xs:
+        obj.add(float(x))
+    return obj
+
+
+def test_running_stats_matches_numpy():
+    xs = np.random.default_rng(0).normal(50.0, 12.0, 5000)
+    st = _feed(RunningStats(), xs)
+    assert st.n == len(xs)
+    assert st.mean == pytest.approx(xs.mean(), rel=1e-12)
+    assert st.std == pytest.approx(xs.std(ddof=1), rel=1e-9)
+    assert (st.min, st.max) == (xs.min(), xs.max())
+
+
+def test_running_stats_stable_with_large_offset():
+    # Welford no pierde la varianza con una media enorme (la suma de cuadrados sí)
+    xs = 1e9 + np.random.default_rng(1).uniform(0.0, 1.0, 10000)
+    st = _feed(RunningStats(), xs)
+    assert st.std == pytest.approx(np.std(xs - 1e9, ddof=1), rel=1e-6)
+
+
+def test_running_stats_empty_and_single():
+    assert RunningStats().to_dict() == {"n": 0}
+    st = _feed(RunningStats(), [3.0])
+    assert st.std == 0.0 and st.to_dict()["mean"] == 3.0
+
+
+@pytest.mark.parametrize("dist", ["normal", "uniform", "exponential"])
+@pytest.mark.parametrize("p", [0.05, 0.5, 0.95])
+def test_p2_quantile_close_to_exact(dist, p):
+    rng = np.random.default_rng(2)
+    xs = getattr(rng, dist)(size=20000)
+    est = _feed(P2Quantile(p), xs).value()
+    # Error relativo al rango intercuartílico (P² no es exacto)
+    iqr = np.quantile(xs, 0.75) - np.quantile(xs, 0.25)
+    assert abs(est - np.quantile(xs, p)) < 0.05 * iqr
+
+
+def test_p2_quantile_few_samples():
+    q = P2Quantile(0.5)
+    assert q.value() is None
+    _feed(q, [5.0, 1.0, 3.0])
+    assert q.value() == 3.0
+    assert _feed(P2Quantile(0.95), [1.0, 2.0, 3.0, 4.0]).value() == 4.0
+
+
+def test_p2_quantile_constant_series():
+    assert _feed(P2Quantile(0.95), [7.0] * 1000).value() == 7.0
+
+
+def test_stream_summary_keys():
+    xs = np.arange(1000, dtype=float)
+    d = _feed(StreamSummary(), xs).to_dict()
+    assert set(d) == {"n", "mean", "std", "min", "max", "p5", "p50", "p95"}
+    assert d["p5"] < d["p50"] < d["p95"]
+    assert d["p50"] == pytest.approx(499.5, abs=10.0)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from automax import FuzzyController
+from automax.config import rules_file
+from automax.verify import IntervalModel, parse_condition, verify
+
+FALLBACKS = {"simulador": 50.0, "simulator": 0.0}   # los de verify_safety.py
+
+
+@pytest.fixture(scope="module")
+def controller(target):
+    return FuzzyController(rules_file(target), FALLBACKS[target])
+
+
+def _sample(rng, lo, hi, n):
+    return lo + rng.uniform(0.0, 1.0, (n, len(lo))) * (hi - lo)
+
+
+def test_bounds_contain_every_sample(controller):
+    # Soundness de la aritmética de intervalos: ninguna salida real cae fuera de su cota
+    model = IntervalModel(controller.fast, controller.fallback)
+    rng = np.random.default_rng(0)
+    u_lo = np.array([univ[0] for _, univ, _ in controller.fast.inputs])
+    u_hi = np.array([univ[-1] for _, univ, _ in controller.fast.inputs])
+    a = _sample(rng, u_lo, u_hi, 200)
+    b = _sample(rng, u_lo, u_hi, 200)
+    # Cajas de todos los tamaños: desde casi puntos hasta el universo completo
+    scale = rng.choice([1e-3, 0.02, 0.2, 1.0], size=(200, 1))
+    lo = np.minimum(a, a + (b - a) * scale)
+    hi = np.maximum(a, a + (b - a) * scale)
+    bounds = model.bounds(lo, hi)
+    for k in range(len(lo)):
+        X = _sample(rng, lo[k], hi[k], 30)
+        out = controller.evaluate_batch(dict(zip(controller.input_names, X.T)))
+        for name, (b_lo, b_hi) in bounds.items():
+            assert np.all(out[name] >= b_lo[k] - 1e-6) and np.all(out[name] <= b_hi[k] + 1e-6)
+
+
+@pytest.mark.parametrize("claim, premises", [
+    ("acelerador < 20", ["distancia < 10"]),
+    ("freno > 40", ["distancia < 10"]),
+])
+def test_proven_property_holds_on_samples(claim, premises):
+    ctrl = FuzzyController(rules_file("simulator"), FALLBACKS["simulator"])
+    res = verify(ctrl, claim, premises)
+    assert res.status == "demostrada" and not res.counterexamples
+
+    out_name, op, thr = parse_condition(claim)
+    rng = np.random.default_rng(1)
+    values = {name: rng.uniform(univ[0], univ[-1], 20000) for name, univ, _ in ctrl.fast.inputs}
+    for text in premises:
+        name, _, value = parse_condition(text)
+        values[name] = rng.uniform(ctrl.fast.inputs[ctrl.input_names.index(name)][1][0], value, 20000)
+    out = ctrl.evaluate_batch(values)[out_name]
+    assert np.all(out < thr) if op == "<" else np.all(out > thr)
+
+
+def test_false_property_refuted_with_real_counterexamples():
+    ctrl = FuzzyController(rules_file("simulator"), FALLBACKS["simulator"])
+    res = verify(ctrl, "acelerador < 20")
+    assert res.status == "refutada" and res.counterexamples
+    for inputs, value in res.counterexamples:
+        assert value >= 20
+        assert ctrl.evaluate(inputs)["acelerador"] == pytest.approx(value)
+
+
+def test_empty_premise_is_vacuously_proven():
+    ctrl = FuzzyController(rules_file("simulator"), FALLBACKS["simulator"])
+    res = verify(ctrl, "acelerador < 0", ["distancia < 10", "distancia > 20"])
+    assert res.status == "demostrada" and res.boxes == 0
+
+
+def test_bad_condition_rejected():
+    with pytest.raises(ValueError):
+        parse_condition("distancia ~ 10")
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from automax.worker import PhysicsWorker, SnapshotBuffer
+
+
+def test_snapshot_buffer_publish():
+    buf = SnapshotBuffer(initial="inicio")
+    assert buf.latest() == "inicio" and buf.seq == 0
+    buf.publish("a")
+    buf.publish("b")
+    assert buf.latest() == "b" and buf.seq == 2
+
+
+def test_snapshot_buffer_handoff_between_threads():
+    # El lector nunca ve un snapshot a medias ni uno más viejo que el anterior
+    buf = SnapshotBuffer(initial=(0, 0))
+    n = 50000
+    done = threading.Event()
+
+    def producer():
+        for i in range(1, n + 1):
+            buf.publish((i, -i))
+        done.set()
+
+    seen = []
+    t = threading.Thread(target=producer)
+    t.start()
+    while not done.is_set():
+        seen.append(buf.latest())
+    t.join()
+    seen.append(buf.latest())
+    assert all(a == -b for a, b in seen)
+    assert all(x[0] <= y[0] for x, y in zip(seen, seen[1:]))
+    assert seen[-1] == (n, -n) and buf.seq == n
+
+
+def _worker(step, **kw):
+    buf = SnapshotBuffer()
+    state = {"steps": 0}
+    worker = PhysicsWorker(step(state), lambda: state["steps"], buf, threading.Lock(), fps=1000, **kw)
+    return worker, buf, state
+
+
+def test_worker_publishes_snapshots():
+    def step(state):
+        def run(dt):
+            state["steps"] += 1
+        return run
+
+    worker, buf, _ = _worker(step)
+    worker.start()
+    time.sleep(0.1)
+    worker.stop()
+    assert not worker.is_alive()
+    assert buf.seq > 0 and buf.latest() == buf.seq
+
+
+def test_worker_survives_transient_failures():
+    def step(state):
+        def run(dt):
+            state["steps"] += 1
+            if 5 <= state["steps"] < 10:
+                raise RuntimeError("fallo de prueba")
+        return run
+
+    worker, buf, state = _worker(step, max_failures=50)
+    worker.start()
+    time.sleep(0.1)
+    alive = worker.is_alive()
+    worker.stop()
+    assert alive and state["steps"] > 10
+    assert worker.failures == 0 and isinstance(worker.error, RuntimeError)
+    assert buf.latest() >= 10
+
+
+def test_worker_stops_and_reports_persistent_failure():
+    def step(state):
+        def run(dt):
+            raise RuntimeError("siempre")
+        return run
+
+    fatal = []
+    worker, buf, _ = _worker(step, max_failures=5, on_fatal=fatal.append)
+    worker.start()
+    worker.join(timeout=2.0)
+    assert not worker.is_alive()
+    assert worker.failures == 5 and len(fatal) == 1 and str(fatal[0]) == "siempre"
+    assert buf.seq == 0
@@ -0,0 +1,221 @@
+"""
+Auto-tuning de las membresías del FuzzyController clásico de AUTOMAX (algoritmo genético)
+- Genes: vértices trimf/trapmf de rules/simulador.json (entradas y salida); los vértices
+  pegados al borde del universo (hombros) quedan fijos para no abrir huecos.
+- Costo: colisiones (rebases forzados), frenadas fuertes y desvío respecto al slider
+  sobre la malla de escenarios de automax.scenarios (una inferencia batched por paso).
+- Cada generación se evalúa en un pool de procesos; checkpoint JSON tras cada una.
+  El checkpoint guarda ruta y hash de las reglas, número de genes y escenarios: --resume
+  se niega a continuar si no coinciden (otra población no tendría sentido sobre ellas).
+
+Uso:
+    python tune.py --generations 30 --population 24 --workers 4
+    python tune.py --resume            # continúa desde el último checkpoint
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from automax.config import RESULTS_DIR, rules_file
+from automax.rulebase import compile_spec, load_spec
+from automax.scenarios import cost, rollout, scenario_grid
+
+OUT_DIR = os.path.join(RESULTS_DIR, "tuning")
+
+_spec = None
+_genes = None
+_scen = None
+_sim_args = None
+
+
+# -------------------- Genes <-> rule base --------------------
+def find_genes(spec):
+    # [(sección, variable, término, índice, lo, hi)] de los vértices libres
+    genes = []
+    for section in ("inputs", "outputs"):
+        for var, vspec in spec[section].items():
+            lo, hi, _ = vspec["universe"]
+            for lbl, term in vspec["terms"].items():
+                (kind, params), = term.items()
+                if kind not in ("trimf", "trapmf"):
+                    continue
+                for k, p in enumerate(params):
+                    if p not in (lo, hi):
+                        genes.append((section, var, lbl, k, lo, hi))
+    return genes
+
+
+def encode(spec, genes):
+    out = []
+    for section, var, lbl, k, _, _ in genes:
+        (params,) = spec[section][var]["terms"][lbl].values()
+        out.append(float(params[k]))
+    return np.array(out)
+
+
+def decode(spec, genes, x):
+    spec = copy.deepcopy(spec)
+    for (section, var, lbl, k, lo, hi), v in zip(genes, x):
+        (params,) = spec[section][var]["terms"][lbl].values()
+        params[k] = round(float(np.clip(v, lo, hi)), 2)
+    # Cada término debe quedar ordenado (a <= b <= c)
+    for section in ("inputs", "outputs"):
+        for vspec in spec[section].values():
+            for term in vspec["terms"].values():
+                (kind, params), = term.items()
+                if kind in ("trimf", "trapmf"):
+                    params.sort()
+    return spec
+
+
+# -------------------- Evaluación en procesos --------------------
+def _init_worker(spec, genes, sim_args):
+    global _spec, _genes, _scen, _sim_args
+    _spec, _genes, _sim_args = spec, genes, sim_args
+    _scen = scenario_grid()
+
+
+def _fitness(x):
+    try:
+        fuzzy = compile_spec(decode(_spec, _genes, x))
+    except Exception:
+        return float("inf")
+    return cost(rollout(fuzzy, _scen, **_sim_args))
+
+
+# -------------------- Algoritmo genético --------------------
+def next_generation(rng, pop, fit, bounds, elite=2, tournament=3, alpha=0.3, mut_rate=0.2, sigma=0.05):
+    lo, hi = bounds
+    order = np.argsort(fit)
+    children = [pop[i].copy() for i in order[:elite]]
+
+    def pick():
+        idx = rng.choice(len(pop), size=tournament, replace=False)
+        return pop[idx[np.argmin(fit[idx])]]
+
+    while len(children) < len(pop):
+        a, b = pick(), pick()
+        # BLX-alpha
+        lo_ab = np.minimum(a, b); hi_ab = np.maximum(a, b)
+        span = hi_ab - lo_ab
+        child = rng.uniform(lo_ab - alpha * span, hi_ab + alpha * span)
+        mask = rng.random(child.size) < mut_rate
+        child[mask] += rng.normal(0.0, sigma * (hi - lo))[mask]
+        children.append(np.clip(child, lo, hi))
+    return np.array(children)
+
+
+def save_checkpoint(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)   # atómico: un corte a mitad no deja un checkpoint roto
+
+
+def run_key(rules_path, genes, sim_args):
+    # Lo que debe coincidir para reanudar: mismas reglas, mismos genes, mismos escenarios
+    with open(rules_path, "rb") as f:
+        rules_hash = hashlib.sha256(f.read()).hexdigest()
+    return {"rules": os.path.abspath(rules_path), "rules_hash": rules_hash,
+            "genes": len(genes), "sim_args": sim_args}
+
+
+def check_resume(state, key):
+    stored = state.get("run")
+    if stored is None:
+        return "checkpoint sin datos del rule base (versión anterior)"
+    for k, what in (("rules", "la ruta de las reglas"), ("rules_hash", "el contenido de las reglas"),
+                    ("genes", "el número de genes"), ("sim_args", "la duración/dt de los escenarios")):
+        if stored.get(k) != key[k]:
+            return f"no coincide {what}: checkpoint {stored.get(k)!r}, ahora {key[k]!r}"
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Ajusta las membresías del controlador clásico con un AG")
+    ap.add_argument("--rules", default=rules_file("simulador"))
+    ap.add_argument("--generations", type=int, default=30)
+    ap.add_argument("--population", type=int, default=24)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--duration", type=float, default=30.0, help="segundos simulados por escenario")
+    ap.add_argument("--dt", type=float, default=0.1)
+    ap.add_argument("--out", default=OUT_DIR)
+    ap.add_argument("--resume", action="store_true")
+    args = ap.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    ckpt = os.path.join(args.out, "checkpoint.json")
+    base = load_spec(args.rules)
+    genes = find_genes(base)
+    bounds = (np.array([g[4] for g in genes], dtype=float), np.array([g[5] for g in genes], dtype=float))
+    sim_args = {"duration": args.duration, "dt": args.dt}
+    key = run_key(args.rules, genes, sim_args)
+
+    if args.resume and os.path.exists(ckpt):
+        with open(ckpt, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        mismatch = check_resume(state, key)
+        if mismatch:
+            raise SystemExit(f"No se puede reanudar {ckpt}: {mismatch}. Usa otro --out o quita --resume.")
+        rng = np.random.default_rng()
+        rng.bit_generator.state = state["rng"]
+        pop = np.array(state["population"])
+        gen0 = state["generation"]
+        history = state["history"]
+        best_x, best_cost = np.array(state["best"]), state["best_cost"]
+        print(f"Reanudando en la generación {gen0} (mejor costo {best_cost:.4f})")
+    else:
+        rng = np.random.default_rng(args.seed)
+        x0 = encode(base, genes)
+        # Población inicial: el rule base actual + perturbaciones alrededor
+        pop = [x0] + [np.clip(x0 + rng.normal(0.0, 0.1 * (bounds[1] - bounds[0])), *bounds)
+                      for _ in range(args.population - 1)]
+        pop = np.array(pop)
+        gen0, history = 0, []
+        best_x, best_cost = x0, float("inf")
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(base, genes, sim_args)) as pool:
+        baseline = next(iter(pool.map(_fitness, [encode(base, genes)])))
+        print(f"Costo del rule base actual: {baseline:.4f} ({len(genes)} genes)")
+        for gen in range(gen0, args.generations):
+            t0 = time.perf_counter()
+            fit = np.array(list(pool.map(_fitness, pop)))
+            i = int(np.argmin(fit))
+            if fit[i] < best_cost:
+                best_x, best_cost = pop[i].copy(), float(fit[i])
+            history.append({"generation": gen, "best": float(fit[i]), "mean": float(np.mean(fit[np.isfinite(fit)]))})
+            print(f"gen {gen:3d}  mejor {fit[i]:.4f}  media {history[-1]['mean']:.4f}  "
+                  f"global {best_cost:.4f}  ({time.perf_counter() - t0:.1f}s)")
+
+            pop = next_generation(rng, pop, fit, bounds)
+            save_checkpoint(ckpt, {
+                "run": key,
+                "generation": gen + 1,
+                "population": pop.tolist(),
+                "best": best_x.tolist(),
+                "best_cost": best_cost,
+                "baseline_cost": baseline,
+                "history": history,
+                "rng": rng.bit_generator.state,
+            })
+
+    tuned = os.path.join(args.out, os.path.basename(args.rules).replace(".json", "_tuned.json"))
+    with open(tuned, "w", encoding="utf-8") as f:
+        json.dump(decode(base, genes, best_x), f, indent=2, ensure_ascii=False)
+    print(f"Costo {baseline:.4f} -> {best_cost:.4f}. Saved {tuned}")
+    print(f"Para probarlo en vivo: copia {tuned} sobre {args.rules} (se recarga en caliente).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Verificación de propiedades de seguridad de los FuzzyController de AUTOMAX (automax.verify)
+- Demuestra o refuta "salida OP umbral" sobre toda la caja de entradas que cumple las
+  premisas (ramificación y poda con aritmética de intervalos) y da contraejemplos.
+- Sin propiedad en la línea de comandos se verifican las de PROPERTIES.
+- Código de salida 0 si todas quedan demostradas.
+
+Uso:
+    python verify_safety.py
+    python verify_safety.py simulator "acelerador < 20" --when "distancia < 10"
+    python verify_safety.py simulador "accion < 35" --when "distancia < 15" "velocidad > 60"
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from automax import FuzzyController
+from automax.config import RESULTS_DIR, rules_file
+from automax.verify import verify
+
+FALLBACKS = {"simulador": 50.0, "simulator": 0.0}
+
+# (rule base, propiedad, premisas)
+PROPERTIES = [
+    ("simulator", "acelerador < 20", ["distancia < 10"]),
+    ("simulator", "freno > 40", ["distancia < 10"]),
+    ("simulador", "accion < 35", ["distancia < 15", "velocidad > 60"]),
+]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Verificación exhaustiva por intervalos")
+    ap.add_argument("target", nargs="?", choices=["simulador", "simulator"])
+    ap.add_argument("claim", nargs="?", help='p. ej. "acelerador < 20"')
+    ap.add_argument("--when", nargs="*", default=[], help='premisas, p. ej. "distancia < 10"')
+    ap.add_argument("--rules", default=None, help="archivo de reglas (por defecto rules/<target>.json)")
+    ap.add_argument("--min-width", type=float, default=1e-3, help="ancho mínimo relativo de caja")
+    ap.add_argument("--max-boxes", type=int, default=200000)
+    args = ap.parse_args()
+
+    if args.claim:
+        props = [(args.target, args.claim, args.when)]
+    elif args.target is None:
+        props = PROPERTIES
+    else:
+        ap.error("falta la propiedad")
+
+    report = []
+    ok = True
+    for target, claim, premises in props:
+        ctrl = FuzzyController(args.rules or rules_file(target), FALLBACKS[target])
+        res = verify(ctrl, claim, premises, min_width=args.min_width, max_boxes=args.max_boxes)
+        when = " y ".join(premises) if premises else "siempre"
+        print(f"[{target}] {claim} cuando {when}: {res.status.upper()} "
+              f"({res.boxes} cajas, {res.elapsed:.2f} s)")
+        for x, y in res.counterexamples:
+            print("    contraejemplo:", ", ".join(f"{k}={v:.3f}" for k, v in x.items()), f"-> {y:.3f}")
+        if res.undecided:
+            print(f"    {len(res.undecided)} cajas sin decidir (ver JSON)")
+        ok &= res.status == "demostrada"
+        report.append(dict(res.to_dict(), target=target, claim=claim, premises=premises))
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    fname = os.path.join(RESULTS_DIR, f"verify_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(fname, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {fname}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Ramas "¿y si...?" desde una instantánea de AUTOMAX (automax.branch)
+- La instantánea se guarda con la tecla B en el simulador (results/state_*.pkl.gz)
+  o se graba aquí sin ventana con --record SEGUNDOS (modo demo).
+- Cada variante corre en su propio proceso desde el mismo instante y se comparan los KPIs.
+- --check: la rama "base" debe reproducir exactamente la continuación del original.
+
+Uso:
+    python whatif.py results/state_20250101_120000.pkl.gz --variants base lluvia sugeno
+    python whatif.py --record 20 --script simulator --variants base lluvia niebla polvo
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from automax import config
+from automax.branch import SimState, capture, fork, restore
+from automax.config import RESULTS_DIR
+from automax.datalog import make_log
+
+SCRIPTS = {"ClassicPhysics": "simulador", "ArcadePhysics": "simulator"}
+PRESETS = {
+    "RainToggleWeather": {"lluvia": {"rain_enabled": True}, "seco": {"rain_enabled": False}},
+    "WeatherCycle": {"despejado": {"weather_mode": 0}, "lluvia": {"weather_mode": 1},
+                     "niebla": {"weather_mode": 2}, "polvo": {"weather_mode": 3}},
+}
+COMMON = {"base": {}, "mamdani": {"controller": "mamdani"}, "sugeno": {"controller": "sugeno"}}
+
+
+def variants_for(state, names):
+    presets = dict(COMMON, **PRESETS.get(state.weather, {}))
+    out = []
+    for name in names:
+        if name not in presets:
+            raise SystemExit(f"Variante desconocida '{name}' para {state.weather}: {sorted(presets)}")
+        out.append(dict(presets[name], name=name))
+    return out
+
+
+def record(make_sim, seconds, dt):
+    sim = make_sim()
+    sim.demo_mode = True
+    for _ in range(int(round(seconds / dt))):
+        sim.step(dt)
+    return sim, capture(sim)
+
+
+def check(sim, state, make_sim, duration, dt):
+    # Continuación del original frente a la rama base en un simulador nuevo
+    steps = int(round(duration / dt))
+    branch = make_sim()
+    random.setstate(state.rng)
+    sim.log = make_log(config.LOG_MODE, max_gap=config.LOG_MAX_GAP)
+    for _ in range(steps):
+        sim.step(dt)
+    restore(branch, state)
+    for _ in range(steps):
+        branch.step(dt)
+    same = sim.log == branch.log
+    print(f"Paridad rama base vs continuación ({steps} pasos): {'OK' if same else 'DIFERENTE'}")
+    return same
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Ramas what-if desde una instantánea")
+    ap.add_argument("state", nargs="?", help="instantánea .pkl.gz (tecla B)")
+    ap.add_argument("--record", type=float, default=None, metavar="S", help="grabar S segundos en modo demo")
+    ap.add_argument("--script", choices=["simulador", "simulator", "test"], default=None)
+    ap.add_argument("--variants", nargs="+", default=["base", "lluvia"])
+    ap.add_argument("--duration", type=float, default=30.0)
+    ap.add_argument("--dt", type=float, default=1.0 / 60)
+    ap.add_argument("--processes", type=int, default=None)
+    ap.add_argument("--check", action="store_true")
+    args = ap.parse_args()
+
+    if args.state is None and args.record is None:
+        ap.error("indica una instantánea o --record")
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    sim = None
+    if args.state is not None:
+        state = SimState.load(args.state)
+        script = args.script or SCRIPTS[state.physics]
+        make_sim = importlib.import_module(script).make_sim
+    else:
+        script = args.script or "simulador"
+        make_sim = importlib.import_module(script).make_sim
+        sim, state = record(make_sim, args.record, args.dt)
+        print(f"Instantánea en t={state.scalars['time']:.1f} s: {state.save()}")
+
+    variants = variants_for(state, args.variants)
+    t0 = time.perf_counter()
+    results = fork(make_sim, state, variants, args.duration, args.dt, args.processes)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{len(results)} ramas x {args.duration:.0f} s simulados en {elapsed:.1f} s ({script})")
+    for r in results:
+        k = r["kpi"]
+        print(f"  {r['name']:10s} headway mín={k['min_headway_m'] or 0:6.1f} m  "
+              f"TTC p5={k['ttc_s'].get('p5') or float('nan'):6.2f} s  frenadas fuertes={k['hard_brakes']:3d}  "
+              f"claxon={k['horn_duty_cycle'] * 100:5.1f}%  rebases={k['rebases']:3d}  "
+              f"v final={r['final']['display_speed']:5.1f} km/h")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    fname = os.path.join(RESULTS_DIR, f"whatif_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(fname, "w", encoding="utf-8") as f:
+        json.dump([{k: v for k, v in r.items() if k != "log"} for r in results], f, indent=2)
+    print(f"Resultados -> {fname}")
+
+    if args.check:
+        if sim is None:
+            sim = restore(make_sim(), state)
+        check(sim, state, make_sim, args.duration, args.dt)
+
+
+if __name__ == "__main__":
+    main()